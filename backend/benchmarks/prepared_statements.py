@@ -0,0 +1,106 @@
+"""
+Benchmark: latency of the public routes' named queries sent as plain SQL
+versus executed as server-side prepared statements (queries.py).
+
+Each query runs --repeat times on one connection, the way a pooled worker
+connection sees it: first as literal SQL (parsed, analyzed and planned on
+every call), then with PREPARE once + EXECUTE. Reported per statement:
+median round-trip time for each mode, and how many of the prepared runs
+Postgres served from its cached generic plan (pg_prepared_statements).
+
+Runs against the configured database — seed it first
+(python benchmarks/synthetic_data.py) so the plans have real work to do.
+
+Run from backend/ (uses the DB_* settings from config.py):
+    python benchmarks/prepared_statements.py [--repeat 500]
+
+Sample results (local Postgres 16 over a Unix socket, default synthetic
+data; µs per statement, median):
+
+    query                       plain  prepared          generic plans
+    posts_first_page            159.6     162.6  1.0x    0/500
+    posts_next_page             163.2     177.9  0.9x    0/500
+    posts_search              15762.3   13421.3  1.2x    495/500
+    post_by_slug                 73.0      35.4  2.1x    495/500
+    projects_all               3817.2    3977.5  1.0x    500/500
+    projects_featured           369.3     291.0  1.3x    500/500
+    project_by_id               535.0     100.7  5.3x    495/500
+    tags_with_counts           1439.5    1243.1  1.2x    500/500
+    interests_all               106.9      84.3  1.3x    500/500
+    bootstrap_projects        22689.1   23908.8  0.9x    495/500
+
+What is saved is the parse/analyze/plan work, so point lookups gain the
+most and statements dominated by execution (projects_all, bootstrap_projects)
+stay within noise. The two paging queries keep custom plans: Postgres costs
+a generic LIMIT $n as 10% of the table, so it re-plans them on every call
+and only parsing is skipped.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import queries
+from db import get_connection
+from routes import bootstrap, contact, interests, posts, projects  # noqa: F401 (register the queries)
+
+# Representative parameters per query; statements that write are skipped
+_PARAMS = {
+    "posts_first_page": (21,),
+    "posts_next_page": (datetime(2100, 1, 1), 2**31 - 1, 21),
+    "posts_search": ("postgres cache", 11, 0),
+    "post_by_slug": ("synthetic-500",),
+    "projects_all": (),
+    "projects_featured": (),
+    "project_by_id": (1,),
+    "tags_with_counts": (),
+    "interests_all": (),
+    "bootstrap_projects": (False,),
+}
+
+
+def _time(cur, query, params, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        queries.execute(cur, query, params)
+        cur.fetchall()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    conn = get_connection()
+    conn.autocommit = True
+    try:
+        cur = conn.cursor()
+        print(f"{'query':<24} {'plain':>8}  {'prepared':>8}          generic plans")
+        for name, params in _PARAMS.items():
+            query = queries.REGISTRY[name]
+
+            conn.prepared = None
+            plain = _time(cur, query, params, args.repeat)
+
+            conn.prepared = set()
+            prepared = _time(cur, query, params, args.repeat)
+            cur.execute("SELECT generic_plans FROM pg_prepared_statements WHERE name = %s", (name,))
+            generic = cur.fetchone()[0]
+            cur.execute(f"DEALLOCATE {name}")
+
+            print(f"{name:<24} {plain:8.1f}  {prepared:8.1f} {plain / prepared:4.1f}x    "
+                  f"{generic}/{args.repeat}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Synthetic data for benchmarks: scale the seeded database up to a realistic
+production size.
+
+Run after schema.sql (and usually seed.sql). Every row is generated inside
+Postgres with generate_series in a handful of set-based statements, so even
+the full default set takes seconds. random() is seeded, so the same
+arguments always produce the same data.
+
+Generated rows are recognisable by their prefix (tags "synthetic-*",
+projects/posts/interests titled "Synthetic ...", messages from
+@synthetic.example.com) and --clear removes exactly those.
+
+Run from backend/ (uses the DB_* settings from config.py):
+    python benchmarks/synthetic_data.py [--posts 10000] [--projects 1000]
+        [--messages 100000] [--tags 50] [--interests 20] [--clear]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import get_connection
+
+# Vocabulary for titles and bodies, so full-text search has real words to match
+_WORDS = (
+    "python flask postgres query index cache latency throughput request worker "
+    "pool connection deploy docker react component state render bundle aws s3 "
+    "lambda queue retry timeout network socket json schema migration backup "
+    "search vector token session cookie header proxy nginx gunicorn thread "
+    "process memory profile benchmark trace metric dashboard alert release"
+).split()
+
+
+def _clear(cur):
+    # project_tags rows go with their projects/tags (ON DELETE CASCADE)
+    cur.execute("DELETE FROM contact_messages WHERE email LIKE '%@synthetic.example.com'")
+    cur.execute("DELETE FROM posts WHERE slug LIKE 'synthetic-%'")
+    cur.execute("DELETE FROM projects WHERE title LIKE 'Synthetic %'")
+    cur.execute("DELETE FROM interests WHERE title LIKE 'Synthetic %'")
+    cur.execute("DELETE FROM tags WHERE name LIKE 'synthetic-%'")
+
+
+def _generate(cur, args):
+    cur.execute("SELECT setseed(0.42)")
+
+    cur.execute("""
+        INSERT INTO tags (name)
+        SELECT 'synthetic-' || n FROM generate_series(1, %s) AS n
+        ON CONFLICT (name) DO NOTHING
+    """, (args.tags,))
+
+    # A run of random words per row: `{low}` + up to `{spread}` more.
+    # Referencing `n` inside the subquery keeps Postgres from computing it
+    # once for all rows.
+    words = """
+        array_to_string(ARRAY(
+            SELECT (%(words)s::text[])[1 + floor(random() * cardinality(%(words)s::text[]))::int]
+            FROM generate_series(1, {low} + (n * 7 + {salt}) %% {spread})
+        ), ' ')
+    """
+
+    def sentence(salt):
+        return words.format(low=8, spread=33, salt=salt)
+
+    params = {"words": list(_WORDS)}
+
+    cur.execute(f"""
+        INSERT INTO projects (title, description, tech_stack, live_url, github_url, featured, sort_order, created_at)
+        SELECT
+            'Synthetic project ' || n,
+            {sentence(1)},
+            'Python, Flask, PostgreSQL',
+            CASE WHEN n %% 3 = 0 THEN 'https://example.com/demo/' || n END,
+            'https://github.com/example/synthetic-' || n,
+            n %% 20 = 0,
+            1000 + n,
+            CURRENT_TIMESTAMP - n * INTERVAL '1 hour'
+        FROM generate_series(1, %(count)s) AS n
+    """, {**params, "count": args.projects})
+
+    # Three random tags per synthetic project
+    cur.execute("""
+        INSERT INTO project_tags (project_id, tag_id)
+        SELECT DISTINCT p.id, t.id
+        FROM projects p
+        CROSS JOIN LATERAL (
+            SELECT id FROM tags
+            WHERE name LIKE 'synthetic-%' AND p.id > 0
+            ORDER BY random()
+            LIMIT 3
+        ) t
+        WHERE p.title LIKE 'Synthetic %'
+        ON CONFLICT DO NOTHING
+    """)
+
+    cur.execute(f"""
+        INSERT INTO posts (title, content, slug, published, created_at, updated_at)
+        SELECT
+            'Synthetic post ' || n || ': ' || {words.format(low=3, spread=6, salt=2)},
+            {sentence(3)} || E'\\n\\n' || {sentence(4)} || E'\\n\\n' || {sentence(5)},
+            'synthetic-' || n,
+            n %% 10 <> 0,
+            CURRENT_TIMESTAMP - n * INTERVAL '10 minutes',
+            CURRENT_TIMESTAMP - n * INTERVAL '5 minutes'
+        FROM generate_series(1, %(count)s) AS n
+    """, {**params, "count": args.posts})
+
+    cur.execute(f"""
+        INSERT INTO contact_messages (name, email, message, created_at)
+        SELECT
+            'Visitor ' || n,
+            'visitor' || n || '@synthetic.example.com',
+            {sentence(6)},
+            CURRENT_TIMESTAMP - n * INTERVAL '1 minute'
+        FROM generate_series(1, %(count)s) AS n
+    """, {**params, "count": args.messages})
+
+    cur.execute("""
+        INSERT INTO interests (title, tag, blurb, description, sort_order)
+        SELECT 'Synthetic interest ' || n, 'tag ' || n, 'A synthetic interest', 'Generated for benchmarks', 1000 + n
+        FROM generate_series(1, %s) AS n
+    """, (args.interests,))
+
+    cur.execute("ANALYZE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--tags", type=int, default=50)
+    parser.add_argument("--interests", type=int, default=20)
+    parser.add_argument("--clear", action="store_true", help="only remove synthetic rows")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    start = time.perf_counter()
+    try:
+        with conn.cursor() as cur:
+            _clear(cur)
+            if not args.clear:
+                _generate(cur, args)
+        conn.commit()
+    finally:
+        conn.close()
+
+    print(f"{'Cleared' if args.clear else 'Generated'} synthetic data in {time.perf_counter() - start:.1f}s")
+    if not args.clear:
+        print(f"  {args.projects} projects, {args.posts} posts, {args.messages} messages, "
+              f"{args.tags} tags, {args.interests} interests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark: CPU time and memory of building list responses from dict rows
+(RealDictCursor + jsonify) versus tuple rows (get_db(tuples=True) + the
+compiled serializer in json_provider.rows_response).
+
+Runs the exact queries of the hot list endpoints against the configured
+database — seed it first (python benchmarks/synthetic_data.py) so the lists
+have realistic sizes. Each case measures fetch + serialization, i.e.
+everything a request does after Postgres has produced the rows:
+
+    CPU     process time per response (best of --repeat runs)
+    memory  peak Python allocations while building one response (tracemalloc)
+
+Run from backend/ (uses the DB_* settings from config.py):
+    python benchmarks/tuple_rows.py [--repeat 200]
+
+Sample results (Python 3.11, orjson provider, local Postgres, default
+synthetic data; best-of CPU in µs, peak memory in KiB; CPU figures
+vary between runs):
+
+    endpoint                         rows    dict CPU  tuple CPU        dict mem  tuple mem
+    /api/projects                    1005     12155.3     7908.9  1.5x     2751.4     1491.3  1.8x
+    /api/posts?limit=100              101      1851.9     1153.7  1.6x      182.7       73.6  2.5x
+    /api/posts/search?q=postgres       51      1536.3     1211.1  1.3x      156.7       79.7  2.0x
+    /api/tags                          60       307.8      182.0  1.7x       38.9       14.7  2.6x
+    /api/interests                     24       233.9      152.5  1.5x       53.3       37.0  1.4x
+
+Process time only counts this process, so the time spent waiting on
+Postgres (most of search, in ts_headline) is not in the CPU column.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify
+import json_provider
+from db import get_db
+
+_PROJECTS = """
+    SELECT p.id, p.title, p.description, p.tech_stack,
+           p.live_url, p.github_url, p.image_url, iv.variants AS image_variants,
+           p.featured, p.created_at
+    FROM projects p
+    LEFT JOIN image_variants iv ON iv.source_url = p.image_url
+    ORDER BY p.sort_order ASC
+"""
+_POSTS = """
+    SELECT id, title, slug, created_at, updated_at
+    FROM posts
+    WHERE published = TRUE
+    ORDER BY created_at DESC, id DESC
+    LIMIT %s
+"""
+_SEARCH = """
+    SELECT id, title, slug, created_at, updated_at, rank,
+           ts_headline('english', content, query,
+                       'StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MinWords=8, MaxWords=25')
+               AS snippet
+    FROM (
+        SELECT p.id, p.title, p.slug, p.content, p.created_at, p.updated_at,
+               ts_rank(p.search_vector, query) AS rank, query
+        FROM posts p, websearch_to_tsquery('english', %s) AS query
+        WHERE p.published = TRUE
+          AND p.search_vector @@ query
+        ORDER BY rank DESC, p.id DESC
+        LIMIT %s OFFSET 0
+    ) AS hits
+    ORDER BY rank DESC, id DESC
+"""
+_TAGS = """
+    SELECT t.id, t.name, COUNT(pt.project_id) AS project_count
+    FROM tags t
+    LEFT JOIN project_tags pt ON t.id = pt.tag_id
+    GROUP BY t.id, t.name
+    ORDER BY project_count DESC
+"""
+_INTERESTS = """
+    SELECT id, title, tag, blurb, description, accent, theme, sort_order
+    FROM interests
+    ORDER BY sort_order ASC, id ASC
+"""
+
+_CASES = [
+    ("/api/projects", _PROJECTS, ()),
+    ("/api/posts?limit=100", _POSTS, (101,)),
+    ("/api/posts/search?q=postgres", _SEARCH, ("postgres", 51)),
+    ("/api/tags", _TAGS, ()),
+    ("/api/interests", _INTERESTS, ()),
+]
+
+
+def _dict_response(query, params):
+    with get_db() as (conn, cur):
+        cur.execute(query, params)
+        rows = cur.fetchall()
+    return len(rows), jsonify(rows).get_data()
+
+
+def _tuple_response(query, params):
+    with get_db(tuples=True) as (conn, cur):
+        cur.execute(query, params)
+        rows = cur.fetchall()
+    return len(rows), json_provider.rows_response(rows, cur.description).get_data()
+
+
+def _cpu_us(fn, query, params, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        fn(query, params)
+        best = min(best, time.process_time() - start)
+    return best * 1e6
+
+
+def _peak_kib(fn, query, params):
+    tracemalloc.start()
+    fn(query, params)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.json = json_provider.make_provider(app)
+
+    with app.app_context():
+        print(f"{'endpoint':<30} {'rows':>6}    {'dict CPU':>8}  {'tuple CPU':>9}"
+              f"        {'dict mem':>8}  {'tuple mem':>9}")
+        for name, query, params in _CASES:
+            count, as_dicts = _dict_response(query, params)
+            _, as_tuples = _tuple_response(query, params)
+            # Same document either way
+            assert app.json.loads(as_dicts) == app.json.loads(as_tuples), name
+
+            dict_cpu = _cpu_us(_dict_response, query, params, args.repeat)
+            tuple_cpu = _cpu_us(_tuple_response, query, params, args.repeat)
+            dict_mem = _peak_kib(_dict_response, query, params)
+            tuple_mem = _peak_kib(_tuple_response, query, params)
+            print(f"{name:<30} {count:>6}    {dict_cpu:8.1f}  {tuple_cpu:9.1f} {dict_cpu / tuple_cpu:4.1f}x"
+                  f"   {dict_mem:8.1f}  {tuple_mem:9.1f} {dict_mem / tuple_mem:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+In-process response cache for the public API.
+
+Public GET handlers are wrapped with @cached(...), which stores the
+rendered response body keyed by route + query string (so /api/projects and
+/api/projects?featured=true are separate entries). Each entry is tagged
+with the tables it was built from; admin write handlers call invalidate()
+with the tables they touched, so only the affected entries are evicted.
+
+Entries also expire after CACHE_TTL seconds and the cache holds at most
+CACHE_MAX_ENTRIES responses, evicting the least recently used first.
+
+The same decorator makes the endpoints conditional-GET aware. The ETag is
+derived from the route, the build (see _build_fingerprint) and the
+per-table version counters that the change triggers maintain in
+`content_versions`, and Last-Modified from the time of the newest change to
+those tables. A request whose If-None-Match /
+If-Modified-Since still matches is answered with a 304 after a single
+lookup in `content_versions`, without querying row data (or without
+touching the database at all on a cache hit).
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+import psycopg2
+from flask import current_app, g, has_request_context, make_response, request
+from werkzeug.http import http_date, is_resource_modified
+from db import get_db
+from pagination import NEXT_CURSOR_HEADER
+import config
+
+
+class ResponseCache:
+    """Thread-safe LRU + TTL cache of response bodies, indexed by table."""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (body, status, mimetype, headers, expires, tables)
+        self._by_table = {}             # table -> set of keys built from it
+        self._generations = {}          # table -> bump count, guards in-flight fills
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, key):
+        """Return (body, status, mimetype, headers) for a live entry, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if entry[4] <= time.monotonic():
+                self._remove(key)
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[:4]
+
+    def generations(self, tables):
+        """Snapshot the invalidation counters for `tables` before a fill."""
+        with self._lock:
+            return tuple(self._generations.get(t, 0) for t in tables)
+
+    def set(self, key, body, status, mimetype, headers, tables, generations=None):
+        """
+        Store a response built from `tables`.
+
+        If `generations` is given and any of those tables was invalidated
+        since the snapshot was taken, the (possibly stale) body is dropped.
+        """
+        with self._lock:
+            if generations is not None and generations != tuple(
+                self._generations.get(t, 0) for t in tables
+            ):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (
+                body, status, mimetype, headers, time.monotonic() + self.ttl, tables,
+            )
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, *tables):
+        """Evict every entry built from any of `tables`. Returns the count."""
+        removed = 0
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+                for key in list(self._by_table.get(table, ())):
+                    self._remove(key)
+                    removed += 1
+            self._stats["invalidations"] += 1
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            for table in self._generations:
+                self._generations[table] += 1
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries, **self._stats}
+
+    def _remove(self, key):
+        # Caller holds the lock
+        entry = self._entries.pop(key)
+        for table in entry[5]:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+
+
+response_cache = ResponseCache(config.CACHE_MAX_ENTRIES, config.CACHE_TTL)
+
+
+def invalidate(*tables):
+    """Evict cached public responses built from any of `tables`."""
+    if has_request_context():
+        # Remembered so after-request hooks (e.g. snapshot regeneration)
+        # know what this request changed
+        g.invalidated_tables = g.get("invalidated_tables", set()) | set(tables)
+    return response_cache.invalidate(*tables)
+
+
+def _cache_key():
+    """Route + sorted, re-encoded query args, e.g. '/api/projects?featured=true'."""
+    args = sorted(request.args.items(multi=True))
+    if not args:
+        return request.path
+    # Re-encode so an escaped "&" or "=" inside a value can't collide with
+    # a different set of args
+    return request.path + "?" + urlencode(args)
+
+
+# ---------------------------------------------------------------------------
+# HTTP validators (ETag / Last-Modified)
+# ---------------------------------------------------------------------------
+
+_CACHED_HEADERS = ("ETag", "Last-Modified", "Cache-Control", NEXT_CURSOR_HEADER, "Link")
+_versions_available = True
+_build = None
+
+
+def _build_fingerprint():
+    """
+    What else shapes a response body besides the data: the deployed code
+    (BUILD_ID, or a hash of the backend's Python source) and the JSON
+    settings. Computed once per process.
+    """
+    global _build
+    if _build is None:
+        build = config.BUILD_ID
+        if not build:
+            root = os.path.dirname(os.path.abspath(__file__))
+            digest = hashlib.sha1()
+            for package in ("", "routes", "services"):
+                directory = os.path.join(root, package)
+                for name in sorted(os.listdir(directory)):
+                    if name.endswith(".py"):
+                        with open(os.path.join(directory, name), "rb") as f:
+                            digest.update(f.read())
+            build = digest.hexdigest()
+        _build = f"{build}|{config.JSON_PROVIDER}|{config.JSON_DATETIME_FORMAT}"
+    return _build
+
+
+def _content_validators(key, tables):
+    """
+    Return (etag, last_modified) for `key` from the table version counters,
+    or None if the content_versions table isn't installed.
+    """
+    global _versions_available
+    if not _versions_available:
+        return None
+    try:
+        with get_db() as (conn, cur):
+            # -- Demonstrates: aggregate over a tiny keyed table
+            # -- Purpose: Fingerprint the tables behind a response without reading them
+            cur.execute("""
+                SELECT string_agg(table_name || ':' || version, ',' ORDER BY table_name) AS versions,
+                       MAX(changed_at) AS changed_at
+                FROM content_versions
+                WHERE table_name = ANY(%s)
+            """, (list(tables),))
+            row = cur.fetchone()
+    except psycopg2.errors.UndefinedTable:
+        print("Warning: content_versions table missing (run database/add_content_versions.sql); "
+              "falling back to content-hash ETags")
+        _versions_available = False
+        return None
+
+    fingerprint = f"{key}|{_build_fingerprint()}|{row['versions'] or ''}".encode()
+    etag = hashlib.sha1(fingerprint).hexdigest()
+    return etag, row["changed_at"]
+
+
+def _cache_control():
+    return (
+        f"public, max-age={config.HTTP_CACHE_MAX_AGE}, "
+        f"s-maxage={config.HTTP_CACHE_S_MAXAGE}, "
+        f"stale-while-revalidate={config.HTTP_CACHE_STALE_WHILE_REVALIDATE}"
+    )
+
+
+def _validator_headers(validators):
+    etag, last_modified = validators
+    headers = {"ETag": f'"{etag}"', "Cache-Control": _cache_control()}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def _finalize(response):
+    """Add Vary and turn the response into a 304 if the client's copy is current."""
+    # Access-Control-Allow-Origin depends on Origin, the body on Accept-Encoding
+    response.vary.add("Origin")
+    response.vary.add("Accept-Encoding")
+    return response.make_conditional(request)
+
+
+def cached(*tables, store=True):
+    """
+    Cache a public GET view's successful responses and answer conditional GETs.
+
+    `tables` lists every table the response is built from; invalidating any
+    of them evicts the entry and changes the ETag. Only 200 responses are
+    stored or given validators.
+
+    With store=False responses still get validators and Cache-Control (so
+    304s and CDN caching work) but never enter the in-process cache — for
+    endpoints keyed by free-form input, whose one-off entries would push
+    the hot ones out of the shared LRU.
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            key = _cache_key()
+            use_cache = store and config.CACHE_ENABLED
+
+            if use_cache:
+                hit = response_cache.get(key)
+                if hit is not None:
+                    body, status, mimetype, headers = hit
+                    return _finalize(current_app.response_class(
+                        body, status=status, mimetype=mimetype, headers=headers,
+                    ))
+                generations = response_cache.generations(tables)
+
+            validators = _content_validators(key, tables)
+            if validators is not None:
+                headers = _validator_headers(validators)
+                if not is_resource_modified(
+                    request.environ, etag=validators[0], last_modified=validators[1],
+                ):
+                    return _finalize(current_app.response_class(status=304, headers=headers))
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200 or response.direct_passthrough:
+                return response
+
+            if validators is not None:
+                response.headers.update(headers)
+            else:
+                response.add_etag()
+                response.headers["Cache-Control"] = _cache_control()
+
+            if use_cache:
+                response_cache.set(
+                    key,
+                    response.get_data(),
+                    response.status_code,
+                    response.mimetype,
+                    [(h, response.headers[h]) for h in _CACHED_HEADERS if h in response.headers],
+                    tables,
+                    generations,
+                )
+            return _finalize(response)
+        return decorated
+    return decorator
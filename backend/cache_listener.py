@@ -0,0 +1,86 @@
+"""
+Cross-worker cache invalidation via PostgreSQL LISTEN/NOTIFY.
+
+Triggers on the content tables (see database/add_change_notify.sql) send
+the changed table's name on the `content_changed` channel whenever a write
+commits. Each worker process runs one daemon thread that LISTENs on a
+dedicated connection and evicts the matching entries from its own
+response cache, so an admin write handled by one gunicorn worker is seen
+by every other worker within milliseconds.
+
+If the listener connection drops, the whole cache is cleared on reconnect
+because notifications sent in the meantime are lost.
+"""
+
+import select
+import threading
+import time
+import psycopg2
+from cache import invalidate, response_cache
+from db import get_connection
+import config
+
+CHANNEL = "content_changed"
+
+_HEALTHCHECK_INTERVAL = 30   # seconds of silence before we ping the connection
+_MAX_BACKOFF = 60
+
+_thread = None
+_lock = threading.Lock()
+
+
+def ensure_started():
+    """Start this process's listener thread if it isn't running yet."""
+    global _thread
+    if not (config.CACHE_ENABLED and config.CACHE_LISTEN_ENABLED):
+        return
+    if _thread is not None and _thread.is_alive():
+        return
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _thread = threading.Thread(target=_listen_forever, name="cache-listener", daemon=True)
+        _thread.start()
+
+
+def _listen_forever():
+    backoff = 1
+    while True:
+        conn = None
+        try:
+            conn = get_connection()
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {CHANNEL}")
+
+            # Changes made while we weren't listening were never delivered
+            response_cache.clear()
+            backoff = 1
+            _drain(conn)
+        except Exception as e:
+            print(f"Warning: Cache listener disconnected, retrying in {backoff}s: {e}")
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except psycopg2.Error:
+                    pass
+        time.sleep(backoff)
+        backoff = min(backoff * 2, _MAX_BACKOFF)
+
+
+def _drain(conn):
+    """Block on the connection and apply notifications until it fails."""
+    while True:
+        readable, _, _ = select.select([conn], [], [], _HEALTHCHECK_INTERVAL)
+        if not readable:
+            # Quiet period — make sure the connection is still alive
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            continue
+
+        conn.poll()
+        tables = {notify.payload for notify in conn.notifies}
+        conn.notifies.clear()
+        if tables:
+            invalidate(*tables)
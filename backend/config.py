@@ -6,6 +6,7 @@ for local development. See .env.example in the project root.
 """
 
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -18,14 +19,101 @@ DB_NAME = os.getenv("DB_NAME", "portfolio")
 DB_USER = os.getenv("DB_USER", "postgres")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "postgres")
 
+# Connection pool (one per worker process). Disable when an external pooler
+# such as PgBouncer already sits in front of the database.
+DB_POOL_ENABLED = os.getenv("DB_POOL_ENABLED", "true").lower() == "true"
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))        # seconds to wait for a free connection
+DB_POOL_RECYCLE = float(os.getenv("DB_POOL_RECYCLE", "1800"))     # max connection age in seconds (0 = never)
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_POOL_PING_AFTER = float(os.getenv("DB_POOL_PING_AFTER", "30"))  # only ping connections idle this long
+
+# Server-side prepared statements for the public routes' named queries
+# (see queries.py). Only used on pooled connections; turn off behind a
+# transaction-mode pooler, which doesn't keep session state.
+DB_PREPARED_STATEMENTS = os.getenv("DB_PREPARED_STATEMENTS", "true").lower() == "true"
+
+# --- Background threads ---
+# The metrics flusher, cache listener, email outbox sender, image variant
+# workers (services/images.py) and snapshot regeneration (snapshot.py).
+# Off by default on Vercel: a serverless instance is frozen after each
+# response, so the threads would hold database connections open and leave
+# work unfinished. Without them the cache relies on CACHE_TTL, emails wait
+# for a scheduled drain (see OUTBOX_DRAIN_TOKEN), and image variants and
+# snapshots are generated before the response is returned
+BACKGROUND_THREADS = os.getenv(
+    "BACKGROUND_THREADS", "false" if os.getenv("VERCEL") else "true"
+).lower() == "true"
+
+# --- Response cache (public GET endpoints, per worker process) ---
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+CACHE_TTL = float(os.getenv("CACHE_TTL", "300"))              # seconds before an entry expires
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "256"))  # LRU bound
+# Evict entries when other workers write (needs database/add_change_notify.sql
+# and a session-mode connection — LISTEN doesn't work through transaction poolers)
+CACHE_LISTEN_ENABLED = os.getenv("CACHE_LISTEN_ENABLED", "true").lower() == "true"
+
+# --- HTTP caching headers for public GET endpoints ---
+# Browsers revalidate every time (cheap 304s); a CDN may serve its copy for
+# S_MAXAGE seconds and keep serving it while it revalidates in the background.
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "0"))
+HTTP_CACHE_S_MAXAGE = int(os.getenv("HTTP_CACHE_S_MAXAGE", "60"))
+HTTP_CACHE_STALE_WHILE_REVALIDATE = int(os.getenv("HTTP_CACHE_STALE_WHILE_REVALIDATE", "300"))
+# Part of every ETag, so a deploy that changes response bodies doesn't get
+# 304s for clients' old copies. Defaults to the platform's commit SHA, else
+# a hash of the backend's source (see cache.py)
+BUILD_ID = os.getenv("BUILD_ID") or os.getenv("VERCEL_GIT_COMMIT_SHA") or os.getenv("RENDER_GIT_COMMIT", "")
+
+# --- JSON responses (see json_provider.py) ---
+JSON_PROVIDER = os.getenv("JSON_PROVIDER", "orjson")                # or "stdlib"
+JSON_DATETIME_FORMAT = os.getenv("JSON_DATETIME_FORMAT", "http")    # or "iso" (ISO 8601, faster)
+
+# --- Admin export/import (see routes/backup.py) ---
+# Rows fetched per server-side cursor round trip (and per response chunk)
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "1000"))
+
+# --- Static API snapshots (see snapshot.py) ---
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "snapshots")
+# Re-render affected snapshot files in the background after admin writes
+SNAPSHOT_ON_WRITE = os.getenv("SNAPSHOT_ON_WRITE", "false").lower() == "true"
+
 # --- AWS General ---
 AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
+# Shared boto3 clients (see services/aws.py)
+AWS_CONNECT_TIMEOUT = float(os.getenv("AWS_CONNECT_TIMEOUT", "3"))
+AWS_READ_TIMEOUT = float(os.getenv("AWS_READ_TIMEOUT", "10"))
+AWS_MAX_ATTEMPTS = int(os.getenv("AWS_MAX_ATTEMPTS", "3"))          # total attempts, including the first
+AWS_RETRY_MODE = os.getenv("AWS_RETRY_MODE", "standard")           # legacy | standard | adaptive
+AWS_MAX_POOL_CONNECTIONS = int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "10"))
 
 # --- AWS S3 (for project images) ---
 S3_BUCKET = os.getenv("S3_BUCKET", "portfolio-images-dev")
 # When running locally without AWS, we store uploads in a local directory
 USE_LOCAL_STORAGE = os.getenv("USE_LOCAL_STORAGE", "true").lower() == "true"
 LOCAL_UPLOAD_DIR = os.getenv("LOCAL_UPLOAD_DIR", "uploads")
+# S3 transfers: files above the threshold are uploaded in parallel parts
+S3_MULTIPART_THRESHOLD = int(os.getenv("S3_MULTIPART_THRESHOLD", str(8 * 1024 * 1024)))
+S3_MULTIPART_CHUNKSIZE = int(os.getenv("S3_MULTIPART_CHUNKSIZE", str(8 * 1024 * 1024)))
+S3_MAX_CONCURRENCY = int(os.getenv("S3_MAX_CONCURRENCY", "4"))
+# Lifetime of presigned direct-upload policies, in seconds
+UPLOAD_PRESIGN_EXPIRES = int(os.getenv("UPLOAD_PRESIGN_EXPIRES", "300"))
+
+# --- Serving local uploads (see static_files.py) ---
+# Content-addressed files are cached for a year; this applies to the rest
+UPLOAD_CACHE_MAX_AGE = int(os.getenv("UPLOAD_CACHE_MAX_AGE", "3600"))
+# "" (Python sends the file), "x-sendfile" or "x-accel-redirect"
+UPLOAD_OFFLOAD = os.getenv("UPLOAD_OFFLOAD", "").lower()
+# nginx `internal` location that maps onto LOCAL_UPLOAD_DIR
+UPLOAD_ACCEL_PREFIX = os.getenv("UPLOAD_ACCEL_PREFIX", "/protected-uploads/")
+# Serve AVIF/WebP variants to browsers that ask for them
+UPLOAD_NEGOTIATE_FORMATS = os.getenv("UPLOAD_NEGOTIATE_FORMATS", "true").lower() == "true"
+
+# --- Responsive image variants (see services/images.py) ---
+IMAGE_VARIANTS_ENABLED = os.getenv("IMAGE_VARIANTS_ENABLED", "true").lower() == "true"
+IMAGE_VARIANT_WIDTHS = [int(w) for w in os.getenv("IMAGE_VARIANT_WIDTHS", "320,640,1280").split(",")]
+IMAGE_VARIANT_FORMATS = [f.strip() for f in os.getenv("IMAGE_VARIANT_FORMATS", "webp,avif").split(",")]
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))  # encoder threads per worker process
 
 # --- AWS SES (for contact form emails) ---
 SES_SENDER_EMAIL = os.getenv("SES_SENDER_EMAIL", "noreply@example.com")
@@ -33,11 +121,58 @@ SES_RECIPIENT_EMAIL = os.getenv("SES_RECIPIENT_EMAIL", "your-email@example.com")
 # When running locally without AWS, we just log the email instead of sending
 USE_LOCAL_EMAIL = os.getenv("USE_LOCAL_EMAIL", "true").lower() == "true"
 
+# --- Email outbox (see services/outbox.py) ---
+OUTBOX_SENDER_ENABLED = os.getenv("OUTBOX_SENDER_ENABLED", "true").lower() == "true"
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "20"))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "30"))   # seconds between sweeps when idle
+# Seconds a claimed batch is reserved. The sender renews it while it works
+# through a batch, so it only has to outlast one email: by default twice the
+# worst case of one SES call (every attempt timing out, with botocore's
+# backoff of at most 20 s between attempts)
+OUTBOX_LEASE = int(os.getenv("OUTBOX_LEASE") or 2 * (
+    AWS_MAX_ATTEMPTS * (AWS_CONNECT_TIMEOUT + AWS_READ_TIMEOUT) + (AWS_MAX_ATTEMPTS - 1) * 20
+))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))        # then the email is dead-lettered
+OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE", "30"))     # first retry delay, doubled each time
+OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX", "3600"))
+# Without background threads nothing sends queued emails on its own: run
+# `flask --app app outbox-drain` from cron, or have a scheduler (e.g. Vercel
+# Cron) call /api/outbox/drain with "Authorization: Bearer <OUTBOX_DRAIN_TOKEN>"
+# (defaults to Vercel's CRON_SECRET; the endpoint is off while it's empty)
+OUTBOX_DRAIN_TOKEN = os.getenv("OUTBOX_DRAIN_TOKEN") or os.getenv("CRON_SECRET", "")
+# Or send due emails inside the request that queued them — /api/contact then
+# waits for SES again
+OUTBOX_DRAIN_INLINE = os.getenv("OUTBOX_DRAIN_INLINE", "false").lower() == "true"
+
+# --- Rate limiting (see ratelimit_storage.py) ---
+# One SQLite file shared by every worker on the host; "memory://" = per process
+RATELIMIT_STORAGE_URI = os.getenv(
+    "RATELIMIT_STORAGE_URI",
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "portfolio-ratelimit.sqlite3"),
+)
+RATELIMIT_STRATEGY = os.getenv("RATELIMIT_STRATEGY", "moving-window")  # or "fixed-window"
+
 # --- Admin Auth (simple password for demo purposes) ---
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "admin123")
+# Check each admin request against the revoked_tokens table (one indexed
+# lookup), so logging out invalidates a token before it expires
+ADMIN_TOKEN_REVOCATION = os.getenv("ADMIN_TOKEN_REVOCATION", "false").lower() == "true"
+
+# --- Metrics (see metrics.py) ---
+# /api/metrics answers only with "Authorization: Bearer <METRICS_TOKEN>";
+# unset = endpoint disabled (404)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+# Shared by the workers on a host so one scrape covers all of them;
+# empty = each worker reports only itself
+METRICS_DIR = os.getenv("METRICS_DIR", os.path.join(tempfile.gettempdir(), "portfolio-metrics"))
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))   # seconds
+METRICS_STALE_AFTER = float(os.getenv("METRICS_STALE_AFTER", "60"))        # drop snapshots of exited workers
+METRICS_QUERY_LABEL_LENGTH = int(os.getenv("METRICS_QUERY_LABEL_LENGTH", "80"))
 
 # --- Flask ---
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
+# Previous SECRET_KEYs (comma-separated), still accepted while rotating
+SECRET_KEY_FALLBACKS = [k for k in os.getenv("SECRET_KEY_FALLBACKS", "").split(",") if k]
 
 # --- CORS ---
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
@@ -2,32 +2,342 @@
 Database connection module.
 
 Uses psycopg2 directly (no ORM) to demonstrate raw SQL skills.
-Provides a simple connection pool for efficient database access.
+Provides a per-worker connection pool so requests reuse open connections
+instead of paying a TCP + TLS + auth handshake on every hit.
 
 AWS Integration: RDS (PostgreSQL)
 - In production, DB_HOST points to your RDS instance endpoint
 - In local dev, it points to localhost
+
+Pooling:
+- Enabled with DB_POOL_ENABLED=true (default); set it to false to open a
+  fresh connection per request (e.g. behind an external pooler)
+- The pool is created lazily on first use and dropped in forked children,
+  so each gunicorn worker owns its own connections
+- Stale connections are pinged before reuse and recycled after
+  DB_POOL_RECYCLE seconds; checkouts wait at most DB_POOL_TIMEOUT seconds
+
+Prepared statements:
+- Pooled connections remember which named queries (queries.py) they have
+  prepared, so each statement is parsed and planned once per connection
+  rather than on every request (DB_PREPARED_STATEMENTS, default on)
+
+Connects, checkouts and every statement run through get_db() are timed
+(see metrics.py).
 """
 
+import os
+import threading
+import time
 import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, cursor as TupleCursor
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import PoolError
 from contextlib import contextmanager
 import config
+import metrics
+
+
+class _Connection(psycopg2.extensions.connection):
+    """Connection that can track the named queries prepared on its session."""
+
+    prepared = None           # set of prepared names; None = don't prepare
+    deallocate_all = False    # session state is unknown, start over
 
 
 def get_connection():
     """Create a new database connection using environment config."""
-    return psycopg2.connect(
+    start = time.perf_counter()
+    conn = psycopg2.connect(
         host=config.DB_HOST,
         port=config.DB_PORT,
         dbname=config.DB_NAME,
         user=config.DB_USER,
         password=config.DB_PASSWORD,
+        connection_factory=_Connection,
     )
+    metrics.DB_CONNECT_DURATION.observe(time.perf_counter() - start)
+    return conn
+
+
+class _TimingMixin:
+    """Reports each statement's duration to metrics."""
+
+    def execute(self, query, vars=None):
+        start = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            metrics.observe_query(query, time.perf_counter() - start, self)
+
+    def copy_expert(self, sql, file, size=8192):
+        start = time.perf_counter()
+        try:
+            return super().copy_expert(sql, file, size)
+        finally:
+            metrics.observe_query(sql, time.perf_counter() - start, self)
+
+
+class _TimedCursor(_TimingMixin, RealDictCursor):
+    """Rows as dicts (the default)."""
+
+
+class _TimedTupleCursor(_TimingMixin, TupleCursor):
+    """Rows as plain tuples; column names are in cur.description."""
+
+
+# ---------------------------------------------------------------------------
+# Connection pool
+# ---------------------------------------------------------------------------
+
+class PoolTimeout(PoolError):
+    """Raised when no connection becomes available within the checkout timeout."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of psycopg2 connections owned by a single process.
+
+    Idle connections are reused LIFO so the hottest connection stays warm.
+    Before handing one out the pool drops it if it is closed or older than
+    `recycle` seconds, and pings it with SELECT 1 if it sat idle longer than
+    `ping_after` seconds (when `pre_ping` is on).
+
+    With `prepare_statements`, its connections keep their prepared named
+    queries across checkouts (see queries.py).
+    """
+
+    def __init__(self, minconn, maxconn, timeout, recycle, pre_ping, ping_after,
+                 prepare_statements=False):
+        if maxconn < 1 or minconn < 0 or minconn > maxconn:
+            raise ValueError("Invalid pool size: need 0 <= min <= max and max >= 1")
+
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self.ping_after = ping_after
+        self.prepare_statements = prepare_statements
+
+        self._cond = threading.Condition()
+        self._idle = []        # [(conn, created_at, last_used)] — LIFO stack
+        self._born = {}        # conn -> created_at, for connections checked out
+        self._size = 0         # open connections (idle + in use)
+        self._closed = False
+        self._stats = {
+            "connects": 0,
+            "checkouts": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "recycled": 0,
+            "ping_failures": 0,
+            "discarded": 0,
+        }
+
+        for _ in range(minconn):
+            try:
+                conn = self._connect()
+            except psycopg2.Error as e:
+                # Don't fail worker startup — the pool will retry on demand
+                print(f"Warning: Failed to pre-open pooled DB connection: {e}")
+                break
+            now = time.monotonic()
+            with self._cond:
+                self._size += 1
+                self._idle.append((conn, now, now))
+
+    def _connect(self):
+        conn = get_connection()
+        if self.prepare_statements:
+            conn.prepared = set()
+        with self._cond:
+            self._stats["connects"] += 1
+        return conn
+
+    def _is_stale(self, conn, created_at, last_used, now):
+        """Return True if an idle connection should not be handed out."""
+        if conn.closed:
+            return True
+        if self.recycle > 0 and now - created_at > self.recycle:
+            with self._cond:
+                self._stats["recycled"] += 1
+            return True
+        if self.pre_ping and now - last_used > self.ping_after:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                conn.rollback()
+            except psycopg2.Error:
+                with self._cond:
+                    self._stats["ping_failures"] += 1
+                return True
+        return False
+
+    def getconn(self):
+        """Check out a healthy connection, waiting up to `timeout` seconds."""
+        deadline = time.monotonic() + self.timeout
+        waited = False
+
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise PoolError("Connection pool is closed")
+                while not self._idle and self._size >= self.maxconn:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeout(
+                            f"No database connection available within {self.timeout}s"
+                        )
+                    if not waited:
+                        self._stats["waits"] += 1
+                        waited = True
+                    self._cond.wait(remaining)
+
+                if self._idle:
+                    conn, created_at, last_used = self._idle.pop()
+                else:
+                    conn = None
+                    self._size += 1
+
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                created_at = time.monotonic()
+            elif self._is_stale(conn, created_at, last_used, time.monotonic()):
+                self._close_quietly(conn)
+                with self._cond:
+                    self._size -= 1
+                    self._stats["discarded"] += 1
+                    self._cond.notify()
+                continue
+
+            with self._cond:
+                self._born[conn] = created_at
+                self._stats["checkouts"] += 1
+            return conn
+
+    def putconn(self, conn, discard=False):
+        """Return a connection to the pool (or close it if it is unusable)."""
+        with self._cond:
+            created_at = self._born.pop(conn, None)
+
+        if created_at is None:
+            raise PoolError("Trying to return a connection that is not checked out")
+
+        if not discard and not conn.closed and not self._closed:
+            try:
+                if conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                discard = True
+        else:
+            discard = True
+
+        if discard:
+            self._close_quietly(conn)
+
+        with self._cond:
+            if discard:
+                self._size -= 1
+                self._stats["discarded"] += 1
+            else:
+                self._idle.append((conn, created_at, time.monotonic()))
+            self._cond.notify()
+
+    def closeall(self):
+        """Close every idle connection and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _, _ in idle:
+            self._close_quietly(conn)
+
+    def stats(self):
+        """Snapshot of pool counters for monitoring."""
+        with self._cond:
+            return {
+                "min": self.minconn,
+                "max": self.maxconn,
+                "size": self._size,
+                "in_use": len(self._born),
+                "idle": len(self._idle),
+                **self._stats,
+            }
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    """Return this process's pool, creating it on first use (None if disabled)."""
+    global _pool
+    if not config.DB_POOL_ENABLED:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    minconn=config.DB_POOL_MIN,
+                    maxconn=config.DB_POOL_MAX,
+                    timeout=config.DB_POOL_TIMEOUT,
+                    recycle=config.DB_POOL_RECYCLE,
+                    pre_ping=config.DB_POOL_PRE_PING,
+                    ping_after=config.DB_POOL_PING_AFTER,
+                    prepare_statements=config.DB_PREPARED_STATEMENTS,
+                )
+    return _pool
+
+
+def _reset_pool_after_fork():
+    # Connections inherited from the parent share its sockets, so the child
+    # must forget them without closing (closing would terminate the parent's
+    # sessions). The child builds its own pool on first use.
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_pool_after_fork)
+
+
+def pool_stats():
+    """Return pool statistics for this worker, or None when pooling is off."""
+    pool = _pool
+    return pool.stats() if pool is not None else None
+
+
+def _collect_pool_metrics():
+    stats = pool_stats()
+    if stats is None:
+        return
+    metrics.DB_POOL_CONNECTIONS.set(stats["in_use"], "in_use")
+    metrics.DB_POOL_CONNECTIONS.set(stats["idle"], "idle")
+    for event in ("connects", "checkouts", "waits", "timeouts", "recycled", "ping_failures", "discarded"):
+        metrics.DB_POOL_EVENTS.set_total(stats[event], event)
+
+
+metrics.register_collector(_collect_pool_metrics)
 
 
 @contextmanager
-def get_db():
+def get_db(tuples=False):
     """
     Context manager for database connections.
 
@@ -38,17 +348,43 @@ def get_db():
 
     - Automatically commits on success
     - Automatically rolls back on error
-    - Always closes the connection when done
+    - Always releases the connection when done (back to the pool, or
+      closed when pooling is disabled)
     - Uses RealDictCursor so rows come back as dictionaries
+
+    With tuples=True rows come back as plain tuples instead, built in C
+    with no per-row dict. Hot list endpoints use this together with
+    json_provider.rows_response(), which writes the JSON straight from the
+    tuples and cur.description.
     """
-    conn = get_connection()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
+    pool = _get_pool()
+    start = time.perf_counter()
+    conn = pool.getconn() if pool is not None else get_connection()
+    metrics.DB_CHECKOUT_DURATION.observe(
+        time.perf_counter() - start, "true" if pool is not None else "false",
+    )
+    broken = False
+    try:
+        cur = conn.cursor(cursor_factory=_TimedTupleCursor if tuples else _TimedCursor)
+    except Exception:
+        if pool is not None:
+            pool.putconn(conn, discard=True)
+        else:
+            conn.close()
+        raise
+
     try:
         yield conn, cur
         conn.commit()
     except Exception:
-        conn.rollback()
+        try:
+            conn.rollback()
+        except psycopg2.Error:
+            broken = True
         raise
     finally:
         cur.close()
-        conn.close()
+        if pool is not None:
+            pool.putconn(conn, discard=broken)
+        else:
+            conn.close()
@@ -4,5 +4,13 @@ Shared Flask extensions — initialized here to avoid circular imports.
 
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
+import ratelimit_storage  # noqa: F401 — registers the sqlite:// storage scheme
+import config
 
-limiter = Limiter(key_func=get_remote_address)
+# Counters live in RATELIMIT_STORAGE_URI so every worker enforces the same
+# limits (see ratelimit_storage.py); memory:// keeps them per process
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=config.RATELIMIT_STORAGE_URI,
+    strategy=config.RATELIMIT_STRATEGY,
+)
@@ -0,0 +1,263 @@
+"""
+JSON provider for API responses — orjson when available, stdlib otherwise.
+
+Every route answers with jsonify() over RealDictCursor rows, so on list
+endpoints (/api/posts, /api/admin/messages, ...) serialization is a real
+share of the request's CPU time. Flask's default provider goes through
+the pure-Python parts of the stdlib encoder and calls back into Python for
+every datetime; orjson encodes dicts, lists and datetimes natively in C
+(see benchmarks/json_provider.py).
+
+Selected in config.py:
+    JSON_PROVIDER=orjson    (default) falls back to stdlib, with a warning,
+                            if the orjson package is not installed
+    JSON_PROVIDER=stdlib    Flask's default provider
+
+    JSON_DATETIME_FORMAT=http   (default) "Tue, 15 Sep 2025 10:00:00 GMT",
+                                what the API has always returned
+    JSON_DATETIME_FORMAT=iso    "2025-09-15T10:00:00Z" — orjson's native
+                                format, and the fastest
+
+With the defaults both providers produce the same JSON (keys sorted,
+compact, trailing newline); orjson writes non-ASCII characters as UTF-8
+instead of \\u escapes. Naive timestamps from the database are treated as
+UTC in both formats, as before.
+
+rows_response() is the fast path for list endpoints that fetch plain
+tuples (get_db(tuples=True)): per column signature it compiles a function
+that writes each row's JSON object directly, keys pre-rendered and sorted,
+values formatted by column type — the same bytes jsonify() would
+produce from dict rows, without building any dicts. Escaping of non-ASCII
+text, the datetime format and the UTC suffix ("Z" or "+00:00") are taken
+from the active provider (tests/test_json_provider.py checks both paths).
+"""
+
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+import config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def _http_date(value):
+    """Same output as werkzeug.http.http_date, without its per-call overhead."""
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    elif value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return (
+        f"{_DAYS[value.weekday()]}, {value.day:02d} {_MONTHS[value.month - 1]} {value.year:04d} "
+        f"{value.hour:02d}:{value.minute:02d}:{value.second:02d} GMT"
+    )
+
+
+def _iso(value):
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.isoformat() + "Z"
+    return value.isoformat()
+
+
+def _iso_utc_z(value):
+    """_iso(), with a UTC offset written as "Z" (orjson's OPT_UTC_Z)."""
+    text = _iso(value)
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Flask's provider, optionally writing datetimes as ISO 8601."""
+
+    utc_z = False
+
+    def __init__(self, app, datetime_format="http"):
+        super().__init__(app)
+        self.datetime_format = datetime_format
+        if datetime_format == "iso":
+            self.default = self._iso_default
+
+    @staticmethod
+    def _iso_default(o):
+        if isinstance(o, date):
+            return _iso(o)
+        return DefaultJSONProvider.default(o)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Serializes with orjson. Values orjson can't encode itself (Decimal,
+    and datetimes when the HTTP-date format is kept) go through _default.
+    """
+
+    # orjson never escapes non-ASCII and writes a UTC offset as "Z"
+    ensure_ascii = False
+    utc_z = True
+
+    def __init__(self, app, datetime_format="http"):
+        super().__init__(app)
+        self.datetime_format = datetime_format
+        self._options = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+        if datetime_format == "http":
+            # Hand dates to _default instead of encoding them as ISO 8601
+            self._options |= orjson.OPT_PASSTHROUGH_DATETIME
+
+    def _orjson_options(self, indent=False):
+        options = self._options
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    @staticmethod
+    def _default(o):
+        if isinstance(o, date):
+            return _http_date(o)
+        if isinstance(o, (decimal.Decimal, uuid.UUID)):
+            return str(o)
+        if dataclasses.is_dataclass(o):
+            return dataclasses.asdict(o)
+        if hasattr(o, "__html__"):
+            return str(o.__html__())
+        raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+    def _dumps_bytes(self, obj, indent=False):
+        return orjson.dumps(obj, default=self._default, option=self._orjson_options(indent))
+
+    def dumps(self, obj, **kwargs):
+        indent = kwargs.pop("indent", None)
+        kwargs.pop("separators", None)
+        if kwargs or indent not in (None, 2):
+            # Options orjson doesn't have (cls=, other indents, ...)
+            if indent is not None:
+                kwargs["indent"] = indent
+            return super().dumps(obj, **kwargs)
+        return self._dumps_bytes(obj, indent=indent == 2).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            self._dumps_bytes(obj, indent=indent) + b"\n", mimetype=self.mimetype,
+        )
+
+
+def make_provider(app):
+    """The JSON provider chosen by JSON_PROVIDER / JSON_DATETIME_FORMAT."""
+    datetime_format = config.JSON_DATETIME_FORMAT
+    if datetime_format not in ("http", "iso"):
+        print(f"Warning: Unknown JSON_DATETIME_FORMAT {datetime_format!r}, using http")
+        datetime_format = "http"
+
+    if config.JSON_PROVIDER == "orjson":
+        if orjson is not None:
+            return OrjsonProvider(app, datetime_format)
+        print("Warning: orjson is not installed, falling back to the stdlib JSON provider")
+    elif config.JSON_PROVIDER != "stdlib":
+        print(f"Warning: Unknown JSON_PROVIDER {config.JSON_PROVIDER!r}, using stdlib")
+    return StdlibJSONProvider(app, datetime_format)
+
+
+# ---------------------------------------------------------------------------
+# Compiled serializers for tuple rows
+# ---------------------------------------------------------------------------
+
+# Postgres type OIDs (cur.description type_code) with a dedicated encoder
+_INT_TYPES = {20, 21, 23}                   # int8, int2, int4
+_BOOL_TYPES = {16}
+_TEXT_TYPES = {25, 1042, 1043}              # text, char(n), varchar(n)
+_DATETIME_TYPES = {1082, 1114, 1184}        # date, timestamp, timestamptz
+
+# C-accelerated string escaping: UTF-8 kept as is (like orjson), or \u
+# escapes (like the stdlib provider's ensure_ascii)
+_STR_ENCODERS = {False: json.encoder.encode_basestring, True: json.encoder.encode_basestring_ascii}
+
+
+def _encode_any(value):
+    """Any other type (json/jsonb, numeric, ...): the app's own JSON provider."""
+    return current_app.json.dumps(value, separators=(",", ":"))
+
+
+def _value_expression(var, type_code, datetime_format, utc_z):
+    if type_code in _INT_TYPES:
+        return f'("null" if {var} is None else str({var}))'
+    if type_code in _BOOL_TYPES:
+        return f'("null" if {var} is None else "true" if {var} else "false")'
+    if type_code in _TEXT_TYPES:
+        return f'("null" if {var} is None else _encode_str({var}))'
+    if type_code in _DATETIME_TYPES:
+        fmt = "_http_date" if datetime_format == "http" else "_iso_utc_z" if utc_z else "_iso"
+        return f'("null" if {var} is None else \'"\' + {fmt}({var}) + \'"\')'
+    return f'("null" if {var} is None else _encode_any({var}))'
+
+
+@lru_cache(maxsize=256)
+def _compile(columns, datetime_format, ensure_ascii, utc_z):
+    names = [name for name, _ in columns]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate column names: {names}")
+
+    variables = [f"c{i}" for i in range(len(columns))]
+    parts = []
+    for position, (index, (name, type_code)) in enumerate(sorted(enumerate(columns), key=lambda c: c[1][0])):
+        prefix = ("{" if position == 0 else ",") + json.dumps(name) + ":"
+        parts.append(repr(prefix))
+        parts.append(_value_expression(variables[index], type_code, datetime_format, utc_z))
+    parts.append(repr("}") if columns else repr("{}"))
+
+    # One tuple unpack and one string concatenation per row
+    unpack = ", ".join(variables) + ("," if len(variables) == 1 else "")
+    source = (
+        "def serialize(rows):\n"
+        f"    return [{' + '.join(parts)} for ({unpack}) in rows]\n"
+    )
+    namespace = {
+        "_encode_str": _STR_ENCODERS[ensure_ascii], "_encode_any": _encode_any,
+        "_http_date": _http_date, "_iso": _iso, "_iso_utc_z": _iso_utc_z,
+    }
+    exec(compile(source, f"<row serializer {','.join(names)}>", "exec"), namespace)
+    return namespace["serialize"]
+
+
+def compile_rows_serializer(description):
+    """
+    Return a function mapping tuple rows (with this cur.description) to
+    their JSON object strings, formatted like the app's JSON provider.
+    Compiled once per column signature and provider settings.
+    """
+    provider = current_app.json
+    columns = tuple((column.name, column.type_code) for column in description)
+    return _compile(
+        columns,
+        getattr(provider, "datetime_format", "http"),
+        getattr(provider, "ensure_ascii", True),
+        getattr(provider, "utc_z", False),
+    )
+
+
+def rows_json(rows, description):
+    """The JSON array of `rows` (tuples described by `description`)."""
+    return "[" + ",".join(compile_rows_serializer(description)(rows)) + "]"
+
+
+def rows_response(rows, description):
+    """Like jsonify(rows) for dict rows — for rows from get_db(tuples=True)."""
+    return current_app.response_class(
+        rows_json(rows, description) + "\n", mimetype=current_app.json.mimetype,
+    )
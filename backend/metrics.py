@@ -0,0 +1,390 @@
+"""
+Request, SQL and AWS timing, exposed in Prometheus text format at /api/metrics.
+
+What is measured:
+    http_request_duration_seconds   per blueprint / route / method / status
+    http_requests_in_flight         per blueprint
+    http_request_db_seconds         time each request spent in SQL, per route
+    http_request_db_queries         statements each request sent, per route
+    db_query_duration_seconds       per route and statement — which query
+                                    dominates an endpoint
+    db_checkout_duration_seconds    getting a connection (pool wait + connect)
+    db_connect_duration_seconds     opening a new connection
+    aws_call_duration_seconds       per service / operation / outcome
+                                    (SES, S3; retries included)
+    db_pool_*                       pool occupancy and event counters
+    db_prepared_statements_total    named-query executions per query, by
+                                    hit / miss / unprepared (queries.py)
+
+Routes are labelled by their URL rule (/api/projects/<int:project_id>),
+not the path, and statements by their whitespace-collapsed SQL (long ones
+are cut short and suffixed with a hash), so label sets stay bounded.
+
+Workers: every gunicorn worker keeps its own registry. With METRICS_DIR set
+(default: a directory under the system temp dir) each worker writes a
+snapshot there every METRICS_FLUSH_INTERVAL seconds, and whichever worker
+answers the scrape merges them — counters and histograms are added up,
+gauges summed. Snapshots older than METRICS_STALE_AFTER (workers that have
+exited) are dropped. With METRICS_DIR empty, a scrape shows one worker only.
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from flask import g, has_request_context, request
+import config
+
+_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+_lock = threading.Lock()
+_metrics = {}          # name -> metric, in registration order
+_collectors = []       # callables refreshing gauges from stats kept elsewhere
+_thread = None
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}      # tuple of label values -> value
+        _metrics[name] = self
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        with _lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def set_total(self, value, *labels):
+        """Mirror a counter that is maintained elsewhere (e.g. pool stats)."""
+        with _lock:
+            self._values[labels] = value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, *labels, amount=1):
+        with _lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value, *labels):
+        with _lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        # [per-bucket counts..., +Inf count, sum]; made cumulative on render
+        index = bisect.bisect_left(self.buckets, value)
+        with _lock:
+            slots = self._values.get(labels)
+            if slots is None:
+                slots = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            slots[index] += 1
+            slots[-1] += value
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time to build the response",
+    ("blueprint", "route", "method", "status"),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests being handled", ("blueprint",),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Time a request spent executing SQL", ("route",),
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements sent per request", ("route",),
+    buckets=_COUNT_BUCKETS,
+)
+QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Time to execute one SQL statement", ("route", "query"),
+)
+DB_CHECKOUT_DURATION = Histogram(
+    "db_checkout_duration_seconds", "Time to obtain a connection in get_db()", ("pooled",),
+)
+DB_CONNECT_DURATION = Histogram(
+    "db_connect_duration_seconds", "Time to open a new database connection",
+)
+AWS_CALL_DURATION = Histogram(
+    "aws_call_duration_seconds", "Time of an AWS API call, retries included",
+    ("service", "operation", "outcome"),
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections", "Pooled database connections", ("state",),
+)
+DB_POOL_EVENTS = Counter(
+    "db_pool_events_total", "Connection pool events", ("event",),
+)
+PREPARED_STATEMENTS = Counter(
+    "db_prepared_statements_total", "Named query executions by prepared-statement cache result",
+    ("query", "result"),
+)
+
+
+def register_collector(fn):
+    """Call `fn` before every snapshot, to refresh gauges from other stats."""
+    _collectors.append(fn)
+
+
+# ---------------------------------------------------------------------------
+# Instrumentation hooks
+# ---------------------------------------------------------------------------
+
+def _route():
+    if not has_request_context():
+        return "background"
+    return g.get("_metrics_route") or "unmatched"
+
+
+def init_app(app):
+    """Time every request of `app`."""
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.teardown_request(_end_request)
+
+
+def _start_request():
+    g._metrics_start = time.perf_counter()
+    g._metrics_route = request.url_rule.rule if request.url_rule else "unmatched"
+    g._metrics_blueprint = request.blueprint or "app"
+    g._metrics_db_seconds = 0.0
+    g._metrics_db_queries = 0
+    REQUESTS_IN_FLIGHT.inc(g._metrics_blueprint)
+
+
+def _finish_request(response):
+    start = g.get("_metrics_start")
+    if start is not None:
+        route = g._metrics_route
+        REQUEST_DURATION.observe(
+            time.perf_counter() - start,
+            g._metrics_blueprint, route, request.method, str(response.status_code),
+        )
+        REQUEST_DB_SECONDS.observe(g._metrics_db_seconds, route)
+        REQUEST_DB_QUERIES.observe(g._metrics_db_queries, route)
+    return response
+
+
+def _end_request(exc):
+    # Runs even when the handler raised, so the gauge never leaks
+    blueprint = g.pop("_metrics_blueprint", None)
+    if blueprint is not None:
+        REQUESTS_IN_FLIGHT.dec(blueprint)
+
+
+_query_labels = {}
+
+
+def _query_label(query, cur):
+    if isinstance(query, bytes):
+        query = query.decode("utf-8", "replace")
+    elif not isinstance(query, str):
+        query = query.as_string(cur)       # psycopg2.sql.Composed
+    label = _query_labels.get(query)
+    if label is None:
+        label = " ".join(query.split())
+        if len(label) > config.METRICS_QUERY_LABEL_LENGTH:
+            digest = hashlib.sha1(label.encode()).hexdigest()[:8]
+            label = f"{label[:config.METRICS_QUERY_LABEL_LENGTH]}... [{digest}]"
+        if len(_query_labels) < 2000:
+            _query_labels[query] = label
+    return label
+
+
+def observe_query(query, seconds, cur):
+    """Record one statement executed through get_db()."""
+    route = _route()
+    QUERY_DURATION.observe(seconds, route, _query_label(query, cur))
+    if has_request_context() and "_metrics_db_seconds" in g:
+        g._metrics_db_seconds += seconds
+        g._metrics_db_queries += 1
+
+
+def instrument_boto_client(client):
+    """Time every API call made through a boto3 client."""
+    service = client.meta.service_model.service_name
+    events = client.meta.events
+
+    def before_call(model, context, **kwargs):
+        context["metrics_start"] = time.perf_counter()
+        context["metrics_operation"] = model.name
+
+    def after_call(context, http_response, **kwargs):
+        outcome = "ok" if http_response.status_code < 300 else "error"
+        _observe_aws(context, outcome)
+
+    def after_call_error(context, **kwargs):
+        _observe_aws(context, "error")
+
+    def _observe_aws(context, outcome):
+        start = context.get("metrics_start")
+        if start is not None:
+            AWS_CALL_DURATION.observe(
+                time.perf_counter() - start, service, context["metrics_operation"], outcome,
+            )
+
+    events.register("before-call", before_call)
+    events.register("after-call", after_call)
+    events.register("after-call-error", after_call_error)
+
+
+# ---------------------------------------------------------------------------
+# Snapshots, worker merge and rendering
+# ---------------------------------------------------------------------------
+
+def _snapshot():
+    for fn in _collectors:
+        try:
+            fn()
+        except Exception as e:
+            print(f"Warning: Metrics collector failed: {e}")
+    with _lock:
+        return {
+            name: [[list(labels), list(v) if isinstance(v, list) else v]
+                   for labels, v in metric._values.items()]
+            for name, metric in _metrics.items()
+        }
+
+
+def _snapshot_path(pid):
+    return os.path.join(config.METRICS_DIR, f"{pid}.json")
+
+
+def flush():
+    """Write this worker's snapshot to METRICS_DIR (atomically)."""
+    if not config.METRICS_DIR:
+        return
+    os.makedirs(config.METRICS_DIR, exist_ok=True)
+    path = _snapshot_path(os.getpid())
+    with tempfile.NamedTemporaryFile("w", dir=config.METRICS_DIR, delete=False, suffix=".tmp") as f:
+        json.dump(_snapshot(), f)
+    os.replace(f.name, path)
+
+
+def ensure_started():
+    """Start this process's snapshot writer if it isn't running yet."""
+    global _thread
+    if not config.METRICS_DIR:
+        return
+    if _thread is not None and _thread.is_alive():
+        return
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _thread = threading.Thread(target=_flush_forever, name="metrics-flush", daemon=True)
+        _thread.start()
+
+
+def _flush_forever():
+    while True:
+        time.sleep(config.METRICS_FLUSH_INTERVAL)
+        try:
+            flush()
+        except OSError as e:
+            print(f"Warning: Could not write metrics snapshot: {e}")
+
+
+def _merged():
+    """This worker's live values plus the other workers' latest snapshots."""
+    merged = {name: {tuple(labels): value for labels, value in values}
+              for name, values in _snapshot().items()}
+    if not config.METRICS_DIR or not os.path.isdir(config.METRICS_DIR):
+        return merged
+
+    now = time.time()
+    own = _snapshot_path(os.getpid())
+    for entry in os.scandir(config.METRICS_DIR):
+        if not entry.name.endswith(".json") or entry.path == own:
+            continue
+        try:
+            if now - entry.stat().st_mtime > config.METRICS_STALE_AFTER:
+                os.remove(entry.path)
+                continue
+            with open(entry.path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue       # removed or replaced while we looked
+        for name, values in snapshot.items():
+            target = merged.get(name)
+            if target is None:
+                continue   # metric no longer exists in this version
+            for labels, value in values:
+                labels = tuple(labels)
+                current = target.get(labels)
+                if current is None:
+                    target[labels] = value
+                elif isinstance(current, list):
+                    target[labels] = [a + b for a, b in zip(current, value)]
+                else:
+                    target[labels] = current + value
+    return merged
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render():
+    """All metrics of every live worker, in Prometheus text format 0.0.4."""
+    lines = []
+    for name, values in _merged().items():
+        metric = _metrics[name]
+        lines.append(f"# HELP {name} {metric.help}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        for labels, value in sorted(values.items()):
+            if metric.kind != "histogram":
+                lines.append(f"{name}{_labels(metric.labels, labels)} {_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip((*metric.buckets, "+Inf"), value[:-1]):
+                cumulative += count
+                le = ("le", bound if bound == "+Inf" else _number(float(bound)))
+                lines.append(f"{name}_bucket{_labels(metric.labels, labels, [le])} {cumulative}")
+            lines.append(f"{name}_sum{_labels(metric.labels, labels)} {_number(value[-1])}")
+            lines.append(f"{name}_count{_labels(metric.labels, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def _reset_after_fork():
+    # A child starts from zero and writes its own snapshot file
+    global _lock, _thread
+    _lock = threading.Lock()
+    _thread = None
+    for metric in _metrics.values():
+        metric._values = {}
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
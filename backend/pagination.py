@@ -0,0 +1,114 @@
+"""
+Keyset (cursor) pagination helpers.
+
+List endpoints ordered by (created_at DESC, id DESC) page with
+`?limit=N&cursor=...`. The cursor is an opaque token encoding the sort key
+of the last row on the previous page, so the next page is a plain index
+range scan — `WHERE (created_at, id) < (last_created_at, last_id)` — whose
+cost doesn't grow with how deep the client has paged (unlike OFFSET).
+
+The response body stays a JSON array; when more rows exist the token for
+the next page is sent in the X-Next-Cursor header (plus a Link rel="next").
+
+Result sets without a stable sort key (e.g. search hits ordered by rank)
+use offset cursors instead — same opaque token format, same headers.
+"""
+
+import base64
+import json
+from datetime import datetime
+from urllib.parse import urlencode
+from flask import jsonify, request
+from json_provider import rows_response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PaginationError(ValueError):
+    """Raised for a malformed limit or cursor query parameter."""
+
+
+def encode_cursor(created_at, row_id):
+    """Build the opaque token for the row a page ended on."""
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Return (created_at, id) from a token produced by encode_cursor()."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise PaginationError("Invalid cursor")
+
+
+def encode_offset_cursor(offset):
+    """Build the opaque token for an offset-paged result set."""
+    return base64.urlsafe_b64encode(json.dumps({"offset": offset}).encode()).decode().rstrip("=")
+
+
+def decode_offset_cursor(token):
+    """Return the offset from a token produced by encode_offset_cursor()."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        offset = int(json.loads(base64.urlsafe_b64decode(padded))["offset"])
+    except (ValueError, TypeError, KeyError):
+        raise PaginationError("Invalid cursor")
+    if offset < 0:
+        raise PaginationError("Invalid cursor")
+    return offset
+
+
+def page_args(default_limit, max_limit, decode=decode_cursor):
+    """
+    Parse ?limit= and ?cursor= from the current request.
+
+    Returns (limit, after) where `after` is None for the first page or the
+    decoded cursor — a (created_at, id) key by default, or whatever
+    `decode` returns (e.g. an offset).
+    """
+    try:
+        limit = int(request.args.get("limit", default_limit))
+    except ValueError:
+        raise PaginationError("limit must be an integer")
+    if not 1 <= limit <= max_limit:
+        raise PaginationError(f"limit must be between 1 and {max_limit}")
+
+    token = request.args.get("cursor")
+    return limit, decode(token) if token else None
+
+
+def page_response(rows, limit, next_cursor=None, description=None):
+    """
+    JSON response for one page. `rows` must hold up to limit + 1 rows — the
+    extra row only signals that another page exists and is not returned.
+
+    The next-page token is built from the last returned row's
+    (created_at, id) unless `next_cursor` is given explicitly.
+
+    Pass the cursor's `description` when the rows are tuples (from
+    get_db(tuples=True)); they are then serialized by rows_response().
+    """
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if description is None:
+        response = jsonify(rows)
+    else:
+        response = rows_response(rows, description)
+    if has_more:
+        last = rows[-1]
+        if next_cursor is not None:
+            token = next_cursor
+        elif description is None:
+            token = encode_cursor(last["created_at"], last["id"])
+        else:
+            names = [column.name for column in description]
+            token = encode_cursor(last[names.index("created_at")], last[names.index("id")])
+        response.headers[NEXT_CURSOR_HEADER] = token
+
+        args = request.args.to_dict()
+        args.update(limit=str(limit), cursor=token)
+        response.headers["Link"] = f'<{request.path}?{urlencode(sorted(args.items()))}>; rel="next"'
+    return response
@@ -0,0 +1,110 @@
+"""
+Named queries — the fixed SQL of the public routes, as server-side
+prepared statements.
+
+Sent as literal text, every statement is parsed, analyzed and planned by
+Postgres on each call. The public routes instead declare each of their
+statements once, at import time, as a NamedQuery (the same names head the
+matching entries in database/queries.sql) and run it with
+execute(cur, QUERY, params):
+
+- On a pooled connection the first execution sends
+      PREPARE <name> AS <sql>; EXECUTE <name> (...)
+  in one round trip, and every later one on that connection only
+      EXECUTE <name> (...)
+  Postgres keeps the parsed statement for the life of the session and,
+  once it has seen a few executions, a cached generic plan.
+- Unpooled connections (DB_POOL_ENABLED=false) and
+  DB_PREPARED_STATEMENTS=false run the plain SQL: a statement prepared
+  for a single use only costs more, and transaction-mode poolers don't
+  keep session state between transactions.
+
+SQL is written with $1, $2, ... placeholders, as in PREPARE and
+queries.sql. Each execution counts in db_prepared_statements_total
+{query, result}: "hit" (already prepared), "miss" (prepared first, once
+per connection) or "unprepared".
+
+When the session may no longer hold what the connection remembers — an
+EXECUTE failed because someone ran DISCARD ALL or a migration changed a
+result column type, or a PREPARE + EXECUTE failed halfway — the
+connection deallocates everything and re-prepares on its next use.
+"""
+
+import re
+from psycopg2 import errors
+import metrics
+
+REGISTRY = {}              # name -> NamedQuery
+
+_PLACEHOLDER = re.compile(r"\$(\d+)")
+_NAME = re.compile(r"[a-z_][a-z0-9_]*")
+
+# Errors meaning the session's prepared statements aren't what we think
+_STALE_ERRORS = (
+    errors.InvalidSqlStatementName,        # gone (DISCARD ALL / DEALLOCATE)
+    errors.DuplicatePreparedStatement,     # there, but we didn't know
+    errors.FeatureNotSupported,            # "cached plan must not change result type"
+)
+
+
+class NamedQuery:
+    """A statement with a fixed name and SQL text ($n placeholders)."""
+
+    def __init__(self, name, sql):
+        if not _NAME.fullmatch(name):
+            raise ValueError(f"Invalid query name: {name!r}")
+        if name in REGISTRY:
+            raise ValueError(f"Duplicate query name: {name!r}")
+
+        self.name = name
+        self.sql = sql.strip().rstrip(";")
+        positions = [int(n) for n in _PLACEHOLDER.findall(self.sql)]
+        self.param_count = max(positions, default=0)
+
+        # psycopg2 interpolates %s client-side, so literal % must be doubled
+        escaped = self.sql.replace("%", "%%")
+        args = ", ".join(["%s"] * self.param_count)
+        self._execute = f"EXECUTE {name} ({args})" if args else f"EXECUTE {name}"
+        self._prepare = f"PREPARE {name} AS {escaped}; {self._execute}"
+        # Unprepared: $n -> %s, with the parameters repeated/reordered to match
+        self._plain = _PLACEHOLDER.sub("%s", escaped)
+        self._order = [n - 1 for n in positions]
+
+        REGISTRY[name] = self
+
+    def __repr__(self):
+        return f"NamedQuery({self.name!r})"
+
+
+def execute(cur, query, params=()):
+    """Run `query` on `cur` with `params` (a sequence, $1 first)."""
+    if len(params) != query.param_count:
+        raise TypeError(f"{query.name} takes {query.param_count} parameters, got {len(params)}")
+
+    conn = cur.connection
+    prepared = getattr(conn, "prepared", None)
+    if prepared is None:
+        metrics.PREPARED_STATEMENTS.inc(query.name, "unprepared")
+        return cur.execute(query._plain, [params[i] for i in query._order])
+
+    if query.name in prepared:
+        result, sql = "hit", query._execute
+    else:
+        result, sql = "miss", query._prepare
+        if conn.deallocate_all:
+            sql = "DEALLOCATE ALL; " + sql
+
+    try:
+        cur.execute(sql, params)
+    except Exception as e:
+        # After a failed miss the statement may or may not exist: PREPARE
+        # is not undone when the EXECUTE after it fails
+        if result == "miss" or isinstance(e, _STALE_ERRORS):
+            prepared.clear()
+            conn.deallocate_all = True
+        raise
+
+    if result == "miss":
+        prepared.add(query.name)
+        conn.deallocate_all = False
+    metrics.PREPARED_STATEMENTS.inc(query.name, result)
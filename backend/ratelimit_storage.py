@@ -0,0 +1,189 @@
+"""
+SQLite storage for flask-limiter — rate limits shared by every worker on a host.
+
+flask-limiter's default memory:// storage keeps counters inside each
+gunicorn worker, so "5 per 5 minutes" on /api/admin/login really allows
+5 × workers attempts, and every deploy resets them. This backend keeps the
+counters in one SQLite file instead:
+
+    RATELIMIT_STORAGE_URI=sqlite:////tmp/portfolio-ratelimit.sqlite3
+
+Every process that opens the file sees the same limits, and they survive
+restarts. The file uses WAL mode, so readers never block, and each check is
+a single short write transaction on a local file (a few tens of
+microseconds; see benchmarks/ratelimit_storage.py). Postgres isn't used on
+purpose: a rate-limited request shouldn't take a pooled connection or a
+network round trip, and the limits only need to be shared per host.
+
+Supports the fixed-window and moving-window strategies
+(RATELIMIT_STRATEGY). Importing this module registers the sqlite:// scheme
+with the `limits` library.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from limits.storage import MovingWindowSupport, Storage
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (
+    key         TEXT    PRIMARY KEY,
+    value       INTEGER NOT NULL,
+    expires_at  REAL    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS window_entries (
+    key         TEXT NOT NULL,
+    at          REAL NOT NULL,
+    expires_at  REAL NOT NULL DEFAULT 0    -- at + the limit's window
+);
+CREATE INDEX IF NOT EXISTS idx_window_entries_key_at ON window_entries (key, at);
+"""
+
+# Expired counters and window entries of every key (including clients that
+# never come back) are swept every this many writes
+_SWEEP_EVERY = 1000
+
+
+class SQLiteStorage(Storage, MovingWindowSupport):
+    """Rate limit storage in a SQLite file, shared across processes."""
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri, wrap_exceptions=False, **options):
+        # sqlite:////abs/path.db -> /abs/path.db, sqlite:///rel.db -> rel.db
+        self.path = uri.split("://", 1)[1][1:] or ":memory:"
+        self.timeout = float(options.get("timeout", 5))
+        self._local = threading.local()
+        self._writes = 0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self):
+        # sqlite3 connections can't cross threads or a fork, so each
+        # thread of each process opens its own
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(window_entries)")]
+            if "expires_at" not in columns:
+                # File from before expires_at: its old entries are swept at once
+                conn.execute("ALTER TABLE window_entries ADD COLUMN expires_at REAL NOT NULL DEFAULT 0")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_window_entries_expires_at ON window_entries (expires_at)"
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _transaction(self):
+        """Exclusive write transaction: counters are read and updated atomically."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        return _Transaction(conn)
+
+    def _maybe_sweep(self, conn, now):
+        # Caller holds a write transaction
+        self._writes += 1
+        if self._writes % _SWEEP_EVERY == 0:
+            conn.execute("DELETE FROM counters WHERE expires_at <= ?", (now,))
+            conn.execute("DELETE FROM window_entries WHERE expires_at <= ?", (now,))
+
+    # -- Fixed window -------------------------------------------------------
+
+    def incr(self, key, expiry, amount=1):
+        now = time.time()
+        with self._transaction() as conn:
+            (value,) = conn.execute("""
+                INSERT INTO counters (key, value, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    value = CASE WHEN expires_at <= ? THEN excluded.value
+                                 ELSE value + excluded.value END,
+                    expires_at = CASE WHEN expires_at <= ? THEN excluded.expires_at
+                                      ELSE expires_at END
+                RETURNING value
+            """, (key, amount, now + expiry, now, now)).fetchone()
+            self._maybe_sweep(conn, now)
+        return value
+
+    def get(self, key):
+        row = self._connection().execute(
+            "SELECT value FROM counters WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        now = time.time()
+        row = self._connection().execute(
+            "SELECT expires_at FROM counters WHERE key = ? AND expires_at > ?", (key, now),
+        ).fetchone()
+        return row[0] if row else now
+
+    # -- Moving window ------------------------------------------------------
+
+    def acquire_entry(self, key, limit, expiry, amount=1):
+        if amount > limit:
+            return False
+        now = time.time()
+        with self._transaction() as conn:
+            # Entries that left the window are dropped as the key is used
+            conn.execute("DELETE FROM window_entries WHERE key = ? AND at <= ?", (key, now - expiry))
+            (count,) = conn.execute(
+                "SELECT COUNT(*) FROM window_entries WHERE key = ?", (key,),
+            ).fetchone()
+            if count + amount > limit:
+                return False
+            conn.executemany(
+                "INSERT INTO window_entries (key, at, expires_at) VALUES (?, ?, ?)",
+                [(key, now, now + expiry)] * amount,
+            )
+            self._maybe_sweep(conn, now)
+        return True
+
+    def get_moving_window(self, key, limit, expiry):
+        now = time.time()
+        oldest, count = self._connection().execute(
+            "SELECT MIN(at), COUNT(*) FROM window_entries WHERE key = ? AND at > ?",
+            (key, now - expiry),
+        ).fetchone()
+        return (oldest, count) if count else (now, 0)
+
+    # -- Maintenance --------------------------------------------------------
+
+    def check(self):
+        try:
+            self._connection().execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        with self._transaction() as conn:
+            cleared = conn.execute("DELETE FROM counters").rowcount
+            cleared += conn.execute("DELETE FROM window_entries").rowcount
+        return cleared
+
+    def clear(self, key):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM counters WHERE key = ?", (key,))
+            conn.execute("DELETE FROM window_entries WHERE key = ?", (key,))
+
+
+class _Transaction:
+    """Commit on success, roll back on error (the connection is in autocommit mode)."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
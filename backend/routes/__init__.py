@@ -0,0 +1,98 @@
+"""
+URL rules of the route modules, registered without importing them.
+
+create_app() adds every rule below to the URL map, but each view is a
+LazyView (Flask's lazy-loading views pattern): the module that implements
+it — and whatever it imports (psycopg2 cursors, itsdangerous, boto3
+helpers, ...) — is imported on the first request that reaches it. A cold
+start serving /api/projects never loads the admin or backup modules.
+
+Endpoints are named "<module>.<function>", as they were as blueprints, so
+url_for("admin.local_upload") and request.blueprint (the metrics labels)
+are unchanged. A new route is a function in its module plus a line here.
+"""
+
+from functools import cached_property
+from werkzeug.utils import import_string
+
+# module -> [(rule, function, methods)]
+ROUTES = {
+    "projects": [
+        ("/api/projects",                  "get_projects", ["GET"]),
+        ("/api/projects/<int:project_id>", "get_project", ["GET"]),
+        ("/api/tags",                      "get_tags", ["GET"]),
+    ],
+    "posts": [
+        ("/api/posts",        "get_posts", ["GET"]),
+        ("/api/posts/search", "search_posts", ["GET"]),
+        ("/api/posts/<slug>", "get_post", ["GET"]),
+    ],
+    "contact": [
+        ("/api/contact", "submit_contact", ["POST"]),
+    ],
+    "admin": [
+        ("/api/admin/login",                       "admin_login", ["POST"]),
+        ("/api/admin/logout",                      "admin_logout", ["POST"]),
+        ("/api/admin/projects",                    "list_projects", ["GET"]),
+        ("/api/admin/projects",                    "create_project", ["POST"]),
+        ("/api/admin/projects/<int:project_id>",   "update_project", ["PUT"]),
+        ("/api/admin/projects/<int:project_id>",   "delete_project", ["DELETE"]),
+        ("/api/admin/projects/reorder",            "reorder_projects", ["PUT"]),
+        ("/api/admin/posts",                       "list_posts", ["GET"]),
+        ("/api/admin/posts",                       "create_post", ["POST"]),
+        ("/api/admin/posts/<int:post_id>",         "update_post", ["PUT"]),
+        ("/api/admin/posts/<int:post_id>",         "delete_post", ["DELETE"]),
+        ("/api/admin/messages",                    "list_messages", ["GET"]),
+        ("/api/admin/messages/<int:message_id>",   "delete_message", ["DELETE"]),
+        ("/api/admin/outbox",                      "list_outbox", ["GET"]),
+        ("/api/admin/outbox/<int:email_id>/retry", "retry_outbox_email", ["POST"]),
+        ("/api/admin/interests",                   "list_interests", ["GET"]),
+        ("/api/admin/interests",                   "create_interest", ["POST"]),
+        ("/api/admin/interests/<int:interest_id>", "update_interest", ["PUT"]),
+        ("/api/admin/interests/<int:interest_id>", "delete_interest", ["DELETE"]),
+        ("/api/admin/upload",                      "upload_image", ["POST"]),
+        ("/api/admin/uploads/presign",             "presign_image_upload", ["POST"]),
+        ("/api/admin/uploads/complete",            "complete_image_upload", ["POST"]),
+        ("/api/admin/uploads/local",               "local_upload", ["POST"]),
+        ("/api/admin/batch",                       "batch", ["POST"]),
+    ],
+    "interests": [
+        ("/api/interests", "get_interests", ["GET"]),
+    ],
+    "bootstrap": [
+        ("/api/bootstrap", "get_bootstrap", ["GET"]),
+    ],
+    "backup": [
+        ("/api/admin/export",         "export_all", ["GET"]),
+        ("/api/admin/export/<table>", "export_table", ["GET"]),
+        ("/api/admin/import",         "import_all", ["POST"]),
+        ("/api/admin/import/<table>", "import_table", ["POST"]),
+    ],
+}
+
+
+class LazyView:
+    """A view function imported from "routes.<module>.<function>" on first call."""
+
+    def __init__(self, import_name):
+        self.import_name = import_name
+        # Same qualified name as the real view (flask-limiter keys limits by it)
+        self.__module__, self.__name__ = import_name.rsplit(".", 1)
+        self.__qualname__ = self.__name__
+
+    @cached_property
+    def view(self):
+        return import_string(self.import_name)
+
+    def __call__(self, *args, **kwargs):
+        return self.view(*args, **kwargs)
+
+
+def register(app):
+    """Add every route module's URL rules to `app`, with lazily imported views."""
+    for module, rules in ROUTES.items():
+        for rule, function, methods in rules:
+            app.add_url_rule(
+                rule, f"{module}.{function}",
+                view_func=LazyView(f"routes.{module}.{function}"), methods=methods,
+            )
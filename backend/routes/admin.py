@@ -1,43 +1,70 @@
 """
 Admin routes — Protected endpoints for managing projects, posts, and messages.
 
-Uses session tokens for auth: login issues a short-lived random token,
-which the frontend sends as a Bearer token on subsequent requests.
+Uses signed session tokens for auth: login issues an 8-hour token signed
+with SECRET_KEY (itsdangerous), which the frontend sends as a Bearer token
+on subsequent requests. Any worker can verify it without shared state;
+with ADMIN_TOKEN_REVOCATION=true, logout also records the token's id in
+the revoked_tokens table, which every check then consults.
 """
 
 import hmac
 import re
 import secrets
-import time
+from datetime import timedelta
 from functools import wraps
-from flask import Blueprint, jsonify, request
+import psycopg2.errors
+from flask import jsonify, request, url_for
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from cache import invalidate
 from db import get_db
 from extensions import limiter
-from services.s3 import upload_file
+from pagination import page_args, page_response
+from services import outbox
+from services.images import schedule_variants
+from services.s3 import (
+    presign_upload, read_upload, save_local_upload, upload_file, verify_upload,
+)
 import config
 
-admin_bp = Blueprint("admin", __name__)
 
 # ---------------------------------------------------------------------------
-# Session token store — maps token -> expiry timestamp (monotonic clock)
+# Session tokens — HMAC-signed and self-expiring; only revoked ids are stored
 # ---------------------------------------------------------------------------
 
-_tokens: dict = {}
 _TOKEN_TTL = 8 * 3600  # 8 hours
 
+# Signs with the last key and accepts all of them: keys moved into
+# SECRET_KEY_FALLBACKS keep already-issued tokens valid while SECRET_KEY rotates
+_serializer = URLSafeTimedSerializer(
+    [*config.SECRET_KEY_FALLBACKS, config.SECRET_KEY], salt="admin-session",
+)
+
 
 def _issue_token() -> str:
-    token = secrets.token_hex(32)
-    _tokens[token] = time.monotonic() + _TOKEN_TTL
-    return token
+    # The random id (jti) lets a single token be revoked on logout
+    return _serializer.dumps({"jti": secrets.token_hex(16)})
+
+
+def _decode_token(token: str):
+    """Return (payload, issued_at) for a valid, unexpired token, else None."""
+    try:
+        return _serializer.loads(token, max_age=_TOKEN_TTL, return_timestamp=True)
+    except BadSignature:  # also covers SignatureExpired
+        return None
+
+
+def _is_revoked(jti: str) -> bool:
+    with get_db() as (conn, cur):
+        cur.execute("SELECT 1 FROM revoked_tokens WHERE jti = %s", (jti,))
+        return cur.fetchone() is not None
 
 
 def _validate_token(token: str) -> bool:
-    expiry = _tokens.get(token)
-    if expiry is None:
+    decoded = _decode_token(token)
+    if decoded is None:
         return False
-    if time.monotonic() > expiry:
-        del _tokens[token]
+    if config.ADMIN_TOKEN_REVOCATION and _is_revoked(decoded[0]["jti"]):
         return False
     return True
 
@@ -63,14 +90,15 @@ def require_admin(f):
 # Login — verify the admin password and issue a session token
 # ---------------------------------------------------------------------------
 
-@admin_bp.route("/api/admin/login", methods=["POST"])
 @limiter.limit("5 per 5 minutes")
 def admin_login():
     """
     POST /api/admin/login
     Body: { "password": "..." }
 
-    Returns a short-lived random session token on success.
+    Returns a session token on success: a random id (jti) signed with
+    SECRET_KEY by itsdangerous and valid for 8 hours, unless logout revokes
+    it first (ADMIN_TOKEN_REVOCATION). Nothing is stored at login.
     Rate-limited to 5 attempts per 5 minutes to prevent brute-force.
     """
     data = request.get_json()
@@ -81,11 +109,143 @@ def admin_login():
     return jsonify({"message": "Authenticated", "token": _issue_token()})
 
 
+@require_admin
+def admin_logout():
+    """
+    POST /api/admin/logout
+
+    With ADMIN_TOKEN_REVOCATION=true, adds the token to the revocation list
+    so every worker rejects it from now on. Otherwise tokens are stateless
+    and simply expire; the frontend discards its copy either way.
+    """
+    if not config.ADMIN_TOKEN_REVOCATION:
+        return jsonify({"message": "Logged out"})
+
+    payload, issued_at = _decode_token(request.headers["Authorization"][7:])
+    expires_at = issued_at + timedelta(seconds=_TOKEN_TTL)
+    with get_db() as (conn, cur):
+        # -- Purpose: Revoke this token; rows are only needed until it would
+        # -- have expired anyway, so prune those while we're here
+        cur.execute("""
+            INSERT INTO revoked_tokens (jti, expires_at)
+            VALUES (%s, %s)
+            ON CONFLICT (jti) DO NOTHING
+        """, (payload["jti"], expires_at.replace(tzinfo=None)))
+        cur.execute("""
+            DELETE FROM revoked_tokens
+            WHERE expires_at < CURRENT_TIMESTAMP AT TIME ZONE 'UTC'
+        """)
+
+    return jsonify({"message": "Logged out"})
+
+
 # ---------------------------------------------------------------------------
 # Projects CRUD
 # ---------------------------------------------------------------------------
 
-@admin_bp.route("/api/admin/projects", methods=["GET"])
+def _int_list(value):
+    """Return `value` if it's a list of ints (not bools), else None."""
+    if isinstance(value, list) and all(
+        isinstance(v, int) and not isinstance(v, bool) for v in value
+    ):
+        return value
+    return None
+
+
+def _insert_project(cur, data, tag_ids):
+    """Insert a project and its tag links in one statement; returns the new row."""
+    # -- Demonstrates: Data-modifying CTE + INSERT ... SELECT unnest(array)
+    # -- Purpose: Create a project, place it last and link all its tags
+    # --          in a single round trip
+    cur.execute("""
+        WITH project AS (
+            INSERT INTO projects (title, description, tech_stack, live_url, github_url, image_url, featured, sort_order)
+            VALUES (%s, %s, %s, %s, %s, %s, %s,
+                    (SELECT COALESCE(MAX(sort_order), 0) + 1 FROM projects))
+            RETURNING id, title, created_at
+        ),
+        linked AS (
+            INSERT INTO project_tags (project_id, tag_id)
+            SELECT project.id, tag_id
+            FROM project, unnest(%s::int[]) AS tag_id
+            ON CONFLICT DO NOTHING
+        )
+        SELECT id, title, created_at FROM project
+    """, (
+        data["title"],
+        data.get("description", ""),
+        data.get("tech_stack", ""),
+        data.get("live_url"),
+        data.get("github_url"),
+        data.get("image_url"),
+        data.get("featured", False),
+        tag_ids,
+    ))
+    return cur.fetchone()
+
+
+def _update_project(cur, project_id, data, tag_ids=None):
+    """Update a project (and replace its tags unless tag_ids is None); returns the row or None."""
+    # -- Demonstrates: UPDATE with RETURNING
+    # -- Purpose: Edit an existing portfolio project
+    cur.execute("""
+        UPDATE projects
+        SET title = %s,
+            description = %s,
+            tech_stack = %s,
+            live_url = %s,
+            github_url = %s,
+            image_url = %s,
+            featured = %s
+        WHERE id = %s
+        RETURNING id, title, created_at
+    """, (
+        data.get("title", ""),
+        data.get("description", ""),
+        data.get("tech_stack", ""),
+        data.get("live_url"),
+        data.get("github_url"),
+        data.get("image_url"),
+        data.get("featured", False),
+        project_id,
+    ))
+    project = cur.fetchone()
+
+    if project and tag_ids is not None:
+        _replace_project_tags(cur, project_id, tag_ids)
+    return project
+
+
+def _replace_project_tags(cur, project_id, tag_ids):
+    """Make `tag_ids` the project's exact tag set, in one statement."""
+    # -- Demonstrates: DELETE + INSERT in one statement via a writable CTE
+    # -- Purpose: Drop tags no longer wanted, add the missing ones; links
+    # --          that stay are left untouched
+    cur.execute("""
+        WITH removed AS (
+            DELETE FROM project_tags
+            WHERE project_id = %(project_id)s
+              AND tag_id <> ALL(%(tag_ids)s::int[])
+        )
+        INSERT INTO project_tags (project_id, tag_id)
+        SELECT %(project_id)s, tag_id
+        FROM unnest(%(tag_ids)s::int[]) AS tag_id
+        ON CONFLICT DO NOTHING
+    """, {"project_id": project_id, "tag_ids": tag_ids})
+
+
+def _reorder(cur, ordered_ids):
+    """Set sort_order = position in `ordered_ids` (1-based) for every id, in one statement."""
+    # -- Demonstrates: UPDATE ... FROM unnest(array) WITH ORDINALITY
+    # -- Purpose: Persist a drag-and-drop order in one round trip
+    cur.execute("""
+        UPDATE projects p
+        SET sort_order = o.position
+        FROM unnest(%s::int[]) WITH ORDINALITY AS o(id, position)
+        WHERE p.id = o.id
+    """, (ordered_ids,))
+
+
 @require_admin
 def list_projects():
     """GET /api/admin/projects — List all projects (including non-featured)."""
@@ -100,98 +260,68 @@ def list_projects():
     return jsonify(projects)
 
 
-@admin_bp.route("/api/admin/projects", methods=["POST"])
 @require_admin
 def create_project():
     """
     POST /api/admin/projects
     Body: { "title": "...", "description": "...", "tech_stack": "...", ... }
 
-    Demonstrates: INSERT with RETURNING + transaction for related data
+    Optional "tag_ids": [1, 2, ...] links the project to those tags.
+
+    Demonstrates: INSERT with RETURNING + related rows in the same statement
     """
     data = request.get_json()
     if not data or not data.get("title"):
         return jsonify({"error": "Title is required"}), 400
+    tag_ids = _int_list(data.get("tag_ids", []))
+    if tag_ids is None:
+        return jsonify({"error": "tag_ids must be a list of integers"}), 400
 
-    with get_db() as (conn, cur):
-        # -- Demonstrates: INSERT with RETURNING
-        # -- Purpose: Create a new portfolio project
-        cur.execute("SELECT COALESCE(MAX(sort_order), 0) + 1 AS next_order FROM projects")
-        next_order = cur.fetchone()["next_order"]
-
-        cur.execute("""
-            INSERT INTO projects (title, description, tech_stack, live_url, github_url, image_url, featured, sort_order)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id, title, created_at
-        """, (
-            data["title"],
-            data.get("description", ""),
-            data.get("tech_stack", ""),
-            data.get("live_url"),
-            data.get("github_url"),
-            data.get("image_url"),
-            data.get("featured", False),
-            next_order,
-        ))
-        project = cur.fetchone()
-
-        # If tags were provided, link them to the project
-        tag_ids = data.get("tag_ids", [])
-        for tag_id in tag_ids:
-            # -- Demonstrates: INSERT into junction table (many-to-many)
-            cur.execute("""
-                INSERT INTO project_tags (project_id, tag_id)
-                VALUES (%s, %s)
-            """, (project["id"], tag_id))
+    try:
+        with get_db() as (conn, cur):
+            project = _insert_project(cur, data, tag_ids)
+    except psycopg2.errors.ForeignKeyViolation:
+        return jsonify({"error": "Unknown tag id"}), 400
 
+    invalidate("projects", "project_tags")
     return jsonify(project), 201
 
 
-@admin_bp.route("/api/admin/projects/<int:project_id>", methods=["PUT"])
 @require_admin
 def update_project(project_id):
     """
     PUT /api/admin/projects/:id
 
+    If "tag_ids" is present, the project's tags are replaced with exactly
+    that set (omit it to leave tags unchanged).
+
     Demonstrates: UPDATE with WHERE + RETURNING
     """
     data = request.get_json()
     if not data:
         return jsonify({"error": "No data provided"}), 400
+    tag_ids = None
+    if "tag_ids" in data:
+        tag_ids = _int_list(data["tag_ids"])
+        if tag_ids is None:
+            return jsonify({"error": "tag_ids must be a list of integers"}), 400
 
-    with get_db() as (conn, cur):
-        # -- Demonstrates: UPDATE with RETURNING
-        # -- Purpose: Edit an existing portfolio project
-        cur.execute("""
-            UPDATE projects
-            SET title = %s,
-                description = %s,
-                tech_stack = %s,
-                live_url = %s,
-                github_url = %s,
-                image_url = %s,
-                featured = %s
-            WHERE id = %s
-            RETURNING id, title, created_at
-        """, (
-            data.get("title", ""),
-            data.get("description", ""),
-            data.get("tech_stack", ""),
-            data.get("live_url"),
-            data.get("github_url"),
-            data.get("image_url"),
-            data.get("featured", False),
-            project_id,
-        ))
-        project = cur.fetchone()
+    try:
+        with get_db() as (conn, cur):
+            project = _update_project(cur, project_id, data, tag_ids)
+    except psycopg2.errors.ForeignKeyViolation:
+        return jsonify({"error": "Unknown tag id"}), 400
 
     if not project:
         return jsonify({"error": "Project not found"}), 404
 
+    if tag_ids is None:
+        invalidate("projects")
+    else:
+        invalidate("projects", "project_tags")
     return jsonify(project)
 
 
-@admin_bp.route("/api/admin/projects/<int:project_id>", methods=["DELETE"])
 @require_admin
 def delete_project(project_id):
     """DELETE /api/admin/projects/:id — Delete a project."""
@@ -202,10 +332,11 @@ def delete_project(project_id):
     if not deleted:
         return jsonify({"error": "Project not found"}), 404
 
+    # project_tags rows go with it via ON DELETE CASCADE
+    invalidate("projects", "project_tags")
     return jsonify({"message": "Project deleted"})
 
 
-@admin_bp.route("/api/admin/projects/reorder", methods=["PUT"])
 @require_admin
 def reorder_projects():
     """
@@ -218,14 +349,13 @@ def reorder_projects():
     ordered_ids = data.get("order", []) if data else []
     if not ordered_ids:
         return jsonify({"error": "No order provided"}), 400
+    if _int_list(ordered_ids) is None:
+        return jsonify({"error": "order must be a list of project ids"}), 400
 
     with get_db() as (conn, cur):
-        for position, project_id in enumerate(ordered_ids, start=1):
-            cur.execute(
-                "UPDATE projects SET sort_order = %s WHERE id = %s",
-                (position, project_id),
-            )
+        _reorder(cur, ordered_ids)
 
+    invalidate("projects")
     return jsonify({"message": "Order updated"})
 
 
@@ -246,7 +376,42 @@ def _slugify(title: str) -> str:
 # Posts CRUD
 # ---------------------------------------------------------------------------
 
-@admin_bp.route("/api/admin/posts", methods=["GET"])
+def _insert_post(cur, data):
+    # Generate slug from title if not provided
+    slug = data.get("slug") or _slugify(data["title"])
+    cur.execute("""
+        INSERT INTO posts (title, content, slug, published)
+        VALUES (%s, %s, %s, %s)
+        RETURNING id, title, slug, created_at
+    """, (
+        data["title"],
+        data["content"],
+        slug,
+        data.get("published", False),
+    ))
+    return cur.fetchone()
+
+
+def _update_post(cur, post_id, data):
+    cur.execute("""
+        UPDATE posts
+        SET title = %s,
+            content = %s,
+            slug = %s,
+            published = %s,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = %s
+        RETURNING id, title, slug, updated_at
+    """, (
+        data.get("title", ""),
+        data.get("content", ""),
+        data.get("slug", ""),
+        data.get("published", False),
+        post_id,
+    ))
+    return cur.fetchone()
+
+
 @require_admin
 def list_posts():
     """GET /api/admin/posts — List all posts (including drafts)."""
@@ -260,7 +425,6 @@ def list_posts():
     return jsonify(posts)
 
 
-@admin_bp.route("/api/admin/posts", methods=["POST"])
 @require_admin
 def create_post():
     """
@@ -273,26 +437,13 @@ def create_post():
     if not data or not data.get("title") or not data.get("content"):
         return jsonify({"error": "Title and content are required"}), 400
 
-    # Generate slug from title if not provided
-    slug = data.get("slug") or _slugify(data["title"])
-
     with get_db() as (conn, cur):
-        cur.execute("""
-            INSERT INTO posts (title, content, slug, published)
-            VALUES (%s, %s, %s, %s)
-            RETURNING id, title, slug, created_at
-        """, (
-            data["title"],
-            data["content"],
-            slug,
-            data.get("published", False),
-        ))
-        post = cur.fetchone()
+        post = _insert_post(cur, data)
 
+    invalidate("posts")
     return jsonify(post), 201
 
 
-@admin_bp.route("/api/admin/posts/<int:post_id>", methods=["PUT"])
 @require_admin
 def update_post(post_id):
     """PUT /api/admin/posts/:id — Edit an existing post."""
@@ -301,31 +452,15 @@ def update_post(post_id):
         return jsonify({"error": "No data provided"}), 400
 
     with get_db() as (conn, cur):
-        cur.execute("""
-            UPDATE posts
-            SET title = %s,
-                content = %s,
-                slug = %s,
-                published = %s,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE id = %s
-            RETURNING id, title, slug, updated_at
-        """, (
-            data.get("title", ""),
-            data.get("content", ""),
-            data.get("slug", ""),
-            data.get("published", False),
-            post_id,
-        ))
-        post = cur.fetchone()
+        post = _update_post(cur, post_id, data)
 
     if not post:
         return jsonify({"error": "Post not found"}), 404
 
+    invalidate("posts")
     return jsonify(post)
 
 
-@admin_bp.route("/api/admin/posts/<int:post_id>", methods=["DELETE"])
 @require_admin
 def delete_post(post_id):
     """DELETE /api/admin/posts/:id — Delete a post."""
@@ -336,6 +471,7 @@ def delete_post(post_id):
     if not deleted:
         return jsonify({"error": "Post not found"}), 404
 
+    invalidate("posts")
     return jsonify({"message": "Post deleted"})
 
 
@@ -343,21 +479,35 @@ def delete_post(post_id):
 # Contact Messages
 # ---------------------------------------------------------------------------
 
-@admin_bp.route("/api/admin/messages", methods=["GET"])
 @require_admin
 def list_messages():
-    """GET /api/admin/messages — List all contact form submissions."""
+    """
+    GET /api/admin/messages — List contact form submissions, newest first.
+    Optional query params: ?limit=N (default 50, max 200) and ?cursor=...
+    from the previous page's X-Next-Cursor header.
+    """
+    limit, after = page_args(default_limit=50, max_limit=200)
+
     with get_db() as (conn, cur):
-        cur.execute("""
-            SELECT id, name, email, message, created_at
-            FROM contact_messages
-            ORDER BY created_at DESC
-        """)
+        if after is None:
+            cur.execute("""
+                SELECT id, name, email, message, created_at
+                FROM contact_messages
+                ORDER BY created_at DESC, id DESC
+                LIMIT %s
+            """, (limit + 1,))
+        else:
+            cur.execute("""
+                SELECT id, name, email, message, created_at
+                FROM contact_messages
+                WHERE (created_at, id) < (%s, %s)
+                ORDER BY created_at DESC, id DESC
+                LIMIT %s
+            """, (*after, limit + 1))
         messages = cur.fetchall()
-    return jsonify(messages)
+    return page_response(messages, limit)
 
 
-@admin_bp.route("/api/admin/messages/<int:message_id>", methods=["DELETE"])
 @require_admin
 def delete_message(message_id):
     """
@@ -381,6 +531,54 @@ def delete_message(message_id):
     return jsonify({"message": "Message deleted"})
 
 
+# ---------------------------------------------------------------------------
+# Email Outbox — inspect and retry undelivered notifications
+# ---------------------------------------------------------------------------
+
+_OUTBOX_STATUSES = {"pending", "sent", "dead"}
+
+
+@require_admin
+def list_outbox():
+    """
+    GET /api/admin/outbox?status=dead — List queued emails (default: undelivered).
+    """
+    status = request.args.get("status")
+    if status is not None and status not in _OUTBOX_STATUSES:
+        return jsonify({"error": f"status must be one of {', '.join(sorted(_OUTBOX_STATUSES))}"}), 400
+
+    with get_db() as (conn, cur):
+        cur.execute("""
+            SELECT id, contact_message_id, status, attempts, next_attempt_at,
+                   last_error, created_at, sent_at
+            FROM email_outbox
+            WHERE status = %s OR (%s IS NULL AND status <> 'sent')
+            ORDER BY created_at DESC, id DESC
+            LIMIT 200
+        """, (status, status))
+        emails = cur.fetchall()
+    return jsonify(emails)
+
+
+@require_admin
+def retry_outbox_email(email_id):
+    """POST /api/admin/outbox/:id/retry — Requeue a dead-lettered email now."""
+    with get_db() as (conn, cur):
+        cur.execute("""
+            UPDATE email_outbox
+            SET status = 'pending', attempts = 0, next_attempt_at = CURRENT_TIMESTAMP
+            WHERE id = %s AND status = 'dead'
+            RETURNING id
+        """, (email_id,))
+        retried = cur.fetchone()
+
+    if not retried:
+        return jsonify({"error": "Dead-lettered email not found"}), 404
+
+    outbox.wake()
+    return jsonify({"message": "Email requeued"})
+
+
 # ---------------------------------------------------------------------------
 # Interests CRUD
 # ---------------------------------------------------------------------------
@@ -388,7 +586,55 @@ def delete_message(message_id):
 _ALLOWED_THEMES = {"destiny2", "osu", "wakesurf", "geometrydash", "none"}
 
 
-@admin_bp.route("/api/admin/interests", methods=["GET"])
+def _theme(data):
+    theme = data.get("theme", "none")
+    return theme if theme in _ALLOWED_THEMES else "none"
+
+
+def _insert_interest(cur, data):
+    # Placed last unless a sort_order is given
+    cur.execute("""
+        INSERT INTO interests (title, tag, blurb, description, accent, theme, sort_order)
+        VALUES (%s, %s, %s, %s, %s, %s,
+                COALESCE(%s, (SELECT COALESCE(MAX(sort_order), 0) + 1 FROM interests)))
+        RETURNING id, title, created_at
+    """, (
+        data["title"],
+        data.get("tag", ""),
+        data.get("blurb", ""),
+        data.get("description", ""),
+        data.get("accent", "#6fe7c1"),
+        _theme(data),
+        data.get("sort_order"),
+    ))
+    return cur.fetchone()
+
+
+def _update_interest(cur, interest_id, data):
+    cur.execute("""
+        UPDATE interests
+        SET title = %s,
+            tag = %s,
+            blurb = %s,
+            description = %s,
+            accent = %s,
+            theme = %s,
+            sort_order = %s
+        WHERE id = %s
+        RETURNING id, title
+    """, (
+        data.get("title", ""),
+        data.get("tag", ""),
+        data.get("blurb", ""),
+        data.get("description", ""),
+        data.get("accent", "#6fe7c1"),
+        _theme(data),
+        data.get("sort_order", 0),
+        interest_id,
+    ))
+    return cur.fetchone()
+
+
 @require_admin
 def list_interests():
     """GET /api/admin/interests — List all interest cards in display order."""
@@ -402,7 +648,6 @@ def list_interests():
     return jsonify(interests)
 
 
-@admin_bp.route("/api/admin/interests", methods=["POST"])
 @require_admin
 def create_interest():
     """POST /api/admin/interests — Create a new interest card."""
@@ -410,33 +655,13 @@ def create_interest():
     if not data or not data.get("title"):
         return jsonify({"error": "Title is required"}), 400
 
-    theme = data.get("theme", "none")
-    if theme not in _ALLOWED_THEMES:
-        theme = "none"
-
     with get_db() as (conn, cur):
-        cur.execute("SELECT COALESCE(MAX(sort_order), 0) + 1 AS next_order FROM interests")
-        next_order = cur.fetchone()["next_order"]
-
-        cur.execute("""
-            INSERT INTO interests (title, tag, blurb, description, accent, theme, sort_order)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            RETURNING id, title, created_at
-        """, (
-            data["title"],
-            data.get("tag", ""),
-            data.get("blurb", ""),
-            data.get("description", ""),
-            data.get("accent", "#6fe7c1"),
-            theme,
-            data.get("sort_order", next_order),
-        ))
-        interest = cur.fetchone()
+        interest = _insert_interest(cur, data)
 
+    invalidate("interests")
     return jsonify(interest), 201
 
 
-@admin_bp.route("/api/admin/interests/<int:interest_id>", methods=["PUT"])
 @require_admin
 def update_interest(interest_id):
     """PUT /api/admin/interests/:id — Edit an existing interest card."""
@@ -444,41 +669,16 @@ def update_interest(interest_id):
     if not data:
         return jsonify({"error": "No data provided"}), 400
 
-    theme = data.get("theme", "none")
-    if theme not in _ALLOWED_THEMES:
-        theme = "none"
-
     with get_db() as (conn, cur):
-        cur.execute("""
-            UPDATE interests
-            SET title = %s,
-                tag = %s,
-                blurb = %s,
-                description = %s,
-                accent = %s,
-                theme = %s,
-                sort_order = %s
-            WHERE id = %s
-            RETURNING id, title
-        """, (
-            data.get("title", ""),
-            data.get("tag", ""),
-            data.get("blurb", ""),
-            data.get("description", ""),
-            data.get("accent", "#6fe7c1"),
-            theme,
-            data.get("sort_order", 0),
-            interest_id,
-        ))
-        interest = cur.fetchone()
+        interest = _update_interest(cur, interest_id, data)
 
     if not interest:
         return jsonify({"error": "Interest not found"}), 404
 
+    invalidate("interests")
     return jsonify(interest)
 
 
-@admin_bp.route("/api/admin/interests/<int:interest_id>", methods=["DELETE"])
 @require_admin
 def delete_interest(interest_id):
     """DELETE /api/admin/interests/:id — Delete an interest card."""
@@ -489,6 +689,7 @@ def delete_interest(interest_id):
     if not deleted:
         return jsonify({"error": "Interest not found"}), 404
 
+    invalidate("interests")
     return jsonify({"message": "Interest deleted"})
 
 
@@ -496,7 +697,6 @@ def delete_interest(interest_id):
 # Image Upload (S3 Integration)
 # ---------------------------------------------------------------------------
 
-@admin_bp.route("/api/admin/upload", methods=["POST"])
 @require_admin
 def upload_image():
     """
@@ -504,7 +704,8 @@ def upload_image():
     Body: multipart/form-data with a "file" field
 
     Demonstrates: AWS S3 integration for file storage.
-    Uploads an image and returns its URL.
+    Uploads an image and returns its URL. Resized WebP/AVIF variants are
+    generated in the background and show up on the project once ready.
     """
     if "file" not in request.files:
         return jsonify({"error": "No file provided"}), 400
@@ -515,6 +716,291 @@ def upload_image():
 
     try:
         url = upload_file(file)
+        file.stream.seek(0)
+        schedule_variants(url, file.stream.read(), file.content_type)
         return jsonify({"url": url}), 201
     except Exception as e:
         return jsonify({"error": f"Upload failed: {str(e)}"}), 500
+
+
+# ---------------------------------------------------------------------------
+# Direct uploads — the browser sends the file straight to S3
+# ---------------------------------------------------------------------------
+
+@require_admin
+def presign_image_upload():
+    """
+    POST /api/admin/uploads/presign
+    Body: { "content_type": "image/png", "size": 123456, "sha256": "<hex>" }
+
+    Returns { "url", "fields", "key", "exists": false }. The browser POSTs
+    multipart/form-data to `url` with every entry of `fields` plus a final
+    "file" field, then calls /api/admin/uploads/complete with `key`. The
+    file never passes through this worker.
+
+    Objects are named by their SHA-256, so if the same image is already
+    stored the response is { "key", "exists": true } (200) and the browser
+    goes straight to /complete.
+
+    Demonstrates: S3 presigned POST policies (content-type and size limits
+    enforced by S3).
+    """
+    data = request.get_json() or {}
+    content_type = data.get("content_type", "")
+    size = data.get("size")
+    if not isinstance(size, int) or isinstance(size, bool):
+        return jsonify({"error": "size must be an integer"}), 400
+
+    try:
+        presigned = presign_upload(
+            content_type, size, data.get("sha256"),
+            url_for("admin.local_upload", _external=True),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Could not presign upload: {str(e)}"}), 500
+
+    return jsonify(presigned), 200 if presigned["exists"] else 201
+
+
+@require_admin
+def complete_image_upload():
+    """
+    POST /api/admin/uploads/complete
+    Body: { "key": "<key from /presign>" }
+
+    Verifies the uploaded object, records it in the uploads table and
+    queues its responsive variants. Returns { "url": ... } like
+    /api/admin/upload. Calling it again for the same key is harmless.
+    """
+    data = request.get_json() or {}
+    key = data.get("key", "")
+
+    try:
+        upload = verify_upload(key)
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Could not verify upload: {str(e)}"}), 500
+
+    with get_db() as (conn, cur):
+        # -- Demonstrates: INSERT ... ON CONFLICT DO NOTHING (idempotent callback)
+        # -- Purpose: Record a verified direct upload once
+        cur.execute("""
+            INSERT INTO uploads (object_key, url, content_type, size_bytes)
+            VALUES (%(key)s, %(url)s, %(content_type)s, %(size)s)
+            ON CONFLICT (object_key) DO NOTHING
+            RETURNING id
+        """, upload)
+        created = cur.fetchone() is not None
+
+    if created:
+        schedule_variants(upload["url"], lambda: read_upload(key), upload["content_type"])
+
+    return jsonify({"url": upload["url"]}), 201 if created else 200
+
+
+def local_upload():
+    """
+    POST /api/admin/uploads/local (USE_LOCAL_STORAGE=true only)
+
+    Local stand-in for the S3 presigned POST target. Like S3, it takes no
+    bearer token — the signed fields from /presign are the credential —
+    and answers 204 No Content on success.
+    """
+    if not config.USE_LOCAL_STORAGE:
+        return jsonify({"error": "Not found"}), 404
+    if "file" not in request.files:
+        return jsonify({"error": "No file provided"}), 400
+
+    try:
+        save_local_upload(request.form, request.files["file"])
+    except PermissionError as e:
+        return jsonify({"error": str(e)}), 403
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return "", 204
+
+
+# ---------------------------------------------------------------------------
+# Batch operations — many changes, one transaction
+# ---------------------------------------------------------------------------
+
+_MAX_BATCH_OPERATIONS = 500
+
+# Fields each entity needs on "create"
+_BATCH_REQUIRED = {
+    "projects": ("title",),
+    "posts": ("title", "content"),
+    "interests": ("title",),
+    "tags": ("name",),
+}
+
+# Tables whose cached responses a write to each entity makes stale
+_BATCH_TABLES = {
+    "projects": ("projects", "project_tags"),
+    "posts": ("posts",),
+    "interests": ("interests",),
+    "tags": ("tags", "project_tags"),
+}
+
+# -- Demonstrates: DELETE ... WHERE id = ANY(array) RETURNING
+# -- Purpose: Delete a run of rows of one kind in a single statement
+_BATCH_DELETE_SQL = {
+    "projects": "DELETE FROM projects WHERE id = ANY(%s) RETURNING id",
+    "posts": "DELETE FROM posts WHERE id = ANY(%s) RETURNING id",
+    "interests": "DELETE FROM interests WHERE id = ANY(%s) RETURNING id",
+    "tags": "DELETE FROM tags WHERE id = ANY(%s) RETURNING id",
+}
+
+
+class _BatchError(Exception):
+    """Aborts the batch; raised inside get_db() so everything is rolled back."""
+
+    def __init__(self, index, message, status=400):
+        super().__init__(message)
+        self.index = index
+        self.message = message
+        self.status = status
+
+
+def _check_operation(op):
+    """Return an error message if `op` is malformed, else None."""
+    if not isinstance(op, dict):
+        return "Each operation must be an object"
+    if op.get("op") not in ("create", "update", "delete"):
+        return 'op must be "create", "update" or "delete"'
+    if op.get("entity") not in _BATCH_REQUIRED:
+        return f"entity must be one of: {', '.join(_BATCH_REQUIRED)}"
+    if op["op"] != "create" and (not isinstance(op.get("id"), int) or isinstance(op["id"], bool)):
+        return "id must be an integer"
+    if op["op"] != "delete":
+        data = op.get("data")
+        if not isinstance(data, dict):
+            return "data must be an object"
+        if op["op"] == "create":
+            missing = [f for f in _BATCH_REQUIRED[op["entity"]] if not data.get(f)]
+            if missing:
+                return f"Missing required field(s): {', '.join(missing)}"
+        if op["entity"] == "projects" and "tag_ids" in data and _int_list(data["tag_ids"]) is None:
+            return "tag_ids must be a list of integers"
+    return None
+
+
+def _batch_create(cur, entity, data):
+    if entity == "projects":
+        return _insert_project(cur, data, data.get("tag_ids", []))
+    if entity == "posts":
+        return _insert_post(cur, data)
+    if entity == "interests":
+        return _insert_interest(cur, data)
+    cur.execute("INSERT INTO tags (name) VALUES (%s) RETURNING id, name", (data["name"],))
+    return cur.fetchone()
+
+
+def _batch_update(cur, entity, item_id, data):
+    if entity == "projects":
+        return _update_project(cur, item_id, data, data.get("tag_ids"))
+    if entity == "posts":
+        return _update_post(cur, item_id, data)
+    if entity == "interests":
+        return _update_interest(cur, item_id, data)
+    cur.execute(
+        "UPDATE tags SET name = %s WHERE id = %s RETURNING id, name",
+        (data.get("name", ""), item_id),
+    )
+    return cur.fetchone()
+
+
+@require_admin
+def batch():
+    """
+    POST /api/admin/batch
+    Body: { "operations": [
+        { "op": "create", "entity": "tags", "data": { "name": "Rust" } },
+        { "op": "update", "entity": "projects", "id": 3, "data": { ... } },
+        { "op": "delete", "entity": "posts", "id": 7 },
+        ...
+    ] }
+
+    Entities: projects, posts, interests, tags. "data" takes the same fields
+    as the matching single-item endpoint, with the same semantics (an
+    update replaces every field; projects accept "tag_ids").
+
+    Runs every operation, in order, in ONE transaction on one connection:
+    either all of them apply or none do. Consecutive deletes of the same
+    entity are sent as a single DELETE ... WHERE id = ANY(...).
+
+    Returns { "results": [{ "op", "entity", "id", "row"? }, ...] } with one
+    entry per operation, or { "error", "index" } naming the operation that
+    failed (404 if its row doesn't exist or an earlier operation deleted it,
+    400 otherwise).
+    """
+    body = request.get_json(silent=True)
+    operations = body.get("operations") if isinstance(body, dict) else None
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"error": "operations must be a non-empty list"}), 400
+    if len(operations) > _MAX_BATCH_OPERATIONS:
+        return jsonify({"error": f"At most {_MAX_BATCH_OPERATIONS} operations per batch"}), 400
+
+    # Validate everything before taking a connection
+    for index, op in enumerate(operations):
+        error = _check_operation(op)
+        if error:
+            return jsonify({"error": error, "index": index}), 400
+
+    results = [None] * len(operations)
+    touched = set()
+    index = 0
+    try:
+        with get_db() as (conn, cur):
+            while index < len(operations):
+                op = operations[index]
+                entity = op["entity"]
+
+                if op["op"] == "delete":
+                    end = index
+                    while (end < len(operations) and operations[end]["op"] == "delete"
+                           and operations[end]["entity"] == entity):
+                        end += 1
+                    ids = [o["id"] for o in operations[index:end]]
+                    cur.execute(_BATCH_DELETE_SQL[entity], (ids,))
+                    deleted = {row["id"] for row in cur.fetchall()}
+                    for position in range(index, end):
+                        item_id = operations[position]["id"]
+                        # A repeated id was already deleted by its first occurrence
+                        if item_id not in deleted:
+                            raise _BatchError(position, f"{entity} {item_id} not found", 404)
+                        deleted.discard(item_id)
+                        results[position] = {"op": "delete", "entity": entity, "id": item_id}
+                    index = end
+
+                elif op["op"] == "create":
+                    row = _batch_create(cur, entity, op["data"])
+                    results[index] = {"op": "create", "entity": entity, "id": row["id"], "row": row}
+                    index += 1
+
+                else:
+                    row = _batch_update(cur, entity, op["id"], op["data"])
+                    if row is None:
+                        raise _BatchError(index, f"{entity} {op['id']} not found", 404)
+                    results[index] = {"op": "update", "entity": entity, "id": op["id"], "row": row}
+                    index += 1
+
+                touched.update(_BATCH_TABLES[entity])
+    except _BatchError as e:
+        return jsonify({"error": e.message, "index": e.index}), e.status
+    except psycopg2.IntegrityError as e:
+        # e.g. a duplicate slug or tag name, or an unknown tag id
+        return jsonify({"error": f"Constraint violated: {e.diag.message_primary}", "index": index}), 400
+    except (psycopg2.DataError, psycopg2.ProgrammingError) as e:
+        # A value of the wrong type for its column, e.g. "featured": "maybe"
+        message = e.diag.message_primary or str(e).strip()
+        return jsonify({"error": f"Invalid value: {message}", "index": index}), 400
+
+    invalidate(*touched)
+    return jsonify({"results": results})
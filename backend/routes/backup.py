@@ -0,0 +1,358 @@
+"""
+Backup routes — Streaming export and import of all site content.
+
+Exports stream rows straight from a server-side (named) cursor into a
+chunked HTTP response, EXPORT_CHUNK_ROWS at a time, so memory use stays
+flat however large a table grows. Imports feed the request body to
+Postgres with COPY ... FROM STDIN as it arrives, so uploads are never
+buffered whole either.
+
+Formats:
+    ndjson — one JSON object per line (rows rendered by Postgres'
+             row_to_json, timestamps in ISO 8601)
+    csv    — header row, then one line per row; NULL is an unquoted empty
+             field and an empty string is "" (the convention COPY uses)
+
+Endpoints (all require the admin token):
+    GET  /api/admin/export                 every table, one NDJSON stream
+    GET  /api/admin/export/<table>         one table, ?format=ndjson|csv
+    POST /api/admin/import                 a full NDJSON export
+    POST /api/admin/import/<table>         one table, ?format=ndjson|csv
+
+Imports append by default; ?replace=true first deletes the existing rows
+(in the same transaction). Rows keep their ids, and the id sequences are
+moved past the imported values afterwards. Replacing a single parent table
+(tags, projects) also removes its project_tags rows via ON DELETE CASCADE —
+restore those afterwards, or use the full export/import.
+"""
+
+import itertools
+import json
+import psycopg2
+from flask import Response, jsonify, request
+from psycopg2 import sql
+from cache import invalidate
+from db import get_db
+from routes.admin import require_admin
+import config
+
+
+# Export/restore order: parents before the rows that reference them
+_TABLES = {
+    "tags": ("id", "name"),
+    "projects": (
+        "id", "title", "description", "tech_stack", "live_url", "github_url",
+        "image_url", "featured", "sort_order", "created_at",
+    ),
+    "project_tags": ("project_id", "tag_id"),
+    "posts": ("id", "title", "content", "slug", "published", "created_at", "updated_at"),
+    "interests": (
+        "id", "title", "tag", "blurb", "description", "accent", "theme",
+        "sort_order", "created_at",
+    ),
+    "contact_messages": ("id", "name", "email", "message", "created_at"),
+}
+
+_ORDER_BY = {"project_tags": ("project_id", "tag_id")}
+
+_MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _select(table):
+    """SELECT <columns> FROM <table> ORDER BY <key> for a whitelisted table."""
+    return sql.SQL("SELECT {columns} FROM {table} ORDER BY {order}").format(
+        columns=sql.SQL(", ").join(map(sql.Identifier, _TABLES[table])),
+        table=sql.Identifier(table),
+        order=sql.SQL(", ").join(map(sql.Identifier, _ORDER_BY.get(table, ("id",)))),
+    )
+
+
+def _csv_line(values):
+    """
+    One CSV line as COPY reads it: NULL is an unquoted empty field, every
+    string is quoted (so "" stays an empty string), booleans are true/false.
+    """
+    fields = []
+    for value in values:
+        if value is None:
+            fields.append("")
+        elif isinstance(value, bool):
+            fields.append("true" if value else "false")
+        elif isinstance(value, (int, float)):
+            fields.append(str(value))
+        else:
+            fields.append('"' + str(value).replace('"', '""') + '"')
+    return ",".join(fields) + "\n"
+
+
+def _format_arg():
+    fmt = request.args.get("format", "ndjson")
+    return fmt if fmt in _MIMETYPES else None
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def _stream_rows(cur, query, params=()):
+    """Yield rows from a server-side cursor, EXPORT_CHUNK_ROWS per round trip."""
+    with cur.connection.cursor(name="export") as named:
+        named.itersize = config.EXPORT_CHUNK_ROWS
+        named.execute(query, params)
+        yield from named
+
+
+def _chunks(lines):
+    """Join lines into one response chunk per EXPORT_CHUNK_ROWS rows."""
+    while True:
+        chunk = list(itertools.islice(lines, config.EXPORT_CHUNK_ROWS))
+        if not chunk:
+            return
+        yield "".join(chunk)
+
+
+def _export_table(table, fmt):
+    with get_db() as (conn, cur):
+        # Signals that a connection was obtained (see _streaming_response)
+        yield ""
+        if fmt == "ndjson":
+            # -- Demonstrates: row_to_json over a subquery
+            # -- Purpose: Let Postgres render each row as one JSON line
+            query = sql.SQL("SELECT row_to_json(t)::text FROM ({select}) t").format(
+                select=_select(table),
+            )
+            yield from _chunks(row[0] + "\n" for row in _stream_rows(cur, query))
+        else:
+            rows = _stream_rows(cur, _select(table))
+            yield ",".join(_TABLES[table]) + "\n"
+            yield from _chunks(_csv_line(row) for row in rows)
+
+
+def _export_all():
+    with get_db() as (conn, cur):
+        # One snapshot for every table, so the export is consistent
+        cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+        yield ""
+        for table in _TABLES:
+            query = sql.SQL(
+                "SELECT json_build_object('table', %s, 'row', row_to_json(t))::text FROM ({select}) t"
+            ).format(select=_select(table))
+            yield from _chunks(row[0] + "\n" for row in _stream_rows(cur, query, (table,)))
+
+
+def _streaming_response(chunks, mimetype, filename):
+    # Run the generator up to its first yield here, so a busy pool or a
+    # failed connection still becomes a proper error response rather than
+    # a broken stream after a 200 has gone out
+    next(chunks)
+    return Response(chunks, mimetype=mimetype, headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Cache-Control": "no-store",
+    })
+
+
+@require_admin
+def export_all():
+    """
+    GET /api/admin/export
+
+    Streams every table as NDJSON lines of { "table": ..., "row": {...} },
+    parents first, from a single consistent snapshot. POST the result to
+    /api/admin/import to restore it.
+    """
+    return _streaming_response(_export_all(), _MIMETYPES["ndjson"], "portfolio-export.ndjson")
+
+
+@require_admin
+def export_table(table):
+    """
+    GET /api/admin/export/:table?format=ndjson|csv
+
+    Demonstrates: server-side (named) cursors for constant-memory streaming.
+    """
+    if table not in _TABLES:
+        return jsonify({"error": f"Unknown table: {table}"}), 404
+    fmt = _format_arg()
+    if fmt is None:
+        return jsonify({"error": "format must be ndjson or csv"}), 400
+    return _streaming_response(_export_table(table, fmt), _MIMETYPES[fmt], f"{table}.{fmt}")
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+class _Lines:
+    """Iterate the request body line by line, with one line of lookahead."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._next = None
+
+    def peek(self):
+        while self._next is None:
+            line = self._stream.readline()
+            if not line:
+                return None
+            if line.strip():
+                self._next = line
+        return self._next
+
+    def pop(self):
+        line = self.peek()
+        self._next = None
+        return line
+
+
+class _NdjsonCopySource:
+    """
+    File-like object that turns NDJSON lines into CSV for COPY FROM.
+
+    With `table` set, lines are full-export envelopes ({"table", "row"}) and
+    reading stops at the first line for a different table.
+    """
+
+    def __init__(self, lines, columns, table=None):
+        self._lines = lines
+        self._columns = columns
+        self._table = table
+        self._pending = ""
+        self.line_number = 0
+        # COPY only reports that read() failed; the route re-raises this
+        self.error = None
+
+    def _next_row(self):
+        line = self._lines.peek()
+        if line is None:
+            return None
+        try:
+            item = json.loads(line)
+        except ValueError:
+            raise ValueError(f"Line {self.line_number + 1} is not valid JSON") from None
+        if self._table is not None:
+            if item.get("table") != self._table:
+                return None
+            item = item.get("row")
+        if not isinstance(item, dict):
+            raise ValueError(f"Line {self.line_number + 1} is not a JSON object")
+        self._lines.pop()
+        self.line_number += 1
+        return [item.get(column) for column in self._columns]
+
+    def read(self, size=-1):
+        while size < 0 or len(self._pending) < size:
+            try:
+                row = self._next_row()
+            except ValueError as e:
+                self.error = e
+                raise
+            if row is None:
+                break
+            self._pending += _csv_line(row)
+        if size < 0:
+            size = len(self._pending)
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+def _copy_in(cur, table, source, header):
+    """COPY rows from `source` into `table`; returns the number of rows."""
+    # -- Demonstrates: COPY ... FROM STDIN (bulk load, streamed)
+    # -- Purpose: Load many rows far faster than row-by-row INSERTs
+    query = sql.SQL("COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv, HEADER {header})").format(
+        table=sql.Identifier(table),
+        columns=sql.SQL(", ").join(map(sql.Identifier, _TABLES[table])),
+        header=sql.SQL("true" if header else "false"),
+    )
+    try:
+        cur.copy_expert(query, source, size=64 * 1024)
+    except psycopg2.errors.QueryCanceled:
+        if getattr(source, "error", None) is not None:
+            raise source.error from None
+        raise
+    count = cur.rowcount
+
+    if "id" in _TABLES[table]:
+        # Imported rows kept their ids — move the sequence past them
+        cur.execute(sql.SQL("""
+            SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE(MAX(id), 1), MAX(id) IS NOT NULL)
+            FROM {table}
+        """).format(table=sql.Identifier(table)), (table,))
+    return count
+
+
+def _clear(cur, tables):
+    # Children first; ON DELETE CASCADE takes care of anything left over
+    for table in reversed(list(tables)):
+        cur.execute(sql.SQL("DELETE FROM {table}").format(table=sql.Identifier(table)))
+
+
+def _run_import(work, tables):
+    try:
+        with get_db() as (conn, cur):
+            imported = work(cur)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except psycopg2.DataError as e:
+        return jsonify({"error": f"Invalid data: {e.diag.message_primary}"}), 400
+    except psycopg2.IntegrityError as e:
+        return jsonify({"error": f"Constraint violated: {e.diag.message_primary}"}), 409
+
+    invalidate(*tables)
+    return jsonify({"imported": imported})
+
+
+@require_admin
+def import_all():
+    """
+    POST /api/admin/import[?replace=true]
+    Body: an NDJSON stream as produced by GET /api/admin/export
+
+    Everything is imported in one transaction. Returns { "imported":
+    { table: row_count, ... } }.
+    """
+    replace = request.args.get("replace") == "true"
+    lines = _Lines(request.stream)
+
+    def work(cur):
+        if replace:
+            _clear(cur, _TABLES)
+        counts = {}
+        while (line := lines.peek()) is not None:
+            try:
+                table = json.loads(line).get("table")
+            except (ValueError, AttributeError):
+                raise ValueError("Expected NDJSON lines of {\"table\": ..., \"row\": {...}}") from None
+            if table not in _TABLES:
+                raise ValueError(f"Unknown table: {table}")
+            source = _NdjsonCopySource(lines, _TABLES[table], table=table)
+            counts[table] = counts.get(table, 0) + _copy_in(cur, table, source, header=False)
+        return counts
+
+    return _run_import(work, _TABLES)
+
+
+@require_admin
+def import_table(table):
+    """
+    POST /api/admin/import/:table?format=ndjson|csv[&replace=true]
+    Body: rows in the same format GET /api/admin/export/:table produces
+
+    Returns { "imported": row_count }.
+    """
+    if table not in _TABLES:
+        return jsonify({"error": f"Unknown table: {table}"}), 404
+    fmt = _format_arg()
+    if fmt is None:
+        return jsonify({"error": "format must be ndjson or csv"}), 400
+    replace = request.args.get("replace") == "true"
+
+    def work(cur):
+        if replace:
+            _clear(cur, [table])
+        if fmt == "csv":
+            # COPY reads the request body directly, chunk by chunk
+            return _copy_in(cur, table, request.stream, header=True)
+        return _copy_in(cur, table, _NdjsonCopySource(_Lines(request.stream), _TABLES[table]), header=False)
+
+    return _run_import(work, [table])
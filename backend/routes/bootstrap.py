@@ -0,0 +1,80 @@
+"""
+Bootstrap route — Everything the Home and Projects pages need in one response.
+
+Instead of separate round trips to /api/projects, /api/tags, /api/interests
+and /api/projects/:id per card, the frontend makes one request that runs a
+handful of queries on a single connection.
+
+All queries use raw SQL via psycopg2 to demonstrate SQL skills.
+"""
+
+from flask import jsonify, request
+from cache import cached
+from db import get_db
+from routes import interests, projects
+import queries
+
+
+_SECTIONS = ("projects", "tags", "interests")
+
+# Prepared once per pooled connection (see queries.py). The tags and
+# interests sections reuse the statements of /api/tags and /api/interests.
+
+# -- Demonstrates: LEFT JOIN + json_agg for a whole list at once
+# -- Purpose: Every (or every featured) project with its tags
+_PROJECTS = queries.NamedQuery("bootstrap_projects", """
+    SELECT
+        p.id, p.title, p.description, p.tech_stack,
+        p.live_url, p.github_url, p.image_url, iv.variants AS image_variants,
+        p.featured, p.created_at,
+        COALESCE(
+            json_agg(json_build_object('id', t.id, 'name', t.name) ORDER BY t.name)
+            FILTER (WHERE t.id IS NOT NULL),
+            '[]'
+        ) AS tags
+    FROM projects p
+    LEFT JOIN project_tags pt ON p.id = pt.project_id
+    LEFT JOIN tags t ON pt.tag_id = t.id
+    LEFT JOIN image_variants iv ON iv.source_url = p.image_url
+    WHERE p.featured = TRUE OR NOT $1
+    GROUP BY p.id, iv.source_url
+    ORDER BY p.sort_order ASC
+""")
+
+@cached("projects", "project_tags", "tags", "interests", "image_variants")
+def get_bootstrap():
+    """
+    GET /api/bootstrap
+    Optional query params:
+        ?include=projects,tags,interests — sections to return (default: all)
+        ?featured=true — only featured projects
+
+    Returns { "projects": [...], "tags": [...], "interests": [...] } where
+    each project carries its tags (same shape as GET /api/projects/:id).
+
+    Demonstrates: LEFT JOIN + json_agg to fetch a list with its many-to-many
+    children in one query (no N+1), and several reads in one transaction.
+    """
+    include = request.args.get("include")
+    sections = [s.strip() for s in include.split(",")] if include else list(_SECTIONS)
+    unknown = set(sections) - set(_SECTIONS)
+    if unknown:
+        return jsonify({"error": f"Unknown include: {', '.join(sorted(unknown))}"}), 400
+
+    featured = request.args.get("featured") == "true"
+    result = {}
+
+    with get_db() as (conn, cur):
+        if "projects" in sections:
+            queries.execute(cur, _PROJECTS, (featured,))
+            result["projects"] = cur.fetchall()
+
+        if "tags" in sections:
+            queries.execute(cur, projects._TAGS)
+            result["tags"] = cur.fetchall()
+
+        if "interests" in sections:
+            queries.execute(cur, interests._ALL)
+            result["interests"] = cur.fetchall()
+
+    return jsonify(result)
@@ -1,30 +1,38 @@
 """
 Contact form route — Handles contact form submissions.
 
-Stores the message in the database AND sends an email notification
-via AWS SES (or logs it locally in development).
+Stores the message in the database AND queues an email notification in the
+outbox, in one transaction. A background sender delivers it via AWS SES
+(or logs it locally in development) — see services/outbox.py.
 """
 
-from flask import Blueprint, jsonify, request
+from flask import jsonify, request
 from db import get_db
 from extensions import limiter
-from services.email import send_contact_email
+import queries
+from services import outbox
 
-contact_bp = Blueprint("contact", __name__)
 
 _MAX_NAME = 100
 _MAX_EMAIL = 254   # RFC 5321 maximum
 _MAX_MESSAGE = 5000
 
+# -- Demonstrates: INSERT with RETURNING
+# -- Purpose: Save a contact form submission to the database
+_INSERT = queries.NamedQuery("contact_insert_message", """
+    INSERT INTO contact_messages (name, email, message)
+    VALUES ($1, $2, $3)
+    RETURNING id, created_at
+""")
+
 
-@contact_bp.route("/api/contact", methods=["POST"])
 @limiter.limit("10 per hour")
 def submit_contact():
     """
     POST /api/contact
     Body: { "name": "...", "email": "...", "message": "..." }
 
-    Demonstrates: INSERT with parameterized values + AWS SES integration
+    Demonstrates: INSERT with parameterized values + transactional outbox
     """
     data = request.get_json()
 
@@ -46,25 +54,15 @@ def submit_contact():
     if len(message) > _MAX_MESSAGE:
         return jsonify({"error": f"Message must be {_MAX_MESSAGE} characters or fewer"}), 400
 
-    # Store the message in the database
+    # Store the message and its email notification in one transaction
     with get_db() as (conn, cur):
-        # -- Demonstrates: INSERT with RETURNING
-        # -- Purpose: Save a contact form submission to the database
-        cur.execute("""
-            INSERT INTO contact_messages (name, email, message)
-            VALUES (%s, %s, %s)
-            RETURNING id, created_at
-        """, (name, email, message))
-
+        queries.execute(cur, _INSERT, (name, email, message))
         result = cur.fetchone()
 
-    # Send email notification via SES (or log it locally)
-    try:
-        send_contact_email(name, email, message)
-    except Exception as e:
-        # Don't fail the request if email sending fails —
-        # the message is already saved in the database
-        print(f"Warning: Failed to send email notification: {e}")
+        outbox.enqueue_contact_email(cur, result["id"], name, email, message)
+
+    # Committed — let the background sender deliver it right away
+    outbox.wake()
 
     return jsonify({
         "message": "Thank you! Your message has been received.",
@@ -4,13 +4,21 @@ Interest routes — Public API endpoints for the Interests page.
 All queries use raw SQL via psycopg2 to demonstrate SQL skills.
 """
 
-from flask import Blueprint, jsonify
+from cache import cached
 from db import get_db
+from json_provider import rows_response
+import queries
 
-interests_bp = Blueprint("interests", __name__)
 
+# Prepared once per pooled connection (see queries.py)
+_ALL = queries.NamedQuery("interests_all", """
+    SELECT id, title, tag, blurb, description, accent, theme, sort_order
+    FROM interests
+    ORDER BY sort_order ASC, id ASC
+""")
 
-@interests_bp.route("/api/interests", methods=["GET"])
+
+@cached("interests")
 def get_interests():
     """
     GET /api/interests
@@ -18,12 +26,8 @@ def get_interests():
     Demonstrates: SELECT + ORDER BY
     Purpose: Fetch the interest cards in display order for the public page.
     """
-    with get_db() as (conn, cur):
-        cur.execute("""
-            SELECT id, title, tag, blurb, description, accent, theme, sort_order
-            FROM interests
-            ORDER BY sort_order ASC, id ASC
-        """)
+    with get_db(tuples=True) as (conn, cur):
+        queries.execute(cur, _ALL)
         interests = cur.fetchall()
 
-    return jsonify(interests)
+    return rows_response(interests, cur.description)
@@ -4,54 +4,150 @@ Blog post routes — Public API endpoints for blog posts.
 All queries use raw SQL via psycopg2 to demonstrate SQL skills.
 """
 
-from flask import Blueprint, jsonify
+from flask import jsonify, request
+from cache import cached
 from db import get_db
+from json_provider import rows_response
+from pagination import decode_offset_cursor, encode_offset_cursor, page_args, page_response
+import queries
 
-posts_bp = Blueprint("posts", __name__)
 
+_MAX_QUERY = 200
 
-@posts_bp.route("/api/posts", methods=["GET"])
+# Prepared once per pooled connection (see queries.py)
+
+# -- Demonstrates: SELECT + WHERE + ORDER BY
+# -- Purpose: Fetch every published post, newest first (unpaginated)
+_ALL = queries.NamedQuery("posts_all", """
+    SELECT id, title, slug, created_at, updated_at
+    FROM posts
+    WHERE published = TRUE
+    ORDER BY created_at DESC, id DESC
+""")
+
+# -- Demonstrates: SELECT + WHERE + ORDER BY + LIMIT
+# -- Purpose: Fetch the newest published posts
+_FIRST_PAGE = queries.NamedQuery("posts_first_page", """
+    SELECT id, title, slug, created_at, updated_at
+    FROM posts
+    WHERE published = TRUE
+    ORDER BY created_at DESC, id DESC
+    LIMIT $1
+""")
+
+# -- Demonstrates: Keyset pagination with a row-value comparison
+# -- Purpose: Fetch the next page, continuing after the cursor row
+_NEXT_PAGE = queries.NamedQuery("posts_next_page", """
+    SELECT id, title, slug, created_at, updated_at
+    FROM posts
+    WHERE published = TRUE
+      AND (created_at, id) < ($1, $2)
+    ORDER BY created_at DESC, id DESC
+    LIMIT $3
+""")
+
+# -- Demonstrates: @@ match + ts_rank ordering + ts_headline snippets
+# -- Purpose: Rank the matching page first, then build snippets only
+# --          for the rows actually returned (ts_headline is costly)
+_SEARCH = queries.NamedQuery("posts_search", """
+    SELECT id, title, slug, created_at, updated_at, rank,
+           ts_headline('english', content, query,
+                       'StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MinWords=8, MaxWords=25')
+               AS snippet
+    FROM (
+        SELECT p.id, p.title, p.slug, p.content, p.created_at, p.updated_at,
+               ts_rank(p.search_vector, query) AS rank, query
+        FROM posts p, websearch_to_tsquery('english', $1) AS query
+        WHERE p.published = TRUE
+          AND p.search_vector @@ query
+        ORDER BY rank DESC, p.id DESC
+        LIMIT $2 OFFSET $3
+    ) AS hits
+    ORDER BY rank DESC, id DESC
+""")
+
+# -- Demonstrates: Parameterized query (SQL injection prevention)
+# -- Purpose: Safely fetch a single post by its URL slug
+_BY_SLUG = queries.NamedQuery("post_by_slug", """
+    SELECT id, title, content, slug, published, created_at, updated_at
+    FROM posts
+    WHERE slug = $1 AND published = TRUE
+""")
+
+
+@cached("posts")
 def get_posts():
     """
     GET /api/posts
+    Optional query params: ?limit=N (default 20, max 100) and ?cursor=...
+    from the previous page's X-Next-Cursor header. Without either, every
+    published post is returned in one response, as before pagination.
 
-    Demonstrates: Basic SELECT with WHERE clause
-    Purpose: Fetch all published blog posts for the public blog page.
+    Demonstrates: Basic SELECT with WHERE clause + keyset pagination
+    Purpose: Fetch published blog posts for the public blog page.
     Only published posts are returned (drafts are hidden).
     """
-    with get_db() as (conn, cur):
-        # -- Demonstrates: SELECT + WHERE + ORDER BY
-        # -- Purpose: Fetch published posts, newest first
-        cur.execute("""
-            SELECT id, title, slug, created_at, updated_at
-            FROM posts
-            WHERE published = TRUE
-            ORDER BY created_at DESC
-        """)
+    paged = "limit" in request.args or "cursor" in request.args
+    limit, after = page_args(default_limit=20, max_limit=100)
+
+    # Tuple rows + compiled serializer: no per-row dicts on the hot path
+    with get_db(tuples=True) as (conn, cur):
+        if not paged:
+            queries.execute(cur, _ALL)
+            return rows_response(cur.fetchall(), cur.description)
+        if after is None:
+            queries.execute(cur, _FIRST_PAGE, (limit + 1,))
+        else:
+            queries.execute(cur, _NEXT_PAGE, (*after, limit + 1))
 
         posts = cur.fetchall()
 
-    return jsonify(posts)
+    return page_response(posts, limit, description=cur.description)
 
 
-@posts_bp.route("/api/posts/<slug>", methods=["GET"])
+# Not stored in the response cache: every distinct query would take an entry
+@cached("posts", store=False)
+def search_posts():
+    """
+    GET /api/posts/search?q=...
+    Optional query params: ?limit=N (default 10, max 50) and ?cursor=...
+    from the previous page's X-Next-Cursor header.
+
+    Demonstrates: Full-text search with a tsvector column + GIN index
+    Purpose: Search published posts by title and content, best matches first.
+    `q` accepts web-search syntax ("quoted phrases", OR, -exclude). Each hit
+    includes a `snippet` of the content with matches wrapped in <mark> tags;
+    the surrounding text is not HTML-escaped.
+    """
+    q = request.args.get("q", "").strip()
+    if not q:
+        return jsonify({"error": "Query parameter q is required"}), 400
+    if len(q) > _MAX_QUERY:
+        return jsonify({"error": f"Query must be {_MAX_QUERY} characters or fewer"}), 400
+
+    limit, offset = page_args(default_limit=10, max_limit=50, decode=decode_offset_cursor)
+    offset = offset or 0
+
+    with get_db(tuples=True) as (conn, cur):
+        queries.execute(cur, _SEARCH, (q, limit + 1, offset))
+        posts = cur.fetchall()
+
+    return page_response(
+        posts, limit, next_cursor=encode_offset_cursor(offset + limit), description=cur.description,
+    )
+
+
+@cached("posts")
 def get_post(slug):
     """
     GET /api/posts/:slug
 
     Demonstrates: Parameterized query for SQL injection prevention.
     The slug comes from the URL, so it's user input that must be sanitized.
-    Using %s placeholder ensures psycopg2 escapes the value safely.
+    Using a $1 parameter ensures the value is never parsed as SQL.
     """
     with get_db() as (conn, cur):
-        # -- Demonstrates: Parameterized query (SQL injection prevention)
-        # -- Purpose: Safely fetch a single post by its URL slug
-        cur.execute("""
-            SELECT id, title, content, slug, published, created_at, updated_at
-            FROM posts
-            WHERE slug = %s AND published = TRUE
-        """, (slug,))
-
+        queries.execute(cur, _BY_SLUG, (slug,))
         post = cur.fetchone()
 
     if not post:
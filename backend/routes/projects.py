@@ -4,47 +4,95 @@ Project routes — Public API endpoints for portfolio projects.
 All queries use raw SQL via psycopg2 to demonstrate SQL skills.
 """
 
-from flask import Blueprint, jsonify, request
+from flask import jsonify, request
+from cache import cached
 from db import get_db
-
-projects_bp = Blueprint("projects", __name__)
-
-
-@projects_bp.route("/api/projects", methods=["GET"])
+from json_provider import rows_response
+import queries
+
+
+# Prepared once per pooled connection (see queries.py)
+
+_ALL = queries.NamedQuery("projects_all", """
+    SELECT p.id, p.title, p.description, p.tech_stack,
+           p.live_url, p.github_url, p.image_url, iv.variants AS image_variants,
+           p.featured, p.created_at
+    FROM projects p
+    LEFT JOIN image_variants iv ON iv.source_url = p.image_url
+    ORDER BY p.sort_order ASC
+""")
+
+# -- Demonstrates: WHERE + ORDER BY
+# -- Purpose: Fetch featured projects for the homepage
+_FEATURED = queries.NamedQuery("projects_featured", """
+    SELECT p.id, p.title, p.description, p.tech_stack,
+           p.live_url, p.github_url, p.image_url, iv.variants AS image_variants,
+           p.featured, p.created_at
+    FROM projects p
+    LEFT JOIN image_variants iv ON iv.source_url = p.image_url
+    WHERE p.featured = TRUE
+    ORDER BY p.sort_order ASC
+""")
+
+# -- Demonstrates: LEFT JOIN + json_agg for many-to-many
+# -- Purpose: Fetch a single project with its tags
+_BY_ID = queries.NamedQuery("project_by_id", """
+    SELECT
+        p.id, p.title, p.description, p.tech_stack,
+        p.live_url, p.github_url, p.image_url, iv.variants AS image_variants,
+        p.featured, p.created_at,
+        COALESCE(
+            json_agg(json_build_object('id', t.id, 'name', t.name))
+            FILTER (WHERE t.id IS NOT NULL),
+            '[]'
+        ) AS tags
+    FROM projects p
+    LEFT JOIN project_tags pt ON p.id = pt.project_id
+    LEFT JOIN tags t ON pt.tag_id = t.id
+    LEFT JOIN image_variants iv ON iv.source_url = p.image_url
+    WHERE p.id = $1
+    GROUP BY p.id, iv.source_url
+""")
+
+# -- Demonstrates: Aggregate function with GROUP BY
+# -- Purpose: Build a tag cloud showing how many projects use each tag
+_TAGS = queries.NamedQuery("tags_with_counts", """
+    SELECT
+        t.id,
+        t.name,
+        COUNT(pt.project_id) AS project_count
+    FROM tags t
+    LEFT JOIN project_tags pt ON t.id = pt.tag_id
+    GROUP BY t.id, t.name
+    ORDER BY project_count DESC
+""")
+
+
+@cached("projects", "image_variants")
 def get_projects():
     """
     GET /api/projects
     Optional query param: ?featured=true to filter featured projects only.
+    Each project's `image_variants` maps format -> srcset (null until the
+    screenshot's variants have been generated).
 
     Demonstrates: SELECT with optional WHERE clause + ORDER BY
     """
     featured = request.args.get("featured")
 
-    with get_db() as (conn, cur):
+    # Tuple rows + compiled serializer: no per-row dicts on the hot path
+    with get_db(tuples=True) as (conn, cur):
         if featured == "true":
-            # -- Demonstrates: WHERE + ORDER BY
-            # -- Purpose: Fetch featured projects for the homepage
-            cur.execute("""
-                SELECT id, title, description, tech_stack,
-                       live_url, github_url, image_url, featured, created_at
-                FROM projects
-                WHERE featured = TRUE
-                ORDER BY sort_order ASC
-            """)
+            queries.execute(cur, _FEATURED)
         else:
-            cur.execute("""
-                SELECT id, title, description, tech_stack,
-                       live_url, github_url, image_url, featured, created_at
-                FROM projects
-                ORDER BY sort_order ASC
-            """)
+            queries.execute(cur, _ALL)
 
         projects = cur.fetchall()
 
-    return jsonify(projects)
+    return rows_response(projects, cur.description)
 
 
-@projects_bp.route("/api/projects/<int:project_id>", methods=["GET"])
+@cached("projects", "project_tags", "tags", "image_variants")
 def get_project(project_id):
     """
     GET /api/projects/:id
@@ -53,24 +101,7 @@ def get_project(project_id):
     to resolve a many-to-many relationship.
     """
     with get_db() as (conn, cur):
-        # -- Demonstrates: LEFT JOIN + json_agg for many-to-many
-        # -- Purpose: Fetch a single project with its tags
-        cur.execute("""
-            SELECT
-                p.id, p.title, p.description, p.tech_stack,
-                p.live_url, p.github_url, p.image_url, p.featured, p.created_at,
-                COALESCE(
-                    json_agg(json_build_object('id', t.id, 'name', t.name))
-                    FILTER (WHERE t.id IS NOT NULL),
-                    '[]'
-                ) AS tags
-            FROM projects p
-            LEFT JOIN project_tags pt ON p.id = pt.project_id
-            LEFT JOIN tags t ON pt.tag_id = t.id
-            WHERE p.id = %s
-            GROUP BY p.id
-        """, (project_id,))
-
+        queries.execute(cur, _BY_ID, (project_id,))
         project = cur.fetchone()
 
     if not project:
@@ -79,7 +110,7 @@ def get_project(project_id):
     return jsonify(project)
 
 
-@projects_bp.route("/api/tags", methods=["GET"])
+@cached("tags", "project_tags")
 def get_tags():
     """
     GET /api/tags
@@ -87,20 +118,8 @@ def get_tags():
     Demonstrates: COUNT aggregate + GROUP BY + JOIN
     Purpose: Get all tags with their project count (for a tag cloud).
     """
-    with get_db() as (conn, cur):
-        # -- Demonstrates: Aggregate function with GROUP BY
-        # -- Purpose: Build a tag cloud showing how many projects use each tag
-        cur.execute("""
-            SELECT
-                t.id,
-                t.name,
-                COUNT(pt.project_id) AS project_count
-            FROM tags t
-            LEFT JOIN project_tags pt ON t.id = pt.tag_id
-            GROUP BY t.id, t.name
-            ORDER BY project_count DESC
-        """)
-
+    with get_db(tuples=True) as (conn, cur):
+        queries.execute(cur, _TAGS)
         tags = cur.fetchall()
 
-    return jsonify(tags)
+    return rows_response(tags, cur.description)
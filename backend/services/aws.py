@@ -0,0 +1,106 @@
+"""
+AWS Client Registry — Shared, Reusable boto3 Clients
+
+What it does:
+    Hands out one boto3 client per AWS service (S3, SES, ...) per worker
+    process, created on first use and reused for every later request.
+
+Why it's used here:
+    - boto3.client() resolves credentials, loads the service model and
+      builds a fresh HTTPS connection pool every time it is called, which
+      costs tens to hundreds of milliseconds per request
+    - A long-lived client keeps its connections open (keep-alive), so later
+      calls pay only for the actual network round trip
+    - Timeouts, retries and pool size are set in one place (config.py)
+      instead of relying on botocore's defaults (60 s read timeout)
+
+boto3 clients are thread-safe once created, but sessions are not, so
+clients are built under a lock from a registry-owned session. The registry
+is reset in forked children so workers never share inherited sockets.
+Every API call is timed (aws_call_duration_seconds, see metrics.py).
+
+boto3 itself is imported on the first get_client() / s3_transfer_config()
+call, not with this module: it takes longer to import than the rest of the
+app together, and most processes (a cold serverless instance answering
+/api/projects) never talk to AWS.
+"""
+
+import os
+import threading
+import config
+import metrics
+
+_session = None
+_clients = {}
+_stats = {}            # service -> {"created": n, "reused": n}
+_lock = threading.Lock()
+_transfer_config = None
+
+
+def _client_config():
+    from botocore.config import Config
+
+    return Config(
+        region_name=config.AWS_REGION,
+        connect_timeout=config.AWS_CONNECT_TIMEOUT,
+        read_timeout=config.AWS_READ_TIMEOUT,
+        retries={"max_attempts": config.AWS_MAX_ATTEMPTS, "mode": config.AWS_RETRY_MODE},
+        max_pool_connections=config.AWS_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=True,
+    )
+
+
+def get_client(service):
+    """Return this process's shared boto3 client for `service`."""
+    client = _clients.get(service)
+    if client is not None:
+        with _lock:
+            _stats[service]["reused"] += 1
+        return client
+
+    global _session
+    with _lock:
+        client = _clients.get(service)
+        if client is None:
+            if _session is None:
+                import boto3.session
+
+                _session = boto3.session.Session()
+            client = _session.client(service, config=_client_config())
+            metrics.instrument_boto_client(client)
+            _clients[service] = client
+            _stats[service] = {"created": 1, "reused": 0}
+        else:
+            _stats[service]["reused"] += 1
+    return client
+
+
+def s3_transfer_config():
+    """Shared S3 TransferConfig (multipart threshold/chunk size, concurrency)."""
+    global _transfer_config
+    if _transfer_config is None:
+        from boto3.s3.transfer import TransferConfig
+
+        _transfer_config = TransferConfig(
+            multipart_threshold=config.S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=config.S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=config.S3_MAX_CONCURRENCY,
+        )
+    return _transfer_config
+
+
+def client_stats():
+    """Per-service counts of clients created vs. reused in this process."""
+    with _lock:
+        return {service: dict(counts) for service, counts in _stats.items()}
+
+
+def _reset_after_fork():
+    global _session, _clients, _stats, _lock
+    _session = None
+    _clients = {}
+    _stats = {}
+    _lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
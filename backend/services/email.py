@@ -25,7 +25,7 @@ Local development:
     instead of being sent via SES. No AWS account needed for development.
 """
 
-import boto3
+from services.aws import get_client
 import config
 
 
@@ -60,7 +60,7 @@ def _log_email(name, email, message):
 
 def _send_via_ses(name, email, message):
     """Send the contact form email via AWS SES."""
-    ses_client = boto3.client("ses", region_name=config.AWS_REGION)
+    ses_client = get_client("ses")
 
     subject = f"Portfolio Contact: Message from {name}"
     body = f"Name: {name}\nEmail: {email}\n\nMessage:\n{message}"
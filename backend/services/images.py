@@ -0,0 +1,169 @@
+"""
+Image Processing — Responsive Variants for Uploaded Screenshots
+
+What it does:
+    After an admin uploads a project screenshot, a background worker pool
+    produces resized copies (IMAGE_VARIANT_WIDTHS, e.g. 320/640/1280 px wide)
+    in modern formats (WebP, AVIF), with EXIF/ICC metadata stripped. The
+    copies are stored next to the original — in S3 or LOCAL_UPLOAD_DIR —
+    as <name>-<width>w-<hash>.<ext>, and a srcset string per format is
+    recorded in the image_variants table, keyed by the original's URL.
+
+Why it's used here:
+    - The Projects page would otherwise ship the full-size upload (up to
+      5 MB) to every visitor, phones included
+    - Encoding runs off the request path, so the upload request returns as
+      soon as the original is stored (with BACKGROUND_THREADS=false, the
+      default on Vercel, it runs inline instead: a frozen serverless
+      instance would never finish it)
+    - The projects API joins image_variants on image_url, so each project
+      exposes a srcset-ready map once processing finishes
+
+Requirements:
+    Pillow (AVIF needs a Pillow build with libavif — the official wheels
+    from 11.3 on include it). Formats Pillow can't encode are skipped.
+"""
+
+import hashlib
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from psycopg2.extras import Json
+from cache import invalidate
+from db import get_db
+from services.s3 import store_bytes
+import config
+
+# Animated GIFs would lose their animation, so they're served as uploaded
+_PROCESSABLE_TYPES = {"image/jpeg", "image/png", "image/webp"}
+
+_FORMATS = {
+    # format key -> (Pillow format, extension, MIME type, save options)
+    "webp": ("WEBP", "webp", "image/webp", {"quality": 80, "method": 6}),
+    "avif": ("AVIF", "avif", "image/avif", {"quality": 60}),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=config.IMAGE_WORKERS, thread_name_prefix="image-variants",
+                )
+    return _executor
+
+
+def _reset_after_fork():
+    # Worker threads don't survive fork; the child starts its own pool on demand
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def schedule_variants(source_url, data, content_type):
+    """
+    Queue variant generation for an uploaded image and return immediately
+    (or, without background threads, generate the variants before returning).
+
+    Args:
+        source_url: The URL returned for the stored original
+        data: The original file's bytes, or a callable returning them
+            (called in the worker, e.g. to fetch a direct upload from S3)
+        content_type: The original's MIME type
+    """
+    if not config.IMAGE_VARIANTS_ENABLED or content_type not in _PROCESSABLE_TYPES:
+        return None
+    if not config.BACKGROUND_THREADS:
+        return _process(source_url, data)
+    return _get_executor().submit(_process, source_url, data)
+
+
+def _process(source_url, data):
+    try:
+        # Uploads are content-addressed, so a re-upload maps to the same URL
+        if _already_processed(source_url):
+            return
+        if callable(data):
+            data = data()
+        variants = generate_variants(source_url, data)
+        if variants:
+            _record(source_url, variants)
+    except Exception as e:
+        # Usually runs in a worker thread — nobody is waiting on the result
+        print(f"Warning: Failed to generate image variants for {source_url}: {e}")
+
+
+def generate_variants(source_url, data):
+    """
+    Encode and store every configured width/format of an image.
+
+    Returns a map of format -> srcset string, e.g.
+        {"webp": "/uploads/ab12-320w-9f86d081884c.webp 320w, ..."}
+    """
+    from PIL import Image, ImageOps
+
+    stem = os.path.splitext(os.path.basename(source_url))[0]
+
+    with Image.open(io.BytesIO(data)) as original:
+        # Bake the EXIF orientation into the pixels before the EXIF is dropped
+        image = ImageOps.exif_transpose(original)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+
+        # Never upscale: widths beyond the original collapse to the original width
+        widths = sorted({min(w, image.width) for w in config.IMAGE_VARIANT_WIDTHS})
+
+        variants = {}
+        for key in config.IMAGE_VARIANT_FORMATS:
+            pil_format, ext, mime, options = _FORMATS[key]
+            entries = []
+            for width in widths:
+                height = max(1, round(image.height * width / image.width))
+                resized = image if width == image.width else image.resize(
+                    (width, height), Image.Resampling.LANCZOS,
+                )
+                buffer = io.BytesIO()
+                try:
+                    # No exif= / icc_profile= arguments, so no metadata is written
+                    resized.save(buffer, pil_format, **options)
+                except (KeyError, OSError):
+                    # This Pillow build can't encode the format — skip it
+                    break
+                encoded = buffer.getvalue()
+                # Variant names carry their own hash too: a change to the
+                # widths or encoder settings must not reuse an immutable URL
+                digest = hashlib.sha256(encoded).hexdigest()[:12]
+                url = store_bytes(f"{stem}-{width}w-{digest}.{ext}", encoded, mime)
+                entries.append(f"{url} {width}w")
+            else:
+                variants[key] = ", ".join(entries)
+
+    return variants
+
+
+def _already_processed(source_url):
+    with get_db() as (conn, cur):
+        cur.execute("SELECT 1 FROM image_variants WHERE source_url = %s", (source_url,))
+        return cur.fetchone() is not None
+
+
+def _record(source_url, variants):
+    with get_db() as (conn, cur):
+        # -- Demonstrates: UPSERT with a JSONB column
+        # -- Purpose: Remember the variants generated for an uploaded image
+        cur.execute("""
+            INSERT INTO image_variants (source_url, variants)
+            VALUES (%s, %s)
+            ON CONFLICT (source_url) DO UPDATE
+                SET variants = EXCLUDED.variants,
+                    created_at = CURRENT_TIMESTAMP
+        """, (source_url, Json(variants)))
+    invalidate("image_variants")
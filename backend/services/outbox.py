@@ -0,0 +1,195 @@
+"""
+Email Outbox — Durable, Asynchronous Contact Notifications
+
+What it does:
+    Instead of calling SES inside the /api/contact request, the route writes
+    the notification into the email_outbox table in the same transaction as
+    the contact_messages row. A background sender thread in each worker
+    process drains the outbox in batches and delivers each email via
+    services/email.py.
+
+Why it's used here:
+    - The endpoint returns as soon as the row is committed; a slow SES
+      region no longer holds a gunicorn worker
+    - Delivery survives restarts and crashes: undelivered rows stay in the
+      table until a sender picks them up
+    - Failures are retried with exponential backoff; after
+      OUTBOX_MAX_ATTEMPTS the row is marked 'dead' (a dead letter) and can
+      be inspected and retried from the admin API
+
+How claiming works:
+    A sender claims a batch with SELECT ... FOR UPDATE SKIP LOCKED and
+    pushes each row's next_attempt_at forward by OUTBOX_LEASE seconds before
+    committing. Other workers skip those rows, and if the sender dies
+    mid-batch the lease simply expires and the rows become due again. Once
+    half the lease has passed, the rows still waiting in the batch are
+    leased again before the next send, so a slow SES never lets another
+    sender claim (and send) an email that is still queued here.
+
+Without background threads (BACKGROUND_THREADS=false, the default on
+Vercel) there is no sender thread: drain() runs from a scheduler through
+`flask --app app outbox-drain` or /api/outbox/drain, or, with
+OUTBOX_DRAIN_INLINE=true, wake() sends one due batch inside the request.
+"""
+
+import threading
+import time
+import click
+from flask.cli import with_appcontext
+from psycopg2.extras import Json
+from db import get_db
+from services.email import send_contact_email
+import config
+
+_thread = None
+_lock = threading.Lock()
+_wakeup = threading.Event()
+
+
+def enqueue_contact_email(cur, contact_message_id, name, email, message):
+    """
+    Queue a contact notification using the caller's cursor, so the outbox
+    row commits (or rolls back) together with the contact message.
+    """
+    # -- Demonstrates: INSERT with a JSONB payload
+    # -- Purpose: Record an email to send, atomically with the message itself
+    cur.execute("""
+        INSERT INTO email_outbox (contact_message_id, payload)
+        VALUES (%s, %s)
+    """, (contact_message_id, Json({"name": name, "email": email, "message": message})))
+
+
+def wake():
+    """Ask this process's sender to look at the outbox now."""
+    if config.OUTBOX_DRAIN_INLINE and not config.BACKGROUND_THREADS:
+        # No sender thread, and asked to send before returning (opt-in)
+        try:
+            drain_once()
+        except Exception as e:
+            print(f"Warning: Email outbox drain failed: {e}")
+        return
+    _wakeup.set()
+
+
+def ensure_started():
+    """Start this process's sender thread if it isn't running yet."""
+    global _thread
+    if not config.OUTBOX_SENDER_ENABLED:
+        return
+    if _thread is not None and _thread.is_alive():
+        return
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _thread = threading.Thread(target=_send_forever, name="email-outbox", daemon=True)
+        _thread.start()
+
+
+def _send_forever():
+    while True:
+        try:
+            drain()
+        except Exception as e:
+            print(f"Warning: Email outbox drain failed: {e}")
+        _wakeup.wait(config.OUTBOX_POLL_INTERVAL)
+        _wakeup.clear()
+
+
+def drain():
+    """Send every due email, batch by batch. Returns how many were attempted."""
+    attempted = 0
+    while True:
+        count = drain_once()
+        attempted += count
+        # Keep going while full batches come back — there may be more due
+        if count < config.OUTBOX_BATCH_SIZE:
+            return attempted
+
+
+def drain_once():
+    """Claim, send and settle one batch of due emails. Returns the batch size."""
+    with get_db() as (conn, cur):
+        # -- Demonstrates: UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED)
+        # -- Purpose: Lease a batch of due emails without blocking other senders
+        cur.execute("""
+            UPDATE email_outbox
+            SET attempts = attempts + 1,
+                next_attempt_at = CURRENT_TIMESTAMP + %s * INTERVAL '1 second'
+            WHERE id IN (
+                SELECT id
+                FROM email_outbox
+                WHERE status = 'pending'
+                  AND next_attempt_at <= CURRENT_TIMESTAMP
+                ORDER BY next_attempt_at, id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, payload, attempts
+        """, (config.OUTBOX_LEASE, config.OUTBOX_BATCH_SIZE))
+        batch = cur.fetchall()
+
+    if not batch:
+        return 0
+
+    sent, failed = [], []
+    leased_at = time.monotonic()
+    for position, row in enumerate(batch):
+        if time.monotonic() - leased_at > config.OUTBOX_LEASE / 2:
+            _renew_lease([r["id"] for r in batch[position:]])
+            leased_at = time.monotonic()
+        try:
+            send_contact_email(**row["payload"])
+            sent.append(row["id"])
+        except Exception as e:
+            failed.append((row["id"], row["attempts"], str(e)[:1000]))
+
+    _settle(sent, failed)
+    return len(batch)
+
+
+def _renew_lease(ids):
+    with get_db() as (conn, cur):
+        # -- Purpose: Keep the rest of a claimed batch reserved while it sends
+        cur.execute("""
+            UPDATE email_outbox
+            SET next_attempt_at = CURRENT_TIMESTAMP + %s * INTERVAL '1 second'
+            WHERE id = ANY(%s)
+        """, (config.OUTBOX_LEASE, ids))
+
+
+def _settle(sent, failed):
+    with get_db() as (conn, cur):
+        if sent:
+            cur.execute("""
+                UPDATE email_outbox
+                SET status = 'sent', sent_at = CURRENT_TIMESTAMP, last_error = NULL
+                WHERE id = ANY(%s)
+            """, (sent,))
+
+        if failed:
+            ids = [f[0] for f in failed]
+            delays = [
+                min(config.OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1), config.OUTBOX_BACKOFF_MAX)
+                for _, attempts, _ in failed
+            ]
+            errors = [f[2] for f in failed]
+            # -- Demonstrates: UPDATE ... FROM unnest() — one statement for many rows
+            # -- Purpose: Reschedule failed sends with backoff, or dead-letter them
+            cur.execute("""
+                UPDATE email_outbox o
+                SET status = CASE WHEN o.attempts >= %s THEN 'dead' ELSE 'pending' END,
+                    next_attempt_at = CURRENT_TIMESTAMP + f.delay * INTERVAL '1 second',
+                    last_error = f.error
+                FROM unnest(%s::int[], %s::float8[], %s::text[]) AS f(id, delay, error)
+                WHERE o.id = f.id
+            """, (config.OUTBOX_MAX_ATTEMPTS, ids, delays, errors))
+
+    for message_id, attempts, error in failed:
+        print(f"Warning: Outbox email {message_id} failed (attempt {attempts}): {error}")
+
+
+@click.command("outbox-drain")
+@with_appcontext
+def drain_command():
+    """Send every due contact email (for cron when BACKGROUND_THREADS is off)."""
+    click.echo(f"Attempted {drain()} email(s)")
@@ -26,20 +26,90 @@ How to set it up:
        }
     5. Set S3_BUCKET and USE_LOCAL_STORAGE=false in your .env file
     6. Ensure your AWS credentials are configured (aws configure or IAM role)
+    7. For direct browser uploads (presigned POST), add a CORS rule allowing
+       POST from FRONTEND_URL:
+       [{"AllowedOrigins": ["https://your-site"], "AllowedMethods": ["POST"],
+         "AllowedHeaders": ["*"]}]
+
+Direct uploads:
+    presign_upload() issues a presigned POST policy so the admin browser
+    sends the file straight to S3; the policy pins the object key, the
+    Content-Type and the allowed size range, so S3 itself rejects anything
+    else. verify_upload() then checks the stored object (HEAD) before the
+    API records it.
+
+Content-addressed names:
+    Every upload is stored under the SHA-256 of its bytes (computed while
+    streaming, e.g. "3a7bd3e2…c1.png"). Re-uploading the same image finds
+    the existing object and skips the write, and because a name can never
+    point at different content, objects are stored with
+    "Cache-Control: public, max-age=31536000, immutable" so browsers and
+    CDNs keep them for a year without revalidating.
 
 Local development:
     When USE_LOCAL_STORAGE=true (default), files are saved to a local
     directory instead of S3. No AWS account needed for development.
 """
 
+import base64
+import hashlib
+import hmac
 import os
-import uuid
-import boto3
-from werkzeug.utils import secure_filename
+import tempfile
+import time
+from services.aws import get_client, s3_transfer_config
 import config
 
 _ALLOWED_MIME_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
 _MAX_FILE_SIZE = 5 * 1024 * 1024  # 5 MB
+_EXTENSIONS = {"image/jpeg": ".jpg", "image/png": ".png", "image/gif": ".gif", "image/webp": ".webp"}
+_HASH_CHUNK_SIZE = 64 * 1024
+
+# Content-addressed objects never change, so they can be cached forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Error codes of a HEAD on a missing key. Without s3:ListBucket on the bucket,
+# S3 answers 403 rather than 404 for a key that doesn't exist
+_MISSING_CODES = ("404", "NoSuchKey", "NotFound", "403", "AccessDenied", "Forbidden")
+
+
+def content_key(digest, content_type):
+    """Object name for content with SHA-256 `digest` (hex)."""
+    return f"{digest}{_EXTENSIONS[content_type]}"
+
+
+def _hash_stream(stream):
+    """SHA-256 (hex) and size of a stream, read in chunks; rewinds it after."""
+    sha256 = hashlib.sha256()
+    size = 0
+    for chunk in iter(lambda: stream.read(_HASH_CHUNK_SIZE), b""):
+        size += len(chunk)
+        if size > _MAX_FILE_SIZE:
+            raise ValueError("File exceeds the 5 MB maximum size")
+        sha256.update(chunk)
+    stream.seek(0)
+    return sha256.hexdigest(), size
+
+
+def _public_url(key):
+    if config.USE_LOCAL_STORAGE:
+        return f"/uploads/{key}"
+    return f"https://{config.S3_BUCKET}.s3.{config.AWS_REGION}.amazonaws.com/{key}"
+
+
+def _exists(key):
+    """True if an object named `key` is already stored."""
+    if config.USE_LOCAL_STORAGE:
+        return os.path.exists(os.path.join(config.LOCAL_UPLOAD_DIR, key))
+    client = get_client("s3")
+    try:
+        client.head_object(Bucket=config.S3_BUCKET, Key=key)
+    except client.exceptions.ClientError as e:
+        # Only used to skip redundant writes — when unsure, write again
+        if e.response["Error"]["Code"] in _MISSING_CODES:
+            return False
+        raise
+    return True
 
 
 def upload_file(file):
@@ -58,16 +128,14 @@ def upload_file(file):
     if file.content_type not in _ALLOWED_MIME_TYPES:
         raise ValueError("File type not allowed. Accepted: JPEG, PNG, GIF, WebP")
 
-    file.stream.seek(0, 2)
-    size = file.stream.tell()
-    file.stream.seek(0)
-    if size > _MAX_FILE_SIZE:
-        raise ValueError("File exceeds the 5 MB maximum size")
+    digest, size = _hash_stream(file.stream)
+    if size == 0:
+        raise ValueError("File is empty")
 
-    # Generate a unique filename to avoid collisions
-    ext = os.path.splitext(file.filename)[1]
-    filename = f"{uuid.uuid4().hex}{ext}"
-    filename = secure_filename(filename)
+    # Same bytes, same name — an identical earlier upload is reused as is
+    filename = content_key(digest, file.content_type)
+    if _exists(filename):
+        return _public_url(filename)
 
     if config.USE_LOCAL_STORAGE:
         return _save_locally(file, filename)
@@ -75,30 +143,243 @@ def upload_file(file):
         return _upload_to_s3(file, filename)
 
 
-def _save_locally(file, filename):
-    """Save file to local uploads directory (for development)."""
+def _write_locally(filename, write):
+    """
+    Create `filename` in the local uploads directory by calling write(f).
+
+    The content goes to a temporary file in the same directory that is then
+    renamed into place, so _exists() and readers of a content-addressed
+    name never see a partly written file.
+    """
     upload_dir = config.LOCAL_UPLOAD_DIR
     os.makedirs(upload_dir, exist_ok=True)
 
-    filepath = os.path.join(upload_dir, filename)
-    file.save(filepath)
+    fd, tmp = tempfile.mkstemp(dir=upload_dir, prefix=".tmp-")
+    try:
+        # mkstemp creates 0600; keep uploads readable by a front proxy
+        os.chmod(tmp, 0o644)
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, os.path.join(upload_dir, filename))
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _save_locally(file, filename):
+    """Save file to local uploads directory (for development)."""
+    _write_locally(filename, file.save)
 
     # Return a local URL that Flask can serve
     return f"/uploads/{filename}"
 
 
+def store_bytes(filename, data, content_type):
+    """
+    Store generated content (e.g. a resized image variant) next to the
+    uploads, in S3 or the local uploads directory. The caller chooses the
+    name and must make it unique per content — the object is served as
+    immutable — and an existing object of that name is left untouched.
+
+    Returns:
+        The public URL where the content can be accessed
+    """
+    if _exists(filename):
+        return _public_url(filename)
+
+    if config.USE_LOCAL_STORAGE:
+        _write_locally(filename, lambda f: f.write(data))
+        return _public_url(filename)
+
+    get_client("s3").put_object(
+        Bucket=config.S3_BUCKET,
+        Key=filename,
+        Body=data,
+        ContentType=content_type,
+        CacheControl=IMMUTABLE_CACHE_CONTROL,
+    )
+    return _public_url(filename)
+
+
 def _upload_to_s3(file, filename):
     """Upload file to AWS S3 and return the public URL."""
-    s3_client = boto3.client("s3", region_name=config.AWS_REGION)
-
-    s3_client.upload_fileobj(
+    get_client("s3").upload_fileobj(
         file,
         config.S3_BUCKET,
         filename,
         ExtraArgs={
             "ContentType": file.content_type,
+            "CacheControl": IMMUTABLE_CACHE_CONTROL,
         },
+        Config=s3_transfer_config(),
     )
 
     # Return the public S3 URL
     return f"https://{config.S3_BUCKET}.s3.{config.AWS_REGION}.amazonaws.com/{filename}"
+
+
+# ---------------------------------------------------------------------------
+# Direct uploads — presigned POST policies
+# ---------------------------------------------------------------------------
+
+def presign_upload(content_type, size, sha256, local_upload_url):
+    """
+    Create a presigned POST for uploading one image straight to storage.
+
+    Args:
+        content_type: The MIME type the browser will send
+        size: The file size the browser reports, in bytes
+        sha256: Hex SHA-256 of the file, computed by the browser; it names
+            the object, and S3 rejects an upload whose bytes don't match it
+        local_upload_url: Where the form goes in local-storage mode
+
+    Returns:
+        {"url", "fields", "key", "exists"} — the browser POSTs
+        multipart/form-data to `url` with every entry of `fields` followed
+        by a "file" field. When `exists` is true the same content is already
+        stored, `url`/`fields` are omitted and the upload can be skipped.
+
+    Raises:
+        ValueError: if the file type, size or hash is not allowed
+    """
+    if content_type not in _ALLOWED_MIME_TYPES:
+        raise ValueError("File type not allowed. Accepted: JPEG, PNG, GIF, WebP")
+    if not 0 < size <= _MAX_FILE_SIZE:
+        raise ValueError("File exceeds the 5 MB maximum size")
+    if not _is_sha256(sha256):
+        raise ValueError("sha256 must be 64 lowercase hex characters")
+
+    key = content_key(sha256, content_type)
+    if _exists(key):
+        return {"key": key, "exists": True}
+
+    if config.USE_LOCAL_STORAGE:
+        expires = int(time.time()) + config.UPLOAD_PRESIGN_EXPIRES
+        fields = {"key": key, "Content-Type": content_type, "expires": str(expires)}
+        fields["signature"] = _local_signature(key, content_type, expires)
+        return {"url": local_upload_url, "fields": fields, "key": key, "exists": False}
+
+    checksum = base64.b64encode(bytes.fromhex(sha256)).decode()
+    fields = {
+        "Content-Type": content_type,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+        "x-amz-checksum-algorithm": "SHA256",
+        "x-amz-checksum-sha256": checksum,
+    }
+    post = get_client("s3").generate_presigned_post(
+        Bucket=config.S3_BUCKET,
+        Key=key,
+        Fields=fields,
+        Conditions=[{name: value} for name, value in fields.items()] + [
+            ["content-length-range", 1, _MAX_FILE_SIZE],
+        ],
+        ExpiresIn=config.UPLOAD_PRESIGN_EXPIRES,
+    )
+    return {"url": post["url"], "fields": post["fields"], "key": key, "exists": False}
+
+
+def _is_sha256(value):
+    return (
+        isinstance(value, str)
+        and len(value) == 64
+        and all(c in "0123456789abcdef" for c in value)
+    )
+
+
+def is_upload_key(key):
+    """True if `key` has the shape presign_upload() generates."""
+    stem, ext = os.path.splitext(key)
+    return _is_sha256(stem) and ext in _EXTENSIONS.values()
+
+
+def verify_upload(key):
+    """
+    Check a directly uploaded object and describe it.
+
+    Returns:
+        {"key", "url", "content_type", "size"}
+
+    Raises:
+        LookupError: if nothing was stored under `key`
+        ValueError: if the stored object isn't an allowed image
+    """
+    if not is_upload_key(key):
+        raise ValueError("Invalid upload key")
+
+    if config.USE_LOCAL_STORAGE:
+        try:
+            size = os.path.getsize(os.path.join(config.LOCAL_UPLOAD_DIR, key))
+        except FileNotFoundError:
+            raise LookupError("Upload not found") from None
+        content_type = next(t for t, ext in _EXTENSIONS.items() if key.endswith(ext))
+    else:
+        client = get_client("s3")
+        try:
+            head = client.head_object(Bucket=config.S3_BUCKET, Key=key, ChecksumMode="ENABLED")
+        except client.exceptions.ClientError as e:
+            if e.response["Error"]["Code"] in _MISSING_CODES:
+                raise LookupError("Upload not found") from None
+            raise
+        size = head["ContentLength"]
+        content_type = head["ContentType"]
+        expected = base64.b64encode(bytes.fromhex(os.path.splitext(key)[0])).decode()
+        if head.get("ChecksumSHA256", expected) != expected:
+            raise ValueError("Stored object does not match its SHA-256")
+
+    # The policy already enforced these; checked again in case it didn't apply
+    if content_type not in _ALLOWED_MIME_TYPES or _EXTENSIONS[content_type] != os.path.splitext(key)[1]:
+        raise ValueError("Stored object has an unexpected content type")
+    if not 0 < size <= _MAX_FILE_SIZE:
+        raise ValueError("Stored object exceeds the 5 MB maximum size")
+
+    return {"key": key, "url": _public_url(key), "content_type": content_type, "size": size}
+
+
+def read_upload(key):
+    """Return the bytes of a stored upload."""
+    if config.USE_LOCAL_STORAGE:
+        with open(os.path.join(config.LOCAL_UPLOAD_DIR, key), "rb") as f:
+            return f.read()
+    return get_client("s3").get_object(Bucket=config.S3_BUCKET, Key=key)["Body"].read()
+
+
+# ---------------------------------------------------------------------------
+# Local stand-in for presigned POSTs (USE_LOCAL_STORAGE=true)
+# ---------------------------------------------------------------------------
+
+def _local_signature(key, content_type, expires):
+    message = f"{key}\n{content_type}\n{expires}".encode()
+    return hmac.new(config.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def save_local_upload(form, file):
+    """
+    Accept a form built from presign_upload() in local-storage mode,
+    enforcing the same rules S3 applies to a presigned POST policy.
+
+    Raises:
+        PermissionError: if the signature is invalid or has expired
+        ValueError: if the file doesn't match the policy
+    """
+    key = form.get("key", "")
+    content_type = form.get("Content-Type", "")
+    expires = form.get("expires", "")
+    signature = form.get("signature", "")
+
+    if not expires.isdigit() or not hmac.compare_digest(
+        signature, _local_signature(key, content_type, expires)
+    ):
+        raise PermissionError("Invalid upload signature")
+    if int(expires) < time.time():
+        raise PermissionError("Upload policy has expired")
+    if not is_upload_key(key):
+        raise ValueError("Invalid upload key")
+
+    data = file.stream.read(_MAX_FILE_SIZE + 1)
+    if not 0 < len(data) <= _MAX_FILE_SIZE:
+        raise ValueError("File size is outside the allowed range")
+    # S3 checks x-amz-checksum-sha256; the local key *is* the checksum
+    if hashlib.sha256(data).hexdigest() != os.path.splitext(key)[0]:
+        raise ValueError("File content does not match its SHA-256")
+
+    _write_locally(key, lambda f: f.write(data))
@@ -0,0 +1,296 @@
+"""
+Static JSON snapshots of the public API.
+
+The public dataset is small and changes only when the admin edits it, so
+every public GET endpoint can be rendered ahead of time into static files
+that a CDN (or the Vercel frontend) serves without touching Flask or RDS.
+
+Each response is written as <name>.<content-hash>.json next to
+precompressed .json.gz and .json.br copies (brotli only when the Brotli
+package is installed). Content-hashed names can be cached forever; the
+fixed-name manifest.json maps every API path to its current file, e.g.
+
+    "/api/projects?featured=true": {"file": "projects_featured_true.3f1c….json", ...}
+
+Usage:
+    flask --app app snapshot                    # full export into SNAPSHOT_DIR
+    flask --app app snapshot --out DIR          # export somewhere else
+    flask --app app snapshot --only posts       # re-render one family
+
+With SNAPSHOT_ON_WRITE=true, successful admin writes re-render just the
+endpoint families built from the tables they changed, in a background
+thread, and files no longer referenced by the manifest are removed. With
+BACKGROUND_THREADS=false (the default on Vercel) the write's response
+waits for the re-render instead.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime, timezone
+from urllib.parse import quote
+import click
+from flask import current_app, g
+from flask.cli import with_appcontext
+from pagination import NEXT_CURSOR_HEADER
+import config
+
+try:
+    import fcntl
+except ImportError:  # Windows — fall back to in-process locking only
+    fcntl = None
+
+MANIFEST = "manifest.json"
+
+# <stem>.<16 hex>.json[.gz|.br] — the only names export() writes, and prunes
+_SNAPSHOT_FILE = re.compile(r"[A-Za-z0-9_]+\.[0-9a-f]{16}\.json(\.gz|\.br)?")
+
+
+# ---------------------------------------------------------------------------
+# Endpoint families — each renders a group of paths built from the same tables
+# ---------------------------------------------------------------------------
+
+def _projects(render):
+    for project in render("/api/projects").get_json():
+        render(f"/api/projects/{project['id']}")
+    render("/api/projects?featured=true")
+
+
+def _tags(render):
+    render("/api/tags")
+
+
+def _posts(render):
+    path = "/api/posts"
+    while path:
+        page = render(path)
+        for post in page.get_json():
+            render(f"/api/posts/{quote(post['slug'], safe='')}")
+        cursor = page.headers.get(NEXT_CURSOR_HEADER)
+        path = f"/api/posts?cursor={cursor}" if cursor else None
+
+
+def _interests(render):
+    render("/api/interests")
+
+
+def _bootstrap(render):
+    # The full bundle plus the exact variants the Home and Projects pages request
+    render("/api/bootstrap")
+    render("/api/bootstrap?featured=true&include=projects,tags")
+    render("/api/bootstrap?include=projects")
+
+
+_FAMILIES = {
+    "projects": (("projects", "project_tags", "tags", "image_variants"), _projects),
+    "tags": (("tags", "project_tags"), _tags),
+    "posts": (("posts",), _posts),
+    "interests": (("interests",), _interests),
+    "bootstrap": (("projects", "project_tags", "tags", "interests", "image_variants"), _bootstrap),
+}
+
+
+def families_for(tables):
+    """Names of the families built from any of `tables`."""
+    tables = set(tables)
+    return [name for name, (deps, _) in _FAMILIES.items() if tables & set(deps)]
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+_lock = threading.Lock()
+
+
+def _file_stem(path):
+    """'/api/projects?featured=true' -> 'projects_featured_true'."""
+    stem = re.sub(r"[^A-Za-z0-9]+", "_", path.removeprefix("/api/")).strip("_")
+    return stem[:120] or "index"
+
+
+def _atomic_write(path, data):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _write_variants(out_dir, filename, body):
+    """Write body + precompressed copies unless that content already exists."""
+    target = os.path.join(out_dir, filename)
+    encodings = ["gzip"]
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+    else:
+        encodings.append("br")
+
+    if not os.path.exists(target):
+        _atomic_write(target + ".gz", gzip.compress(body, compresslevel=9, mtime=0))
+        if brotli is not None:
+            _atomic_write(target + ".br", brotli.compress(body, quality=11))
+        # Written last: its presence means the whole set is complete
+        _atomic_write(target, body)
+    return encodings
+
+
+def _load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"files": {}}
+
+
+def _prune(out_dir, manifest):
+    """
+    Delete snapshot files the manifest no longer references.
+
+    Only names export() generates are considered, so other files in the
+    output directory (vercel.json, package.json, ...) are never touched.
+    """
+    keep = {entry["file"] for entry in manifest["files"].values()}
+    for name in os.listdir(out_dir):
+        if not _SNAPSHOT_FILE.fullmatch(name):
+            continue
+        if name.removesuffix(".gz").removesuffix(".br") not in keep:
+            os.unlink(os.path.join(out_dir, name))
+
+
+def export(app, out_dir, families=None):
+    """
+    Render `families` (default: all) into `out_dir` and update the manifest.
+
+    Entries of families that aren't re-rendered are kept as they are.
+    Returns the new manifest.
+    """
+    families = list(families or _FAMILIES)
+    os.makedirs(out_dir, exist_ok=True)
+
+    with _lock, open(os.path.join(out_dir, ".lock"), "w") as lock_file:
+        if fcntl is not None:
+            # Serialize with exports running in other worker processes
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+        manifest = _load_manifest(out_dir)
+        files = {
+            path: entry for path, entry in manifest["files"].items()
+            if entry.get("family") not in families
+        }
+
+        client = app.test_client()
+        for family in families:
+            def render(path):
+                response = client.get(path)
+                if response.status_code != 200:
+                    raise RuntimeError(f"GET {path} returned {response.status_code}")
+                body = response.get_data()
+                digest = hashlib.sha256(body).hexdigest()
+                filename = f"{_file_stem(path)}.{digest[:16]}.json"
+                files[path] = {
+                    "file": filename,
+                    "sha256": digest,
+                    "bytes": len(body),
+                    "encodings": _write_variants(out_dir, filename, body),
+                    "family": family,
+                    "next_cursor": response.headers.get(NEXT_CURSOR_HEADER),
+                }
+                return response
+
+            _FAMILIES[family][1](render)
+
+        manifest = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "files": dict(sorted(files.items())),
+        }
+        _atomic_write(
+            os.path.join(out_dir, MANIFEST),
+            json.dumps(manifest, indent=2).encode(),
+        )
+        _prune(out_dir, manifest)
+
+    return manifest
+
+
+# ---------------------------------------------------------------------------
+# Incremental regeneration after admin writes
+# ---------------------------------------------------------------------------
+
+_pending = set()
+_pending_cond = threading.Condition()
+_worker = None
+
+
+def _regenerate_forever(app):
+    while True:
+        with _pending_cond:
+            while not _pending:
+                _pending_cond.wait()
+            families = sorted(_pending)
+            _pending.clear()
+        _export_logged(app, families)
+
+
+def _export_logged(app, families):
+    try:
+        export(app, config.SNAPSHOT_DIR, families)
+    except Exception as e:
+        print(f"Warning: Snapshot regeneration failed for {families}: {e}")
+
+
+def schedule(app, tables):
+    """Queue re-rendering of the families built from `tables`."""
+    global _worker
+    families = families_for(tables)
+    if not families:
+        return
+    if not config.BACKGROUND_THREADS:
+        # A frozen serverless instance would never run a queued export. It
+        # renders through the test client, so run it on a thread of its own
+        # (no request context of ours) and wait for it
+        worker = threading.Thread(
+            target=_export_logged, args=(app, families), name="snapshot",
+        )
+        worker.start()
+        worker.join()
+        return
+    with _pending_cond:
+        _pending.update(families)
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(
+                target=_regenerate_forever, args=(app,), name="snapshot", daemon=True,
+            )
+            _worker.start()
+        _pending_cond.notify()
+
+
+def regenerate_after_write(response):
+    """after_request hook: re-render snapshots touched by a successful write."""
+    tables = g.get("invalidated_tables")
+    if config.SNAPSHOT_ON_WRITE and tables and response.status_code < 400:
+        schedule(current_app._get_current_object(), tables)
+    return response
+
+
+@click.command("snapshot")
+@click.option("--out", default=None, help="Output directory (default: SNAPSHOT_DIR).")
+@click.option(
+    "--only", multiple=True, type=click.Choice(sorted(_FAMILIES)),
+    help="Re-render only these endpoint families (repeatable).",
+)
+@with_appcontext
+def snapshot_command(out, only):
+    """Export every public API endpoint as static, precompressed JSON."""
+    out_dir = out or config.SNAPSHOT_DIR
+    manifest = export(current_app._get_current_object(), out_dir, only or None)
+    click.echo(f"Wrote {len(manifest['files'])} endpoints to {out_dir}/{MANIFEST}")
@@ -0,0 +1,152 @@
+"""
+Serving locally stored uploads (USE_LOCAL_STORAGE=true).
+
+In local-storage deployments the API process also serves /uploads/*, so
+this keeps that path as cheap as possible:
+
+    - Content-addressed files (named by their SHA-256, see services/s3.py)
+      get that hash as a strong ETag and an immutable, year-long
+      Cache-Control; anything else gets UPLOAD_CACHE_MAX_AGE
+    - Conditional requests (If-None-Match / If-Modified-Since) and Range
+      requests are answered with 304 / 206
+    - A browser that accepts AVIF or WebP asking for an original screenshot
+      gets the largest pre-generated variant in that format (Vary: Accept),
+      found on disk next to the original. Since what such a URL returns
+      changes once variants exist, negotiated responses are cached for
+      UPLOAD_CACHE_MAX_AGE and not marked immutable
+    - A precompressed sibling (<name>.br / <name>.gz) is sent when the
+      client accepts that encoding (Vary: Accept-Encoding)
+    - With UPLOAD_OFFLOAD set, Python only picks the file and the front
+      proxy sends it: "x-sendfile" (Apache mod_xsendfile, lighttpd) or
+      "x-accel-redirect" (nginx, with an `internal` location mapping
+      UPLOAD_ACCEL_PREFIX onto LOCAL_UPLOAD_DIR)
+"""
+
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+from flask import abort, current_app, request, send_from_directory
+from werkzeug.security import safe_join
+from services.s3 import IMMUTABLE_CACHE_CONTROL
+import config
+
+# <sha256>.<ext> originals and <sha256>-<width>w-<hash>.<ext> variants
+_CONTENT_ADDRESSED = re.compile(r"^(?P<hash>[0-9a-f]{64}(?:-\d+w-[0-9a-f]{12})?)\.\w+$")
+_ORIGINAL = re.compile(r"^[0-9a-f]{64}\.\w+$")
+
+# Best first — the first one the client names explicitly wins
+_NEGOTIATED_FORMATS = ("avif", "webp")
+_PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+# <sha256>-<width>w-<hash>.<ext> files written by services/images.py
+_VARIANT = re.compile(r"^(?P<stem>[0-9a-f]{64})-(?P<width>\d+)w-[0-9a-f]{12}\.(?P<ext>\w+)$")
+
+# original stem -> {ext: widest variant filename}, valid while the upload
+# directory's mtime (which changes whenever a file is added) stays the same
+_variants = {}
+_variants_mtime = None
+
+
+def _accepts_explicitly(accept, value):
+    """True if `value` is listed with q > 0 (wildcards like */* don't count)."""
+    return any(item == value and quality > 0 for item, quality in accept)
+
+
+def _negotiated_variant(filename):
+    """Name of the best pre-generated variant the client accepts, if any."""
+    if not config.UPLOAD_NEGOTIATE_FORMATS or not _ORIGINAL.match(filename):
+        return None
+
+    wanted = [f for f in _NEGOTIATED_FORMATS if _accepts_explicitly(request.accept_mimetypes, f"image/{f}")]
+    if not wanted:
+        return None
+
+    available = _variants_on_disk(filename.split(".", 1)[0])
+    for key in wanted:
+        if key in available:
+            return available[key]
+    return None
+
+
+def _variants_on_disk(stem):
+    """{ext: widest variant filename} for an original, from the upload directory."""
+    global _variants, _variants_mtime
+    directory = config.LOCAL_UPLOAD_DIR
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except OSError:
+        return {}
+    if mtime != _variants_mtime:
+        _variants, _variants_mtime = {}, mtime
+
+    available = _variants.get(stem)
+    if available is None:
+        widest = {}
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                match = _VARIANT.match(entry.name)
+                if match and match["stem"] == stem:
+                    width = int(match["width"])
+                    if width > widest.get(match["ext"], (0, None))[0]:
+                        widest[match["ext"]] = (width, entry.name)
+        available = _variants[stem] = {ext: name for ext, (_, name) in widest.items()}
+    return available
+
+
+def serve_upload(filename):
+    """Build the response for GET /uploads/<filename>."""
+    directory = config.LOCAL_UPLOAD_DIR
+    path = safe_join(directory, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    vary = []
+    variant = _negotiated_variant(filename)
+    if _ORIGINAL.match(filename) and config.UPLOAD_NEGOTIATE_FORMATS:
+        vary.append("Accept")
+    if variant is not None and os.path.isfile(os.path.join(directory, variant)):
+        filename = variant
+        path = os.path.join(directory, filename)
+
+    served, encoding = filename, None
+    for name, suffix in _PRECOMPRESSED:
+        if os.path.isfile(path + suffix):
+            if "Accept-Encoding" not in vary:
+                vary.append("Accept-Encoding")
+            if encoding is None and name in request.accept_encodings:
+                served, encoding = filename + suffix, name
+
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    match = _CONTENT_ADDRESSED.match(filename)
+    etag = None
+    if match:
+        # The name is the content hash — a strong validator for free
+        etag = match["hash"] + (f"-{encoding}" if encoding else "")
+
+    if config.UPLOAD_OFFLOAD == "x-accel-redirect":
+        # nginx sends the file itself (and handles Range/conditionals)
+        response = current_app.response_class(mimetype=mimetype)
+        response.headers["X-Accel-Redirect"] = (
+            config.UPLOAD_ACCEL_PREFIX.rstrip("/") + "/" + quote(served)
+        )
+        if etag:
+            response.set_etag(etag)
+    else:
+        # Honours USE_X_SENDFILE (UPLOAD_OFFLOAD=x-sendfile); answers
+        # If-None-Match / If-Modified-Since with 304 and Range with 206
+        response = send_from_directory(
+            directory, served, mimetype=mimetype, conditional=True, etag=etag or True,
+        )
+
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    for header in vary:
+        response.vary.add(header)
+    # A negotiated URL can start returning a variant later, so it is not
+    # immutable even though each body it returns is content-addressed
+    response.headers["Cache-Control"] = (
+        IMMUTABLE_CACHE_CONTROL if match and "Accept" not in vary
+        else f"public, max-age={config.UPLOAD_CACHE_MAX_AGE}"
+    )
+    return response
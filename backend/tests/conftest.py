@@ -0,0 +1,47 @@
+"""Shared fixtures: the app, its test client, an admin token and a database check."""
+
+import psycopg2
+import pytest
+import config
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app import create_app
+
+    app = create_app()
+    app.config["TESTING"] = True
+    return app
+
+
+@pytest.fixture
+def client(app):
+    from cache import response_cache
+
+    # Every test starts from an empty response cache
+    response_cache.clear()
+    return app.test_client()
+
+
+@pytest.fixture
+def admin_headers():
+    from routes import admin
+
+    return {"Authorization": f"Bearer {admin._issue_token()}"}
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Skip the test unless the configured database accepts connections."""
+    try:
+        conn = psycopg2.connect(
+            host=config.DB_HOST,
+            port=config.DB_PORT,
+            dbname=config.DB_NAME,
+            user=config.DB_USER,
+            password=config.DB_PASSWORD,
+            connect_timeout=3,
+        )
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"database not reachable: {e}")
+    conn.close()
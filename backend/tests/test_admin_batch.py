@@ -0,0 +1,128 @@
+"""POST /api/admin/batch: operation validation and how failures map to 400 / 404."""
+
+import pytest
+import config
+from routes import admin
+
+_MISSING_ID = 2**31 - 1
+
+
+@pytest.fixture(autouse=True)
+def stateless_tokens(monkeypatch):
+    monkeypatch.setattr(config, "ADMIN_TOKEN_REVOCATION", False)
+
+
+@pytest.mark.parametrize("op", [
+    {"op": "create", "entity": "tags", "data": {"name": "Rust"}},
+    {"op": "create", "entity": "posts", "data": {"title": "T", "content": "C"}},
+    {"op": "create", "entity": "projects", "data": {"title": "T", "tag_ids": [1, 2]}},
+    {"op": "update", "entity": "interests", "id": 3, "data": {"title": "T"}},
+    {"op": "update", "entity": "projects", "id": 1, "data": {}},
+    {"op": "delete", "entity": "posts", "id": 7},
+])
+def test_valid_operations(op):
+    assert admin._check_operation(op) is None
+
+
+@pytest.mark.parametrize("op, error", [
+    (["create"], "Each operation must be an object"),
+    ({"entity": "tags", "data": {"name": "x"}}, 'op must be "create", "update" or "delete"'),
+    ({"op": "upsert", "entity": "tags", "data": {"name": "x"}}, 'op must be "create", "update" or "delete"'),
+    ({"op": "create", "entity": "messages", "data": {}}, "entity must be one of: projects, posts, interests, tags"),
+    ({"op": "delete", "entity": "posts"}, "id must be an integer"),
+    ({"op": "delete", "entity": "posts", "id": "7"}, "id must be an integer"),
+    ({"op": "delete", "entity": "posts", "id": True}, "id must be an integer"),
+    ({"op": "update", "entity": "posts", "id": 1.5, "data": {}}, "id must be an integer"),
+    ({"op": "update", "entity": "posts", "id": 1}, "data must be an object"),
+    ({"op": "create", "entity": "tags", "data": ["Rust"]}, "data must be an object"),
+    ({"op": "create", "entity": "tags", "data": {}}, "Missing required field(s): name"),
+    ({"op": "create", "entity": "posts", "data": {"title": "T", "content": ""}}, "Missing required field(s): content"),
+    ({"op": "create", "entity": "posts", "data": {}}, "Missing required field(s): title, content"),
+    ({"op": "update", "entity": "projects", "id": 1, "data": {"tag_ids": "1,2"}}, "tag_ids must be a list of integers"),
+    ({"op": "create", "entity": "projects", "data": {"title": "T", "tag_ids": [1, "2"]}},
+     "tag_ids must be a list of integers"),
+])
+def test_invalid_operations(op, error):
+    assert admin._check_operation(op) == error
+
+
+@pytest.mark.parametrize("body, error", [
+    (None, "operations must be a non-empty list"),
+    ({}, "operations must be a non-empty list"),
+    ({"operations": []}, "operations must be a non-empty list"),
+    ({"operations": {"op": "delete"}}, "operations must be a non-empty list"),
+    ({"operations": [{"op": "delete", "entity": "posts", "id": 1}] * 501}, "At most 500 operations per batch"),
+])
+def test_malformed_batch_is_rejected(client, admin_headers, body, error):
+    response = client.post("/api/admin/batch", json=body, headers=admin_headers)
+    assert response.status_code == 400
+    assert response.get_json() == {"error": error}
+
+
+def test_invalid_operation_is_reported_by_index(client, admin_headers):
+    # Validated before any database work, so nothing is applied
+    response = client.post("/api/admin/batch", headers=admin_headers, json={"operations": [
+        {"op": "delete", "entity": "posts", "id": 1},
+        {"op": "create", "entity": "tags", "data": {}},
+    ]})
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Missing required field(s): name", "index": 1}
+
+
+# ---------------------------------------------------------------------------
+# Against the database — every batch below fails, so none of it is committed
+# ---------------------------------------------------------------------------
+
+def _tag_names(client):
+    return {tag["name"] for tag in client.get("/api/tags").get_json()}
+
+
+def test_missing_row_is_404(database, client, admin_headers):
+    response = client.post("/api/admin/batch", headers=admin_headers, json={"operations": [
+        {"op": "create", "entity": "tags", "data": {"name": "batch-test-tag"}},
+        {"op": "update", "entity": "posts", "id": _MISSING_ID, "data": {"title": "T", "content": "C"}},
+    ]})
+    assert response.status_code == 404
+    assert response.get_json() == {"error": f"posts {_MISSING_ID} not found", "index": 1}
+    assert "batch-test-tag" not in _tag_names(client)
+
+
+def test_deleting_a_missing_or_already_deleted_row_is_404(database, client, admin_headers):
+    response = client.post("/api/admin/batch", headers=admin_headers, json={"operations": [
+        {"op": "create", "entity": "tags", "data": {"name": "batch-test-tag"}},
+        {"op": "delete", "entity": "tags", "id": _MISSING_ID},
+    ]})
+    assert response.status_code == 404
+    assert response.get_json()["index"] == 1
+
+    tag_id = client.get("/api/tags").get_json()[0]["id"]
+    response = client.post("/api/admin/batch", headers=admin_headers, json={"operations": [
+        {"op": "delete", "entity": "tags", "id": tag_id},
+        {"op": "delete", "entity": "tags", "id": tag_id},
+    ]})
+    assert response.status_code == 404
+    assert response.get_json() == {"error": f"tags {tag_id} not found", "index": 1}
+    # Rolled back: the first delete didn't stick either
+    assert tag_id in {tag["id"] for tag in client.get("/api/tags").get_json()}
+
+
+def test_constraint_violation_is_400(database, client, admin_headers):
+    response = client.post("/api/admin/batch", headers=admin_headers, json={"operations": [
+        {"op": "create", "entity": "tags", "data": {"name": "batch-test-tag"}},
+        {"op": "create", "entity": "tags", "data": {"name": "batch-test-tag"}},
+    ]})
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body["index"] == 1
+    assert body["error"].startswith("Constraint violated: ")
+    assert "batch-test-tag" not in _tag_names(client)
+
+
+def test_wrong_value_type_is_400(database, client, admin_headers):
+    response = client.post("/api/admin/batch", headers=admin_headers, json={"operations": [
+        {"op": "create", "entity": "projects", "data": {"title": "T", "featured": "maybe"}},
+    ]})
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body["index"] == 0
+    assert body["error"].startswith("Invalid value: ")
@@ -0,0 +1,92 @@
+"""Admin session tokens: signing, expiry, key rotation and revocation on logout."""
+
+import pytest
+from itsdangerous import TimestampSigner, URLSafeTimedSerializer
+import config
+from routes import admin
+
+
+@pytest.fixture(autouse=True)
+def stateless_tokens(monkeypatch):
+    monkeypatch.setattr(config, "ADMIN_TOKEN_REVOCATION", False)
+
+
+def test_issued_token_is_valid():
+    token = admin._issue_token()
+    payload, issued_at = admin._decode_token(token)
+    assert len(payload["jti"]) == 32
+    assert admin._validate_token(token)
+
+
+def test_every_token_gets_its_own_id():
+    first, second = admin._issue_token(), admin._issue_token()
+    assert admin._decode_token(first)[0]["jti"] != admin._decode_token(second)[0]["jti"]
+
+
+@pytest.mark.parametrize("tamper", [
+    lambda token: token[:token.rindex(".") + 1] + token[token.rindex(".") + 2:],  # signature cut
+    lambda token: admin._issue_token().split(".")[0] + token[token.index("."):],  # payload
+    lambda token: token.rsplit(".", 1)[0],  # signature dropped
+    lambda token: "",
+])
+def test_tampered_token_is_rejected(tamper):
+    assert not admin._validate_token(tamper(admin._issue_token()))
+
+
+def test_token_signed_with_another_key_or_salt_is_rejected():
+    foreign_key = URLSafeTimedSerializer("not-the-secret-key", salt="admin-session")
+    foreign_salt = URLSafeTimedSerializer(config.SECRET_KEY, salt="something-else")
+    assert not admin._validate_token(foreign_key.dumps({"jti": "0" * 32}))
+    assert not admin._validate_token(foreign_salt.dumps({"jti": "0" * 32}))
+
+
+def test_token_signed_with_a_fallback_key_is_accepted(monkeypatch):
+    old = URLSafeTimedSerializer("previous-secret-key", salt="admin-session")
+    token = old.dumps({"jti": "0" * 32})
+    assert not admin._validate_token(token)
+
+    monkeypatch.setattr(admin, "_serializer", URLSafeTimedSerializer(
+        ["previous-secret-key", config.SECRET_KEY], salt="admin-session",
+    ))
+    assert admin._validate_token(token)
+
+
+def test_token_expires_after_ttl(monkeypatch):
+    now = TimestampSigner.get_timestamp
+
+    monkeypatch.setattr(TimestampSigner, "get_timestamp", lambda self: now(self) - admin._TOKEN_TTL - 1)
+    expired = admin._issue_token()
+    monkeypatch.setattr(TimestampSigner, "get_timestamp", lambda self: now(self) - admin._TOKEN_TTL + 60)
+    fresh = admin._issue_token()
+    monkeypatch.undo()
+
+    assert admin._decode_token(expired) is None
+    assert admin._decode_token(fresh) is not None
+
+
+def test_protected_route_needs_a_bearer_token(client, admin_headers):
+    assert client.post("/api/admin/batch", json={}).status_code == 401
+    assert client.post("/api/admin/batch", json={}, headers={"Authorization": "Token x"}).status_code == 401
+    assert client.post(
+        "/api/admin/batch", json={}, headers={"Authorization": "Bearer not-a-token"},
+    ).status_code == 401
+    # Past auth: rejected for its body, not its token
+    assert client.post("/api/admin/batch", json={}, headers=admin_headers).status_code == 400
+
+
+def test_logout_without_revocation_leaves_token_valid(client, admin_headers):
+    assert client.post("/api/admin/logout", headers=admin_headers).status_code == 200
+    assert admin._validate_token(admin_headers["Authorization"][7:])
+
+
+def test_logout_revokes_token(database, client, admin_headers, monkeypatch):
+    monkeypatch.setattr(config, "ADMIN_TOKEN_REVOCATION", True)
+    other = {"Authorization": f"Bearer {admin._issue_token()}"}
+
+    assert client.get("/api/admin/messages", headers=admin_headers).status_code == 200
+    assert client.post("/api/admin/logout", headers=admin_headers).status_code == 200
+
+    assert client.get("/api/admin/messages", headers=admin_headers).status_code == 401
+    assert client.post("/api/admin/logout", headers=admin_headers).status_code == 401
+    # Only that token: other sessions stay signed in
+    assert client.get("/api/admin/messages", headers=other).status_code == 200
@@ -0,0 +1,243 @@
+"""The response cache: keys, per-table invalidation, TTL, LRU and ETags."""
+
+import pytest
+from flask import Flask
+import cache
+from cache import ResponseCache
+
+
+def _entry(body=b"[]"):
+    return body, 200, "application/json", []
+
+
+@pytest.fixture
+def bare_app():
+    return Flask(__name__)
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("/api/projects", "/api/projects"),
+    ("/api/projects?featured=true", "/api/projects?featured=true"),
+    ("/api/bootstrap?include=projects&featured=true", "/api/bootstrap?featured=true&include=projects"),
+    ("/api/posts?tag=b&tag=a", "/api/posts?tag=a&tag=b"),
+])
+def test_cache_key_sorts_query_args(bare_app, url, expected):
+    with bare_app.test_request_context(url):
+        assert cache._cache_key() == expected
+
+
+def test_cache_key_escapes_values(bare_app):
+    # One arg whose value contains "&b=2" must not share a key with two args
+    with bare_app.test_request_context("/api/posts?a=1%26b%3D2"):
+        escaped = cache._cache_key()
+    with bare_app.test_request_context("/api/posts?a=1&b=2"):
+        separate = cache._cache_key()
+    assert escaped != separate
+    assert escaped == "/api/posts?a=1%26b%3D2"
+
+
+def test_invalidate_evicts_only_entries_built_from_the_table():
+    store = ResponseCache(max_entries=10, ttl=60)
+    store.set("/api/projects", *_entry(), tables=("projects", "tags"))
+    store.set("/api/tags", *_entry(), tables=("tags",))
+    store.set("/api/interests", *_entry(), tables=("interests",))
+
+    assert store.invalidate("projects") == 1
+    assert store.get("/api/projects") is None
+    assert store.get("/api/tags") is not None
+
+    assert store.invalidate("tags", "interests") == 2
+    assert store.get("/api/tags") is None
+    assert store.get("/api/interests") is None
+
+
+def test_fill_started_before_an_invalidation_is_dropped():
+    store = ResponseCache(max_entries=10, ttl=60)
+    generations = store.generations(("posts",))
+    store.invalidate("posts")   # a write lands while the response is being built
+    store.set("/api/posts", *_entry(b"stale"), tables=("posts",), generations=generations)
+    assert store.get("/api/posts") is None
+
+    generations = store.generations(("posts",))
+    store.set("/api/posts", *_entry(b"fresh"), tables=("posts",), generations=generations)
+    assert store.get("/api/posts")[0] == b"fresh"
+
+
+def test_clear_also_drops_in_flight_fills():
+    store = ResponseCache(max_entries=10, ttl=60)
+    store.invalidate("posts")
+    generations = store.generations(("posts",))
+    store.clear()
+    store.set("/api/posts", *_entry(), tables=("posts",), generations=generations)
+    assert store.get("/api/posts") is None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    store = ResponseCache(max_entries=10, ttl=30)
+    store.set("/api/tags", *_entry(), tables=("tags",))
+
+    now[0] += 29
+    assert store.get("/api/tags") is not None
+    now[0] += 1
+    assert store.get("/api/tags") is None
+    assert store.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    store = ResponseCache(max_entries=2, ttl=60)
+    store.set("a", *_entry(), tables=("t",))
+    store.set("b", *_entry(), tables=("t",))
+    store.get("a")
+    store.set("c", *_entry(), tables=("t",))
+
+    assert store.get("b") is None
+    assert store.get("a") is not None and store.get("c") is not None
+    assert store.stats()["evictions"] == 1
+    # The evicted key is forgotten by the table index too
+    assert store.invalidate("t") == 2
+
+
+def test_invalidate_records_tables_for_the_request(bare_app):
+    with bare_app.test_request_context("/api/admin/tags", method="POST"):
+        cache.invalidate("tags")
+        cache.invalidate("projects", "tags")
+        assert cache.g.invalidated_tables == {"tags", "projects"}
+
+
+# ---------------------------------------------------------------------------
+# ETag / Last-Modified
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def versions(monkeypatch):
+    """Stand-in for content_versions: table -> version, bumped by the tests."""
+    state = {"posts": 1, "tags": 1}
+
+    def content_validators(key, tables):
+        return f"{key}|" + ",".join(f"{t}:{state[t]}" for t in sorted(tables)), None
+
+    monkeypatch.setattr(cache, "_content_validators", content_validators)
+    cache.response_cache.clear()
+    return state
+
+
+@pytest.fixture
+def posts_view(bare_app):
+    calls = []
+
+    @bare_app.route("/api/posts")
+    @cache.cached("posts")
+    def posts():
+        calls.append(1)
+        return [{"id": len(calls)}]
+
+    return bare_app.test_client(), calls
+
+
+def test_response_carries_validators(versions, posts_view):
+    client, _ = posts_view
+    response = client.get("/api/posts")
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"/api/posts|posts:1"'
+    assert response.headers["Cache-Control"].startswith("public, max-age=")
+    assert {"Origin", "Accept-Encoding"} <= set(response.vary)
+
+
+def test_matching_etag_gets_304(versions, posts_view):
+    client, calls = posts_view
+    etag = client.get("/api/posts").headers["ETag"]
+
+    response = client.get("/api/posts", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.get_data() == b""
+    assert response.headers["ETag"] == etag
+    assert len(calls) == 1
+
+
+def test_write_changes_etag_and_evicts_entry(versions, posts_view):
+    client, calls = posts_view
+    etag = client.get("/api/posts").headers["ETag"]
+
+    versions["posts"] += 1
+    cache.response_cache.invalidate("posts")
+    response = client.get("/api/posts", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.get_json() == [{"id": 2}]
+
+
+def test_other_tables_leave_etag_alone(versions, posts_view):
+    client, calls = posts_view
+    etag = client.get("/api/posts").headers["ETag"]
+
+    versions["tags"] += 1
+    cache.response_cache.invalidate("tags")
+    assert client.get("/api/posts", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/posts").status_code == 200
+    assert len(calls) == 1
+
+
+def test_without_content_versions_etag_hashes_the_body(monkeypatch, posts_view):
+    monkeypatch.setattr(cache, "_content_validators", lambda key, tables: None)
+    cache.response_cache.clear()
+    client, calls = posts_view
+    etag = client.get("/api/posts").headers["ETag"]
+    assert client.get("/api/posts", headers={"If-None-Match": etag}).status_code == 304
+
+    cache.response_cache.invalidate("posts")
+    response = client.get("/api/posts", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_error_responses_are_neither_cached_nor_tagged(versions, bare_app):
+    calls = []
+
+    @bare_app.route("/api/posts/search")
+    @cache.cached("posts")
+    def search():
+        calls.append(1)
+        return {"error": "Query parameter q is required"}, 400
+
+    client = bare_app.test_client()
+    for _ in range(2):
+        response = client.get("/api/posts/search")
+        assert response.status_code == 400
+        assert "ETag" not in response.headers
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("setting, value", [
+    ("BUILD_ID", "next-deploy"),
+    ("JSON_PROVIDER", "something-else"),
+    ("JSON_DATETIME_FORMAT", "something-else"),
+])
+def test_build_fingerprint_covers_code_and_json_settings(monkeypatch, setting, value):
+    monkeypatch.setattr(cache, "_build", None)
+    before = cache._build_fingerprint()
+
+    monkeypatch.setattr(cache.config, setting, value)
+    monkeypatch.setattr(cache, "_build", None)
+    assert cache._build_fingerprint() != before
+
+
+def test_public_etag_follows_content_versions(database, client):
+    from db import get_db
+
+    first = client.get("/api/interests")
+    assert first.status_code == 200
+    assert "Last-Modified" in first.headers
+    etag = first.headers["ETag"]
+    assert client.get("/api/interests", headers={"If-None-Match": etag}).status_code == 304
+
+    with get_db() as (conn, cur):
+        # A no-op write still fires the trigger that bumps the version
+        cur.execute("UPDATE interests SET sort_order = sort_order")
+    cache.response_cache.invalidate("interests")
+
+    second = client.get("/api/interests", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["ETag"] != etag
+    assert second.get_json() == first.get_json()
@@ -0,0 +1,66 @@
+"""rows_response() over tuple rows must match jsonify() over dict rows byte for byte."""
+
+from collections import namedtuple
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+import pytest
+from flask import Flask, jsonify
+import json_provider
+
+Column = namedtuple("Column", "name type_code")
+
+# name, Postgres type OID — one of each kind the compiled serializer handles
+DESCRIPTION = [
+    Column("id", 23),
+    Column("title", 25),
+    Column("featured", 16),
+    Column("created_at", 1184),
+    Column("updated_at", 1114),
+    Column("published_on", 1082),
+    Column("variants", 3802),
+    Column("rank", 1700),
+]
+
+ROWS = [
+    (1, "Plain ASCII", True,
+     datetime(2025, 9, 15, 10, 0, tzinfo=timezone.utc), datetime(2025, 9, 15, 10, 0, 0, 123456),
+     date(2025, 9, 15), {"webp": "/uploads/a 320w"}, Decimal("0.0607927")),
+    (2, "Café — “quoted” ✓ 日本語 \U0001F600", False,
+     datetime(2025, 1, 2, 3, 4, 5, 6, tzinfo=timezone(timedelta(hours=2))), datetime(1999, 12, 31),
+     date(2000, 2, 29), {"ü": ["ß", None]}, Decimal("1")),
+    (3, 'Escapes " \\ / \n \t \r \b \f \x00 \x1f \x7f  ', None,
+     None, None, None, None, None),
+]
+
+
+def _app(provider_name, datetime_format):
+    if provider_name == "orjson" and json_provider.orjson is None:
+        pytest.skip("orjson is not installed")
+    app = Flask(__name__)
+    provider = json_provider.OrjsonProvider if provider_name == "orjson" else json_provider.StdlibJSONProvider
+    app.json = provider(app, datetime_format)
+    return app
+
+
+@pytest.mark.parametrize("datetime_format", ["http", "iso"])
+@pytest.mark.parametrize("provider_name", ["orjson", "stdlib"])
+def test_rows_response_matches_jsonify(provider_name, datetime_format):
+    app = _app(provider_name, datetime_format)
+    names = [column.name for column in DESCRIPTION]
+    with app.app_context():
+        expected = jsonify([dict(zip(names, row)) for row in ROWS]).get_data()
+        actual = json_provider.rows_response(ROWS, DESCRIPTION).get_data()
+    assert actual == expected
+
+
+@pytest.mark.parametrize("provider_name", ["orjson", "stdlib"])
+def test_empty_rows(provider_name):
+    app = _app(provider_name, "http")
+    with app.app_context():
+        assert json_provider.rows_response([], DESCRIPTION).get_data() == jsonify([]).get_data()
+
+
+def test_duplicate_column_names_are_rejected():
+    app = _app("stdlib", "http")
+    with app.app_context(), pytest.raises(ValueError):
+        json_provider.rows_json([(1, 2)], [Column("id", 23), Column("id", 23)])
@@ -0,0 +1,139 @@
+"""Cursor tokens, ?limit=/?cursor= parsing and the next-page headers."""
+
+import base64
+import json
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+import pytest
+from flask import Flask
+import pagination
+from pagination import PaginationError
+
+Column = namedtuple("Column", "name type_code")
+
+
+def _token(value):
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("created_at", [
+    datetime(2025, 9, 15, 10, 0, 0, 123456, tzinfo=timezone.utc),
+    datetime(2025, 9, 15, 10, 0, tzinfo=timezone(timedelta(hours=-7))),
+    datetime(2025, 9, 15, 10, 0),
+])
+def test_cursor_round_trip(created_at):
+    token = pagination.encode_cursor(created_at, 42)
+    assert "=" not in token and "/" not in token and "+" not in token
+    assert pagination.decode_cursor(token) == (created_at, 42)
+
+
+def test_offset_cursor_round_trip():
+    for offset in (0, 10, 12345):
+        assert pagination.decode_offset_cursor(pagination.encode_offset_cursor(offset)) == offset
+
+
+@pytest.mark.parametrize("token", [
+    "not base64!",
+    "abc",                                          # truncated base64
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),  # not UTF-8
+    _token("2025-09-15T10:00:00"),                   # not a pair
+    _token(["2025-09-15T10:00:00"]),
+    _token(["2025-09-15T10:00:00", 1, 2]),
+    _token(["yesterday", 1]),
+    _token([None, 1]),
+    _token(["2025-09-15T10:00:00", "one"]),
+    _token(["2025-09-15T10:00:00", None]),
+    _token({"offset": 10}),
+])
+def test_tampered_cursor_is_rejected(token):
+    with pytest.raises(PaginationError):
+        pagination.decode_cursor(token)
+
+
+@pytest.mark.parametrize("token", [
+    "not base64!",
+    _token({"offset": -1}),
+    _token({"offset": "ten"}),
+    _token({"page": 2}),
+    _token([10]),
+    pagination.encode_cursor(datetime(2025, 9, 15), 1),
+])
+def test_tampered_offset_cursor_is_rejected(token):
+    with pytest.raises(PaginationError):
+        pagination.decode_offset_cursor(token)
+
+
+@pytest.fixture
+def bare_app():
+    return Flask(__name__)
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("", (20, None)),
+    ("?limit=1", (1, None)),
+    ("?limit=100", (100, None)),
+    (f"?cursor={pagination.encode_cursor(datetime(2025, 1, 1), 7)}", (20, (datetime(2025, 1, 1), 7))),
+])
+def test_page_args(bare_app, query, expected):
+    with bare_app.test_request_context("/api/posts" + query):
+        assert pagination.page_args(default_limit=20, max_limit=100) == expected
+
+
+@pytest.mark.parametrize("query", ["?limit=0", "?limit=101", "?limit=-5", "?limit=ten", "?cursor=%21"])
+def test_page_args_rejects_bad_values(bare_app, query):
+    with bare_app.test_request_context("/api/posts" + query), pytest.raises(PaginationError):
+        pagination.page_args(default_limit=20, max_limit=100)
+
+
+def _rows(count):
+    start = datetime(2025, 9, 15, tzinfo=timezone.utc)
+    return [{"id": count - i, "created_at": start - timedelta(days=i)} for i in range(count)]
+
+
+def test_page_response_last_page_has_no_cursor(bare_app):
+    with bare_app.test_request_context("/api/posts?limit=3"):
+        response = pagination.page_response(_rows(3), 3)
+    assert len(response.get_json()) == 3
+    assert pagination.NEXT_CURSOR_HEADER not in response.headers
+    assert "Link" not in response.headers
+
+
+def test_page_response_points_at_next_page(bare_app):
+    rows = _rows(4)
+    with bare_app.test_request_context("/api/posts?limit=3&q=x"):
+        response = pagination.page_response(rows, 3)
+    assert len(response.get_json()) == 3
+
+    token = response.headers[pagination.NEXT_CURSOR_HEADER]
+    assert pagination.decode_cursor(token) == (rows[2]["created_at"], rows[2]["id"])
+    assert response.headers["Link"] == f'</api/posts?cursor={token}&limit=3&q=x>; rel="next"'
+
+
+def test_page_response_cursor_from_tuple_rows(bare_app):
+    description = [Column("id", 23), Column("created_at", 1184)]
+    rows = [(row["id"], row["created_at"]) for row in _rows(3)]
+    with bare_app.test_request_context("/api/posts?limit=2"), bare_app.app_context():
+        response = pagination.page_response(rows, 2, description=description)
+        token = response.headers[pagination.NEXT_CURSOR_HEADER]
+    assert pagination.decode_cursor(token) == (rows[1][1], rows[1][0])
+
+
+def test_posts_unpaginated_without_limit_or_cursor(database, client):
+    everything = client.get("/api/posts")
+    assert everything.status_code == 200
+    assert pagination.NEXT_CURSOR_HEADER not in everything.headers
+
+    paged, path = [], "/api/posts?limit=1"
+    while path:
+        response = client.get(path)
+        assert response.status_code == 200
+        paged += response.get_json()
+        cursor = response.headers.get(pagination.NEXT_CURSOR_HEADER)
+        path = f"/api/posts?limit=1&cursor={cursor}" if cursor else None
+    assert paged == everything.get_json()
+
+
+def test_posts_rejects_tampered_cursor(database, client):
+    response = client.get("/api/posts?cursor=" + _token(["yesterday", 1]))
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Invalid cursor"}
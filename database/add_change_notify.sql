@@ -0,0 +1,36 @@
+-- ============================================================================
+-- Migration: add change-notification triggers for cross-worker cache eviction
+-- Safe to run repeatedly — replaces the function and recreates the triggers.
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION notify_content_change() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('content_changed', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS projects_notify_change ON projects;
+CREATE TRIGGER projects_notify_change
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON projects
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_content_change();
+
+DROP TRIGGER IF EXISTS posts_notify_change ON posts;
+CREATE TRIGGER posts_notify_change
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON posts
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_content_change();
+
+DROP TRIGGER IF EXISTS tags_notify_change ON tags;
+CREATE TRIGGER tags_notify_change
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON tags
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_content_change();
+
+DROP TRIGGER IF EXISTS project_tags_notify_change ON project_tags;
+CREATE TRIGGER project_tags_notify_change
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON project_tags
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_content_change();
+
+DROP TRIGGER IF EXISTS interests_notify_change ON interests;
+CREATE TRIGGER interests_notify_change
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON interests
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_content_change();
@@ -0,0 +1,27 @@
+-- ============================================================================
+-- Migration: add per-table version counters for ETag / Last-Modified headers
+-- Run after add_change_notify.sql. Safe to run repeatedly — creates the table
+-- if missing and replaces the trigger function so writes bump the counters.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS content_versions (
+    table_name VARCHAR(63) PRIMARY KEY,
+    version    BIGINT      NOT NULL DEFAULT 0,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO content_versions (table_name) VALUES
+    ('projects'), ('posts'), ('tags'), ('project_tags'), ('interests')
+ON CONFLICT (table_name) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION notify_content_change() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO content_versions (table_name, version, changed_at)
+    VALUES (TG_TABLE_NAME, 1, CURRENT_TIMESTAMP)
+    ON CONFLICT (table_name) DO UPDATE
+        SET version    = content_versions.version + 1,
+            changed_at = CURRENT_TIMESTAMP;
+    PERFORM pg_notify('content_changed', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
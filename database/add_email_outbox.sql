@@ -0,0 +1,19 @@
+-- ============================================================================
+-- Migration: add the `email_outbox` table (asynchronous contact emails)
+-- Safe to run repeatedly.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id                 SERIAL PRIMARY KEY,
+    contact_message_id INTEGER      REFERENCES contact_messages(id) ON DELETE SET NULL,
+    payload            JSONB        NOT NULL,
+    status             VARCHAR(10)  NOT NULL DEFAULT 'pending'
+                       CHECK (status IN ('pending', 'sent', 'dead')),
+    attempts           INTEGER      NOT NULL DEFAULT 0,
+    next_attempt_at    TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_error         TEXT,
+    created_at         TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    sent_at            TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_email_outbox_due ON email_outbox (next_attempt_at) WHERE status = 'pending';
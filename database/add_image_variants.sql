@@ -0,0 +1,18 @@
+-- ============================================================================
+-- Migration: add the `image_variants` table (responsive screenshot variants)
+-- Run after add_content_versions.sql. Safe to run repeatedly.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS image_variants (
+    source_url  VARCHAR(500) PRIMARY KEY,
+    variants    JSONB        NOT NULL,
+    created_at  TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO content_versions (table_name) VALUES ('image_variants')
+ON CONFLICT (table_name) DO NOTHING;
+
+DROP TRIGGER IF EXISTS image_variants_notify_change ON image_variants;
+CREATE TRIGGER image_variants_notify_change
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON image_variants
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_content_change();
@@ -0,0 +1,14 @@
+-- ============================================================================
+-- Migration: composite indexes for keyset (cursor) pagination
+-- Safe to run repeatedly. Replaces the single-column created_at index on
+-- contact_messages, which the new (created_at, id) index makes redundant.
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_posts_published_created_at_id
+    ON posts (created_at DESC, id DESC)
+    WHERE published = TRUE;
+
+CREATE INDEX IF NOT EXISTS idx_contact_messages_created_at_id
+    ON contact_messages (created_at DESC, id DESC);
+
+DROP INDEX IF EXISTS idx_contact_messages_created_at;
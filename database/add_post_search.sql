@@ -0,0 +1,13 @@
+-- ============================================================================
+-- Migration: full-text search over blog posts
+-- Safe to run repeatedly. Adds a generated tsvector column (kept up to date
+-- by Postgres on every INSERT/UPDATE) and a GIN index over it.
+-- ============================================================================
+
+ALTER TABLE posts
+    ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', title), 'A') ||
+        setweight(to_tsvector('english', content), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_posts_search_vector ON posts USING GIN (search_vector);
@@ -0,0 +1,9 @@
+-- ============================================================================
+-- Migration: add the `revoked_tokens` table (admin logout revocation list)
+-- Safe to run repeatedly.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti         VARCHAR(32) PRIMARY KEY,
+    expires_at  TIMESTAMP   NOT NULL
+);
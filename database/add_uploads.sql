@@ -0,0 +1,13 @@
+-- ============================================================================
+-- Migration: add the `uploads` table (verified direct-to-S3 uploads)
+-- Safe to run repeatedly.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS uploads (
+    id            SERIAL       PRIMARY KEY,
+    object_key    VARCHAR(255) NOT NULL UNIQUE,
+    url           VARCHAR(500) NOT NULL,
+    content_type  VARCHAR(100) NOT NULL,
+    size_bytes    INTEGER      NOT NULL CHECK (size_bytes > 0),
+    created_at    TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
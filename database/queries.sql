@@ -8,6 +8,9 @@
 --   - What SQL concept it demonstrates
 --   - What it's used for in the application
 --   - The corresponding API endpoint
+--   - Its name in the application's named-query registry, where it has one
+--     (backend/queries.py): those statements are prepared once per pooled
+--     connection and then run with EXECUTE <name> (...) — see the last entry
 -- ============================================================================
 
 
@@ -16,11 +19,41 @@
 -- Demonstrates: Simple SELECT with WHERE clause
 -- Purpose: Fetch all published blog posts for the public blog page
 -- API Endpoint: GET /api/posts
+-- Named query: posts_all
 -- ============================================================================
 SELECT id, title, slug, created_at, updated_at
 FROM posts
 WHERE published = TRUE
-ORDER BY created_at DESC;
+ORDER BY created_at DESC, id DESC;
+
+-- ============================================================================
+-- 1a. First page
+-- Demonstrates: SELECT + ORDER BY + LIMIT
+-- Purpose: Fetch the first page of published blog posts
+-- API Endpoint: GET /api/posts?limit=N
+-- Named query: posts_first_page
+-- ============================================================================
+SELECT id, title, slug, created_at, updated_at
+FROM posts
+WHERE published = TRUE
+ORDER BY created_at DESC, id DESC
+LIMIT $1;  -- page size + 1, to detect whether another page exists
+
+-- ============================================================================
+-- 1b. Keyset pagination
+-- Demonstrates: Row-value comparison for cursor-based paging
+-- Purpose: Fetch the next page after the last (created_at, id) the client saw.
+--          Unlike OFFSET, this is an index range scan no matter how deep the
+--          page is (see idx_posts_published_created_at_id).
+-- API Endpoint: GET /api/posts?cursor=...
+-- Named query: posts_next_page
+-- ============================================================================
+SELECT id, title, slug, created_at, updated_at
+FROM posts
+WHERE published = TRUE
+  AND (created_at, id) < ($1, $2)
+ORDER BY created_at DESC, id DESC
+LIMIT $3;
 
 
 -- ============================================================================
@@ -28,11 +61,16 @@ ORDER BY created_at DESC;
 -- Demonstrates: Filtering with boolean condition + sorting results
 -- Purpose: Fetch featured projects for the homepage spotlight section
 -- API Endpoint: GET /api/projects?featured=true
+-- Named query: projects_featured (projects_all is the same without the WHERE,
+--              for GET /api/projects)
 -- ============================================================================
-SELECT id, title, description, tech_stack, live_url, github_url, image_url
-FROM projects
-WHERE featured = TRUE
-ORDER BY created_at DESC;
+SELECT p.id, p.title, p.description, p.tech_stack,
+       p.live_url, p.github_url, p.image_url, iv.variants AS image_variants,
+       p.featured, p.created_at
+FROM projects p
+LEFT JOIN image_variants iv ON iv.source_url = p.image_url
+WHERE p.featured = TRUE
+ORDER BY p.sort_order ASC;
 
 
 -- ============================================================================
@@ -40,6 +78,7 @@ ORDER BY created_at DESC;
 -- Demonstrates: INNER JOIN across three tables to resolve a many-to-many relationship
 -- Purpose: Fetch each project along with its associated tag names
 -- API Endpoint: GET /api/projects/:id
+-- Named query: project_by_id
 -- ============================================================================
 SELECT
     p.id,
@@ -49,6 +88,7 @@ SELECT
     p.live_url,
     p.github_url,
     p.image_url,
+    iv.variants AS image_variants,
     p.featured,
     p.created_at,
     COALESCE(
@@ -59,15 +99,43 @@ SELECT
 FROM projects p
 LEFT JOIN project_tags pt ON p.id = pt.project_id
 LEFT JOIN tags t ON pt.tag_id = t.id
-WHERE p.id = 1  -- Parameterized in application code as $1
-GROUP BY p.id;
+LEFT JOIN image_variants iv ON iv.source_url = p.image_url
+WHERE p.id = $1
+GROUP BY p.id, iv.source_url;
+
+
+-- ============================================================================
+-- 3b. JOIN + json_agg over a whole list (avoiding N+1 queries)
+-- Demonstrates: Aggregating each project's tags in the same query as the list
+-- Purpose: Return every project with its tags for the Home/Projects pages in
+--          one query instead of one /api/projects/:id request per card
+-- API Endpoint: GET /api/bootstrap
+-- Named query: bootstrap_projects
+-- ============================================================================
+SELECT
+    p.id, p.title, p.description, p.tech_stack,
+    p.live_url, p.github_url, p.image_url, iv.variants AS image_variants,
+    p.featured, p.created_at,
+    COALESCE(
+        json_agg(json_build_object('id', t.id, 'name', t.name) ORDER BY t.name)
+        FILTER (WHERE t.id IS NOT NULL),
+        '[]'
+    ) AS tags
+FROM projects p
+LEFT JOIN project_tags pt ON p.id = pt.project_id
+LEFT JOIN tags t ON pt.tag_id = t.id
+LEFT JOIN image_variants iv ON iv.source_url = p.image_url
+WHERE p.featured = TRUE OR NOT $1  -- $1 = featured-only filter
+GROUP BY p.id, iv.source_url
+ORDER BY p.sort_order ASC;
 
 
 -- ============================================================================
 -- 4. Aggregate + GROUP BY
 -- Demonstrates: COUNT aggregate with GROUP BY and JOIN
 -- Purpose: Get the number of projects per tag for a tag cloud / sidebar
--- API Endpoint: GET /api/tags
+-- API Endpoint: GET /api/tags (and the "tags" section of GET /api/bootstrap)
+-- Named query: tags_with_counts
 -- ============================================================================
 SELECT
     t.id,
@@ -79,6 +147,42 @@ GROUP BY t.id, t.name
 ORDER BY project_count DESC;
 
 
+-- ============================================================================
+-- 4b. Full-text search
+-- Demonstrates: tsvector/tsquery matching, ts_rank ordering, ts_headline
+-- Purpose: Search published posts by title and content, best matches first,
+--          with highlighted snippets built only for the returned page
+-- API Endpoint: GET /api/posts/search?q=...
+-- Named query: posts_search
+-- ============================================================================
+SELECT id, title, slug, created_at, updated_at, rank,
+       ts_headline('english', content, query,
+                   'StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MinWords=8, MaxWords=25')
+           AS snippet
+FROM (
+    SELECT p.id, p.title, p.slug, p.content, p.created_at, p.updated_at,
+           ts_rank(p.search_vector, query) AS rank, query
+    FROM posts p, websearch_to_tsquery('english', $1) AS query
+    WHERE p.published = TRUE
+      AND p.search_vector @@ query   -- uses idx_posts_search_vector (GIN)
+    ORDER BY rank DESC, p.id DESC
+    LIMIT $2 OFFSET $3
+) AS hits
+ORDER BY rank DESC, id DESC;
+
+
+-- ============================================================================
+-- 4c. SELECT + ORDER BY
+-- Demonstrates: Sorting on a display-order column with a tie-breaker
+-- Purpose: Fetch the interest cards in display order
+-- API Endpoint: GET /api/interests (and the "interests" section of GET /api/bootstrap)
+-- Named query: interests_all
+-- ============================================================================
+SELECT id, title, tag, blurb, description, accent, theme, sort_order
+FROM interests
+ORDER BY sort_order ASC, id ASC;
+
+
 -- ============================================================================
 -- 5. INSERT — Add a new project
 -- Demonstrates: INSERT with RETURNING clause (PostgreSQL feature)
@@ -100,14 +204,36 @@ VALUES ($1, $2, $3, $4)
 RETURNING id, title, slug, created_at;
 
 -- ============================================================================
--- 5c. INSERT — Associate tags with a project
--- Demonstrates: Batch INSERT for junction table (many-to-many)
--- Purpose: Link tags to a newly created project
--- API Endpoint: POST /api/admin/projects (called internally after project creation)
+-- 5d. INSERT — Save a contact form submission
+-- Demonstrates: INSERT with RETURNING
+-- Purpose: Store a visitor's message (its email notification is queued in
+--          the same transaction)
+-- API Endpoint: POST /api/contact
+-- Named query: contact_insert_message
 -- ============================================================================
-INSERT INTO project_tags (project_id, tag_id)
-VALUES ($1, $2);
--- In application code, this is called in a loop or with unnest() for multiple tags
+INSERT INTO contact_messages (name, email, message)
+VALUES ($1, $2, $3)
+RETURNING id, created_at;
+
+-- ============================================================================
+-- 5c. INSERT — Create a project and link its tags in one statement
+-- Demonstrates: Data-modifying CTE + INSERT ... SELECT unnest(array)
+-- Purpose: Insert the project last in sort order and link every tag,
+--          in a single round trip instead of one INSERT per tag
+-- API Endpoint: POST /api/admin/projects
+-- ============================================================================
+WITH project AS (
+    INSERT INTO projects (title, description, tech_stack, live_url, github_url, image_url, featured, sort_order)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, (SELECT COALESCE(MAX(sort_order), 0) + 1 FROM projects))
+    RETURNING id, title, created_at
+),
+linked AS (
+    INSERT INTO project_tags (project_id, tag_id)
+    SELECT project.id, tag_id
+    FROM project, unnest($8::int[]) AS tag_id      -- e.g. '{1,4,7}'
+    ON CONFLICT DO NOTHING
+)
+SELECT id, title, created_at FROM project;
 
 
 -- ============================================================================
@@ -127,6 +253,35 @@ SET title = $1,
 WHERE id = $8
 RETURNING id, title, created_at;
 
+-- ============================================================================
+-- 6b. Replace a project's tags
+-- Demonstrates: DELETE + INSERT in one statement via a writable CTE
+-- Purpose: Make the given array the project's exact tag set; links that
+--          stay are left untouched
+-- API Endpoint: PUT /api/admin/projects/:id (when "tag_ids" is sent)
+-- ============================================================================
+WITH removed AS (
+    DELETE FROM project_tags
+    WHERE project_id = $1
+      AND tag_id <> ALL($2::int[])
+)
+INSERT INTO project_tags (project_id, tag_id)
+SELECT $1, tag_id
+FROM unnest($2::int[]) AS tag_id
+ON CONFLICT DO NOTHING;
+
+-- ============================================================================
+-- 6c. Reorder projects
+-- Demonstrates: UPDATE ... FROM unnest(array) WITH ORDINALITY
+-- Purpose: Save a drag-and-drop order in one statement; each id's position
+--          in the array becomes its sort_order
+-- API Endpoint: PUT /api/admin/projects/reorder
+-- ============================================================================
+UPDATE projects p
+SET sort_order = o.position
+FROM unnest($1::int[]) WITH ORDINALITY AS o(id, position)   -- e.g. '{3,1,2}'
+WHERE p.id = o.id;
+
 
 -- ============================================================================
 -- 7. DELETE — Remove a contact message
@@ -157,9 +312,11 @@ RETURNING id;
 -- The database driver treats $1 as a value, never as SQL code.
 -- Even if user_input is "' OR 1=1; DROP TABLE projects; --",
 -- the database safely searches for a slug with that literal string.
+-- API Endpoint: GET /api/posts/:slug
+-- Named query: post_by_slug
 SELECT id, title, content, slug, published, created_at, updated_at
 FROM posts
-WHERE slug = $1;
+WHERE slug = $1 AND published = TRUE;
 
 -- In Python (psycopg2), parameterized queries look like this:
 --   cursor.execute("SELECT * FROM posts WHERE slug = %s", (user_input,))
@@ -191,3 +348,26 @@ INSERT INTO tags (name)
 VALUES ($1)
 ON CONFLICT (name) DO NOTHING
 RETURNING id, name;
+
+
+-- ============================================================================
+-- BONUS: Server-side prepared statements
+-- Demonstrates: PREPARE / EXECUTE and the session's plan cache
+-- Purpose: How the named queries above run on a pooled connection. The
+--          first use sends PREPARE + EXECUTE in one round trip; every later
+--          request on that connection skips parsing and analysis and, after
+--          a few executions, reuses a cached generic plan.
+-- ============================================================================
+PREPARE posts_first_page AS
+    SELECT id, title, slug, created_at, updated_at
+    FROM posts
+    WHERE published = TRUE
+    ORDER BY created_at DESC, id DESC
+    LIMIT $1;
+
+EXECUTE posts_first_page (21);
+
+-- What this session has prepared, and how often each ran with a generic
+-- (cached) plan vs a custom one (PostgreSQL 14+)
+SELECT name, parameter_types, generic_plans, custom_plans
+FROM pg_prepared_statements;
@@ -42,7 +42,13 @@ CREATE TABLE posts (
     slug        VARCHAR(300)  NOT NULL UNIQUE, -- URL-friendly identifier
     published   BOOLEAN       NOT NULL DEFAULT FALSE,
     created_at  TIMESTAMP     NOT NULL DEFAULT CURRENT_TIMESTAMP,
-    updated_at  TIMESTAMP     NOT NULL DEFAULT CURRENT_TIMESTAMP
+    updated_at  TIMESTAMP     NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    -- Full-text search document, maintained by Postgres: title matches (A)
+    -- outrank content matches (B)
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', title), 'A') ||
+        setweight(to_tsvector('english', content), 'B')
+    ) STORED
 );
 
 -- Index: speeds up lookup by slug (used for individual post pages)
@@ -51,6 +57,14 @@ CREATE INDEX idx_posts_slug ON posts (slug);
 -- Index: speeds up filtering by published status
 CREATE INDEX idx_posts_published ON posts (published);
 
+-- Index: keyset pagination of the public post list — a partial index over
+-- published posts in (created_at, id) order, matching ORDER BY ... DESC
+CREATE INDEX idx_posts_published_created_at_id ON posts (created_at DESC, id DESC)
+    WHERE published = TRUE;
+
+-- Index: GIN index for full-text search (GET /api/posts/search)
+CREATE INDEX idx_posts_search_vector ON posts USING GIN (search_vector);
+
 
 -- ============================================================================
 -- TABLE: tags
@@ -113,5 +127,130 @@ CREATE TABLE contact_messages (
     created_at TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
 
--- Index: speeds up ordering messages by date (admin view)
-CREATE INDEX idx_contact_messages_created_at ON contact_messages (created_at);
+-- Index: keyset pagination of the admin inbox, newest first; the id column
+-- breaks ties between messages submitted in the same instant
+CREATE INDEX idx_contact_messages_created_at_id ON contact_messages (created_at DESC, id DESC);
+
+
+-- ============================================================================
+-- TABLE: email_outbox
+-- Email notifications waiting to be sent. Written in the same transaction as
+-- the contact message; a background sender in the API delivers them via SES,
+-- retrying with backoff and marking them 'dead' after too many failures.
+-- ============================================================================
+CREATE TABLE email_outbox (
+    id                 SERIAL PRIMARY KEY,
+    contact_message_id INTEGER      REFERENCES contact_messages(id) ON DELETE SET NULL,
+    payload            JSONB        NOT NULL,                    -- arguments for the email (name, email, message)
+    status             VARCHAR(10)  NOT NULL DEFAULT 'pending'
+                       CHECK (status IN ('pending', 'sent', 'dead')),
+    attempts           INTEGER      NOT NULL DEFAULT 0,
+    next_attempt_at    TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP,  -- also the lease while sending
+    last_error         TEXT,
+    created_at         TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    sent_at            TIMESTAMP
+);
+
+-- Index: lets the sender find due emails without scanning delivered ones
+CREATE INDEX idx_email_outbox_due ON email_outbox (next_attempt_at) WHERE status = 'pending';
+
+
+-- ============================================================================
+-- TABLE: image_variants
+-- Resized WebP/AVIF copies generated in the background for each uploaded
+-- screenshot, keyed by the original's URL (the value stored in
+-- projects.image_url). `variants` maps format -> srcset string.
+-- ============================================================================
+CREATE TABLE image_variants (
+    source_url  VARCHAR(500) PRIMARY KEY,
+    variants    JSONB        NOT NULL,       -- e.g. {"webp": "/uploads/x-320w-9f86d081884c.webp 320w, ..."}
+    created_at  TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+
+-- ============================================================================
+-- TABLE: uploads
+-- Images the admin uploaded straight to S3 with a presigned POST, recorded
+-- once the completion callback has verified the stored object.
+-- ============================================================================
+CREATE TABLE uploads (
+    id            SERIAL       PRIMARY KEY,
+    object_key    VARCHAR(255) NOT NULL UNIQUE,
+    url           VARCHAR(500) NOT NULL,
+    content_type  VARCHAR(100) NOT NULL,
+    size_bytes    INTEGER      NOT NULL CHECK (size_bytes > 0),
+    created_at    TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+
+-- ============================================================================
+-- TABLE: revoked_tokens
+-- Admin session tokens revoked by logout before their expiry (only consulted
+-- when ADMIN_TOKEN_REVOCATION=true). Rows are pruned once the token would
+-- have expired on its own.
+-- ============================================================================
+CREATE TABLE revoked_tokens (
+    jti         VARCHAR(32) PRIMARY KEY,     -- the token's random id
+    expires_at  TIMESTAMP   NOT NULL         -- UTC
+);
+
+
+-- ============================================================================
+-- TABLE: content_versions
+-- One row per content table with a counter that is bumped on every write.
+-- The API derives ETag / Last-Modified headers from it, so a conditional GET
+-- can be answered with a 304 without reading the content tables themselves.
+-- ============================================================================
+CREATE TABLE content_versions (
+    table_name VARCHAR(63) PRIMARY KEY,
+    version    BIGINT      NOT NULL DEFAULT 0,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP  -- with time zone: used for HTTP dates
+);
+
+INSERT INTO content_versions (table_name) VALUES
+    ('projects'), ('posts'), ('tags'), ('project_tags'), ('interests'), ('image_variants');
+
+
+-- ============================================================================
+-- CHANGE NOTIFICATIONS
+-- Statement-level triggers bump the changed table's row in content_versions
+-- and publish its name on the `content_changed` channel (LISTEN/NOTIFY).
+-- Each API worker listens on it and evicts the cached responses built from
+-- that table. Notifications are delivered on COMMIT, and duplicates within
+-- one transaction collapse.
+-- ============================================================================
+CREATE OR REPLACE FUNCTION notify_content_change() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO content_versions (table_name, version, changed_at)
+    VALUES (TG_TABLE_NAME, 1, CURRENT_TIMESTAMP)
+    ON CONFLICT (table_name) DO UPDATE
+        SET version    = content_versions.version + 1,
+            changed_at = CURRENT_TIMESTAMP;
+    PERFORM pg_notify('content_changed', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER projects_notify_change
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON projects
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_content_change();
+
+CREATE TRIGGER posts_notify_change
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON posts
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_content_change();
+
+CREATE TRIGGER tags_notify_change
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON tags
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_content_change();
+
+CREATE TRIGGER project_tags_notify_change
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON project_tags
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_content_change();
+
+CREATE TRIGGER interests_notify_change
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON interests
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_content_change();
+
+CREATE TRIGGER image_variants_notify_change
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON image_variants
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_content_change();
@@ -21,6 +21,17 @@ export async function fetchProjects(featured = false) {
   return res.json();
 }
 
+// One round trip for page data: { projects (with tags), tags, interests }.
+// `include` narrows the sections, e.g. ["projects", "tags"].
+export async function fetchBootstrap({ featured = false, include = null } = {}) {
+  const params = new URLSearchParams();
+  if (featured) params.set("featured", "true");
+  if (include) params.set("include", include.join(","));
+  const query = params.toString();
+  const res = await fetch(`${API_BASE}/bootstrap${query ? `?${query}` : ""}`);
+  return res.json();
+}
+
 export async function fetchProject(id) {
   const res = await fetch(`${API_BASE}/projects/${id}`);
   return res.json();
@@ -76,6 +87,14 @@ export async function adminLogin(password) {
   return res.json();
 }
 
+export async function adminLogout(token) {
+  const res = await fetch(`${API_BASE}/admin/logout`, {
+    method: "POST",
+    headers: adminHeaders(token),
+  });
+  return res.json();
+}
+
 export async function adminFetchProjects(token) {
   const res = await fetch(`${API_BASE}/admin/projects`, {
     headers: adminHeaders(token),
@@ -184,11 +203,15 @@ export async function adminDeleteInterest(token, id) {
   return res.json();
 }
 
-export async function adminFetchMessages(token) {
-  const res = await fetch(`${API_BASE}/admin/messages`, {
+// Paginated: resolves to { items, nextCursor }. Pass nextCursor back in to
+// fetch the following page; it is null on the last page.
+export async function adminFetchMessages(token, cursor = null) {
+  const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+  const res = await fetch(`${API_BASE}/admin/messages${query}`, {
     headers: adminHeaders(token),
   });
-  return res.json();
+  const items = await res.json();
+  return { items, nextCursor: res.headers.get("X-Next-Cursor") };
 }
 
 export async function adminDeleteMessage(token, id) {
@@ -199,13 +222,59 @@ export async function adminDeleteMessage(token, id) {
   return res.json();
 }
 
+// Apply many create/update/delete operations atomically:
+// [{ op: "update", entity: "projects", id: 3, data: {...} }, ...]
+export async function adminBatch(token, operations) {
+  const res = await fetch(`${API_BASE}/admin/batch`, {
+    method: "POST",
+    headers: adminHeaders(token),
+    body: JSON.stringify({ operations }),
+  });
+  return res.json();
+}
+
+async function sha256Hex(file) {
+  const digest = await crypto.subtle.digest("SHA-256", await file.arrayBuffer());
+  return Array.from(new Uint8Array(digest), (b) =>
+    b.toString(16).padStart(2, "0")
+  ).join("");
+}
+
+// Uploads go straight from the browser to S3 with a presigned POST; the
+// backend only signs the policy and verifies the stored object afterwards.
+// Objects are named by their SHA-256, so an image that is already stored
+// isn't sent again.
 export async function adminUploadImage(token, file) {
-  const form = new FormData();
-  form.append("file", file);
-  const res = await fetch(`${API_BASE}/admin/upload`, {
+  const presignRes = await fetch(`${API_BASE}/admin/uploads/presign`, {
     method: "POST",
-    headers: { Authorization: `Bearer ${token}` },
-    body: form,
+    headers: adminHeaders(token),
+    body: JSON.stringify({
+      content_type: file.type,
+      size: file.size,
+      sha256: await sha256Hex(file),
+    }),
+  });
+  const presigned = await presignRes.json();
+  if (!presignRes.ok) return presigned;
+  if (!presigned.exists) {
+    const uploaded = await uploadToStorage(presigned, file);
+    if (!uploaded) return { error: "Upload failed" };
+  }
+
+  const res = await fetch(`${API_BASE}/admin/uploads/complete`, {
+    method: "POST",
+    headers: adminHeaders(token),
+    body: JSON.stringify({ key: presigned.key }),
   });
   return res.json();
 }
+
+async function uploadToStorage(presigned, file) {
+  const form = new FormData();
+  Object.entries(presigned.fields).forEach(([name, value]) =>
+    form.append(name, value)
+  );
+  form.append("file", file); // must come after the policy fields
+  const res = await fetch(presigned.url, { method: "POST", body: form });
+  return res.ok;
+}
@@ -0,0 +1,27 @@
+import React from "react";
+
+/**
+ * Project screenshot with responsive AVIF/WebP variants when the backend has
+ * generated them (project.image_variants maps format -> srcset). Browsers
+ * without support, and projects without variants, get the original upload.
+ */
+function ProjectImage({ project }) {
+  const variants = project.image_variants || {};
+  const sizes = "(max-width: 760px) 100vw, 760px";
+
+  return (
+    <picture>
+      {variants.avif && <source type="image/avif" srcSet={variants.avif} sizes={sizes} />}
+      {variants.webp && <source type="image/webp" srcSet={variants.webp} sizes={sizes} />}
+      <img
+        src={project.image_url}
+        alt={project.title}
+        className="project-image"
+        loading="lazy"
+        decoding="async"
+      />
+    </picture>
+  );
+}
+
+export default ProjectImage;
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from "react";
 import {
   adminLogin,
+  adminLogout,
   adminFetchProjects,
   adminCreateProject,
   adminUpdateProject,
@@ -65,7 +66,10 @@ function Admin() {
     <div className="page">
       <div style={{ display: "flex", justifyContent: "space-between", alignItems: "center" }}>
         <h1 className="page-title">Admin Dashboard</h1>
-        <button className="btn btn-small" onClick={() => setToken(null)}>
+        <button
+          className="btn btn-small"
+          onClick={() => adminLogout(token).finally(() => setToken(null))}
+        >
           Log Out
         </button>
       </div>
@@ -543,10 +547,19 @@ function InterestsAdmin({ token }) {
 
 function MessagesAdmin({ token }) {
   const [messages, setMessages] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
 
-  const load = () => adminFetchMessages(token).then(setMessages);
+  const load = () => adminFetchMessages(token).then(({ items, nextCursor }) => {
+    setMessages(items);
+    setNextCursor(nextCursor);
+  });
   useEffect(() => { load(); }, []);
 
+  const loadMore = () => adminFetchMessages(token, nextCursor).then(({ items, nextCursor }) => {
+    setMessages((prev) => [...prev, ...items]);
+    setNextCursor(nextCursor);
+  });
+
   const handleDelete = async (id) => {
     if (window.confirm("Delete this message?")) {
       await adminDeleteMessage(token, id);
@@ -576,6 +589,9 @@ function MessagesAdmin({ token }) {
           <p style={{ marginTop: 8 }}>{m.message}</p>
         </div>
       ))}
+      {nextCursor && (
+        <button className="btn btn-small" onClick={loadMore}>Load more</button>
+      )}
     </div>
   );
 }
@@ -1,7 +1,8 @@
 import React, { useState, useEffect } from "react";
 import { Link } from "react-router-dom";
-import { fetchProjects, fetchTags } from "../api";
+import { fetchBootstrap } from "../api";
 import Reveal from "../components/Reveal";
+import ProjectImage from "../components/ProjectImage";
 import Scramble from "../components/Scramble";
 import NeuralHero from "../components/NeuralHero";
 
@@ -10,8 +11,10 @@ function Home() {
   const [tags, setTags] = useState([]);
 
   useEffect(() => {
-    fetchProjects(true).then((data) => setFeatured(Array.isArray(data) ? data : []));
-    fetchTags().then((data) => setTags(Array.isArray(data) ? data : []));
+    fetchBootstrap({ featured: true, include: ["projects", "tags"] }).then((data) => {
+      setFeatured(Array.isArray(data?.projects) ? data.projects : []);
+      setTags(Array.isArray(data?.tags) ? data.tags : []);
+    });
   }, []);
 
   return (
@@ -68,13 +71,7 @@ function Home() {
         {featured.map((project, i) => (
           <Reveal key={project.id} delay={i * 80}>
             <div className="card">
-              {project.image_url && (
-                <img
-                  src={project.image_url}
-                  alt={project.title}
-                  className="project-image"
-                />
-              )}
+              {project.image_url && <ProjectImage project={project} />}
               <h3 className="card-title">{project.title}</h3>
               <p className="card-meta">{project.tech_stack}</p>
               <p className="card-description">{project.description}</p>
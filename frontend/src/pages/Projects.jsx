@@ -1,22 +1,25 @@
 import React, { useState, useEffect } from "react";
-import { fetchProjects, fetchProject } from "../api";
+import { fetchBootstrap } from "../api";
 import Reveal from "../components/Reveal";
+import ProjectImage from "../components/ProjectImage";
 
 function Projects() {
   const [projects, setProjects] = useState([]);
   const [selected, setSelected] = useState(null);
 
   useEffect(() => {
-    fetchProjects().then((data) => setProjects(Array.isArray(data) ? data : []));
+    // Projects arrive with their tags, so expanding a card needs no request
+    fetchBootstrap({ include: ["projects"] }).then((data) =>
+      setProjects(Array.isArray(data?.projects) ? data.projects : [])
+    );
   }, []);
 
-  const handleSelect = async (id) => {
+  const handleSelect = (id) => {
     if (selected?.id === id) {
       setSelected(null);
       return;
     }
-    const project = await fetchProject(id);
-    setSelected(project);
+    setSelected(projects.find((p) => p.id === id) ?? null);
   };
 
   return (
@@ -36,13 +39,7 @@ function Projects() {
             style={{ cursor: "pointer" }}
             onClick={() => handleSelect(project.id)}
           >
-            {project.image_url && (
-              <img
-                src={project.image_url}
-                alt={project.title}
-                className="project-image"
-              />
-            )}
+            {project.image_url && <ProjectImage project={project} />}
             <div
               style={{
                 display: "flex",